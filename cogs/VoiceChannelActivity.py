@@ -1,7 +1,9 @@
 # import.standard
 import os
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+import re
+from datetime import datetime, timedelta
+from time import time as current_timestamp
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 # import.thirdparty
 import discord
@@ -19,6 +21,69 @@ from mysqldb import DatabaseCore
 allowed_roles = [int(os.getenv('OWNER_ROLE_ID', 123)), int(os.getenv('ADMIN_ROLE_ID', 123)), int(os.getenv('MOD_ROLE_ID', 123))]
 analyst_debugger_role_id: int = int(os.getenv('ANALYST_DEBUGGER_ROLE_ID', 123))
 
+# variables.voice
+berlin_timezone = timezone('Europe/Berlin')
+voice_rows_flush_threshold: int = int(os.getenv('VOICE_ROWS_FLUSH_THRESHOLD', 200))
+voice_activity_retention_days: int = int(os.getenv('VOICE_ACTIVITY_RETENTION_DAYS', 14))
+
+# [DD/MM-]HH[:MM], in Berlin time
+time_pattern = re.compile(r'^(?:(\d{1,2})/(\d{1,2})-)?(\d{1,2})(?::(\d{1,2}))?$')
+
+def get_time_range(time: str, time2: str = None, now: Optional[datetime] = None) -> Tuple[int, int, str]:
+    """ Gets the timestamp range of the given times, and a label for it.
+    Times without a date refer to their latest occurrence.
+    :param time: The start time, as [DD/MM-]HH[:MM].
+    :param time2: The end time, as [DD/MM-]HH[:MM]. [Optional]
+    :param now: The current time. [Optional][Default = Now]
+    PS: Without an end time, an hour covers the whole hour, and a minute covers its half hour. """
+
+    # Worked out in naive Berlin time, and only localized at the end, so shifting days keeps the right UTC offset
+    now = (now or datetime.now(berlin_timezone)).astimezone(berlin_timezone).replace(tzinfo=None)
+
+    def parse(value: str) -> Tuple[datetime, bool, bool]:
+        """ Parses a time into a naive datetime, whether it had a date, and whether it had minutes. """
+
+        if not (match := time_pattern.match(value)):
+            raise commands.BadArgument(f"Invalid time `{value}`, use `HH`, `HH:MM` or `DD/MM-HH:MM`!")
+
+        day, month, hour, minute = match.groups()
+        try:
+            the_time = datetime(now.year, int(month or now.month), int(day or now.day), int(hour), int(minute or 0))
+        except ValueError:
+            raise commands.BadArgument(f"Invalid time `{value}`!")
+
+        return the_time, bool(day), minute is not None
+
+    start, has_date, has_minutes = parse(time)
+    if time2:
+        end, _, end_has_minutes = parse(time2)
+        end += timedelta(minutes=1) if end_has_minutes else timedelta(hours=1)
+    elif has_minutes:
+        start = start.replace(minute=0 if start.minute < 30 else 30)
+        end = start + timedelta(minutes=30)
+    else:
+        end = start + timedelta(hours=1)
+
+    # Ranges that wrap around midnight end on the next day
+    if end <= start:
+        end += timedelta(days=1)
+
+    # The latest occurrence of the given time, or of the given date in the latest year
+    if start > now:
+        if not has_date:
+            start, end = start - timedelta(days=1), end - timedelta(days=1)
+        else:
+            try:
+                start, end = start.replace(year=start.year - 1), end.replace(year=end.year - 1)
+            except ValueError:
+                # A 29/02 that's still to come this year didn't happen last year
+                raise commands.BadArgument(f"There was no `{start.strftime('%d/%m')}` in the last year!")
+
+    start, end = berlin_timezone.localize(start), berlin_timezone.localize(end)
+    label_format = '%d/%m %H:%M' if has_date else '%H:%M'
+    text = f"`{start.strftime(label_format)}` and `{(end - timedelta(minutes=1)).strftime(label_format)}`"
+    return int(start.timestamp()), int(end.timestamp()) - 1, text
+
 tool_cogs: List[commands.Cog] = [
     VoiceChannelHistoryTable, VoiceChannelHistorySystem
 ]
@@ -32,12 +97,17 @@ class VoiceChannelActivity(*tool_cogs):
         self.client = client
         self.server_id = int(os.getenv('SERVER_ID', 123))
         self.db = DatabaseCore()
+        # Presence rows waiting to be written, as (minute_ts, channel_id, member_id)
+        self.pending_voice_rows: Set[Tuple[int, int, int]] = set()
+        # Who was already registered by the latest minute snapshot
+        self.snapshot_keys: Set[Tuple[int, int, int]] = set()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """ Tells when the cog is ready to use. """
 
         self.calculate.start()
+        self.flush_voice_rows.start()
         self.check_old_record_deletion_time.start()
         self.check_exceeding_voice_channels_from_history.start()
 
@@ -64,33 +134,46 @@ class VoiceChannelActivity(*tool_cogs):
 
         if channel := after.channel:
 
-            tzone = timezone('Europe/Berlin')
-            date_and_time = datetime.now().astimezone(tzone)
-            the_time = date_and_time.strftime('%H:%M')
+            # The minute snapshot already registered them in this channel
+            key = (int(current_timestamp()) // 60 * 60, channel.id, member.id)
+            if key in self.snapshot_keys or key in self.pending_voice_rows:
+                return
+
+            self.pending_voice_rows.add(key)
+            if len(self.pending_voice_rows) >= voice_rows_flush_threshold:
+                await self.write_voice_rows()
+
+    @tasks.loop(seconds=5)
+    async def flush_voice_rows(self) -> None:
+        """ Writes the queued presence rows. """
 
-            await self.insert_row(the_time, channel.id, channel.name, member.id, member.name)
+        await self.write_voice_rows()
+
+    async def write_voice_rows(self, snapshot_rows: Optional[Set[Tuple[int, int, int]]] = None) -> None:
+        """ Writes the queued presence rows, along with a minute snapshot, in a single batch.
+        :param snapshot_rows: The rows of a minute snapshot. [Optional] """
+
+        rows, self.pending_voice_rows = self.pending_voice_rows, set()
+        if snapshot_rows:
+            rows |= snapshot_rows
+
+        if rows:
+            await self.insert_voice_rows(list(rows))
 
     @tasks.loop(seconds=60)
     async def calculate(self) -> None:
         """ Calculates all members that are in a voice channel. """
-        tzone = timezone('Europe/Berlin')
-        date_and_time = datetime.now().astimezone(tzone)
-        the_time = date_and_time.strftime('%H:%M')
 
-        print(f'Calculate VC at {the_time}')
+        minute_ts = int(current_timestamp()) // 60 * 60
         guild = self.client.get_guild(self.server_id)
-        channels = [c for c in guild.voice_channels]
-
-        all_channel_members = []
 
-        for channel in channels:
-            if channel.members:
-                channel_members = [(the_time, channel.id, channel.name, m.id, m.name) for m in channel.members]
-                all_channel_members.append(channel_members)
+        # Queued rows the snapshot covers would be duplicates
+        self.snapshot_keys = {
+            (minute_ts, channel.id, member.id) for channel in guild.voice_channels for member in channel.members
+        }
+        self.pending_voice_rows -= self.snapshot_keys
 
-        all_channel_members = [m for c in all_channel_members for m in c]
-        if all_channel_members:
-            await self.insert_first_row(all_channel_members)
+        await self.write_voice_rows(self.snapshot_keys)
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
@@ -100,11 +183,13 @@ class VoiceChannelActivity(*tool_cogs):
         if await self.table_voice_channel_activity_exists():
             return await ctx.send("**The __VoiceChannelActivity__ already exists!**")
 
+        # Names are resolved when reading, and the indexes serve the channel, member and retention range scans
         await self.db.execute_query("""
             CREATE TABLE VoiceChannelActivity (
-                the_time TIME NOT NULL, channel_id BIGINT NOT NULL,
-                channel_name VARCHAR(50) NOT NULL, member_id BIGINT NOT NULL,
-                member_name VARCHAR(50) NOT NULL) DEFAULT CHARSET utf8mb4
+                the_ts INT UNSIGNED NOT NULL, channel_id BIGINT UNSIGNED NOT NULL, member_id BIGINT UNSIGNED NOT NULL,
+                PRIMARY KEY (channel_id, the_ts, member_id),
+                KEY member_time (member_id, the_ts),
+                KEY the_ts (the_ts))
         """)
         await ctx.send("**Table __VoiceChannelActivity__ created!**")
 
@@ -130,169 +215,53 @@ class VoiceChannelActivity(*tool_cogs):
         await self.db.execute_query("DELETE FROM VoiceChannelActivity")
         await ctx.send("**Table __VoiceChannelActivity__ reset!**")
 
-    async def insert_first_row(self, channel_members: List[Tuple[Union[int, str]]]) -> None:
-        """ Inserts the first row of the minute with the info of all users who are in voice channels.
-        :param channel_members: A list of tuples containing the individual members and their info. """
+    async def table_voice_channel_activity_exists(self) -> bool:
+        """ Checks whether the VoiceChannelActivity table exists. """
 
-        await self.db.execute_query("""
-            INSERT INTO VoiceChannelActivity (the_time, channel_id, channel_name, member_id, member_name)
-            VALUES (%s, %s, %s, %s, %s)""", channel_members, execute_many=True)
+        return await self.db.table_exists("VoiceChannelActivity")
 
-    async def insert_row(self, the_time: datetime, channel_id: int, channel_name: str, member_id: int, member_name: str) -> None:
-        """ Inserts a row containing info of member and the voice channel that they're currently in.
-        :param the_time: The current time.
-        :param: channel_id: The ID channel that the member is in.
-        :param channel_name: The name of the channel that the member is in.
-        :param member_id: The ID of the member.
-        :param member_name: The name of the member. """
+    async def insert_voice_rows(self, rows: List[Tuple[int, int, int]]) -> None:
+        """ Inserts presence rows, skipping the ones that were already registered.
+        :param rows: A list of (minute_ts, channel_id, member_id) tuples. """
 
         await self.db.execute_query("""
-            INSERT INTO VoiceChannelActivity (the_time, channel_id, channel_name, member_id, member_name)
-            VALUES (%s, %s, %s, %s, %s)""", (the_time, channel_id, channel_name, member_id, member_name))
-
-    @tasks.loop(seconds=60)
-    async def check_old_record_deletion_time(self, limit_hours: int = 6) -> None:
-        """ Checks whether it's time to delete old records.
-        :param limit_hours: The limit of hours that the DB needs to store,
-        PS: If the number of registered hours in the DB is exceeded, the oldest records will be deleted,
-        so the limit is satisfied again. """
-
-        hours = await self.db.execute_query("SELECT DISTINCT HOUR(the_time) FROM VoiceChannelActivity", fetch="all")
-        hours = [h[0] for h in hours]
-
-        if limit_hours < len(hours):
-            await self.db.execute_query("DELETE FROM VoiceChannelActivity WHERE HOUR(the_time) = %s", (hours.pop(0),))
-
-    async def get_hour_record_by_channel(self, channel: discord.TextChannel, time: str, time2: str = None) -> List[List[Union[datetime, str, int]]]:
-        """ Gets all user records at a given hour and channel.
-        :param channel_id: The ID of the channel to which you are filtering.
-        :param time: The time to which you are filtering the search. """
-
-        records = []
-        text = ""
-
-        if len(time) < 3:
-            time = datetime.strptime(time, '%H')
-
-            # Checks whether user provided two values
-            if time2:
-                time2 = datetime.strptime(time2, '%H')
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT HOUR(the_time), member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND HOUR(the_time) BETWEEN %s AND %s""",
-                    (channel.id, time.hour, time2.hour), fetch="all")
-
-                text = f"Users who joined `{channel}` between `{time.hour}:00` and `{time2.hour}:59`:"
-            else:
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT HOUR(the_time), member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND HOUR(the_time) = %s""",
-                    (channel.id, time.hour), fetch="all")
-
-                text = f"Users who joined `{channel}` between `{time.hour}:00` and `{time.hour}:59`:"
-
-        else:
-            time = datetime.strptime(time, '%H:%M')
-
-            # Checks whether two values were passed
-            if time2:
-                time2 = datetime.strptime(time2, '%H:%M')
-                the_time1 = f"{time.hour}:{time.minute}"
-                the_time2 = f"{time2.hour}:{time2.minute}"
+            INSERT IGNORE INTO VoiceChannelActivity (the_ts, channel_id, member_id)
+            VALUES (%s, %s, %s)""", rows, execute_many=True)
 
-                text = f"Users who joined `{channel}` between `{the_time1}` and `{the_time2}`:"
+    @tasks.loop(hours=1)
+    async def check_old_record_deletion_time(self) -> None:
+        """ Deletes the records that are older than the retention period, as a range on the timestamp index. """
 
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT the_time, member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND the_time BETWEEN %s AND %s""",
-                    (channel.id, the_time1, the_time2), fetch="all")
+        oldest_ts = int(current_timestamp()) - voice_activity_retention_days * 86400
+        await self.db.execute_query("DELETE FROM VoiceChannelActivity WHERE the_ts < %s", (oldest_ts,))
 
-            # If not, assumes the second value
-            else:
-                if time.minute >= 0 and time.minute <= 29:
-                    the_time1 = f"{time.hour}:00"
-                    the_time2 = f"{time.hour}:29"
-                else:
-                    the_time1 = f"{time.hour}:30"
-                    the_time2 = f"{time.hour}:59"
+    async def get_hour_record_by_channel(self, channel: discord.VoiceChannel, time: str, time2: str = None) -> Tuple[List[List[int]], str]:
+        """ Gets the members who were in a given channel in a time range.
+        :param channel: The channel to which you are filtering.
+        :param time: The time to which you are filtering the search.
+        :param time2: The end of the time range. [Optional] """
 
-                text = f"Users who joined `{channel}` between `{the_time1}` and `{the_time2}`:"
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT the_time, member_name, member_id
-                    FROM VoiceChannelActivity WHERE channel_id = %s AND the_time BETWEEN %s AND %s""",
-                    (channel.id, the_time1, the_time2), fetch="all")
+        start_ts, end_ts, text = get_time_range(time, time2)
+        records = await self.db.execute_query("""
+            SELECT DISTINCT member_id FROM VoiceChannelActivity
+            WHERE channel_id = %s AND the_ts BETWEEN %s AND %s""",
+            (channel.id, start_ts, end_ts), fetch="all")
 
-        return records, time, text
+        return records, f"Users who joined `{channel}` between {text}:"
 
-    async def get_user_record_by_time(self, member: discord.Member, time: str, time2: str = None) -> List[Union[int, str]]:
-        """ Gets user records by the given hour.
+    async def get_user_record_by_time(self, member: discord.Member, time: str, time2: str = None) -> Tuple[List[List[int]], str]:
+        """ Gets the channels a member was in, in a time range.
         :param member: The member from whom you want to fetch information.
-        :param time: The time at around the user that you are looking for has to have information. """
-
-        records = []
-        text = ""
-
-        # If in format (HOUR)
-        if len(time) < 3:
-            time = datetime.strptime(time, '%H')
-            # Checks whether user provided two values
-            if time2:
-                time2 = datetime.strptime(time2, '%H')
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT HOUR(the_time), channel_id, channel_name,  member_id
-                    FROM VoiceChannelActivity WHERE HOUR(the_time) BETWEEN %s AND %s AND member_id = %s""",
-                    (time.hour, time2.hour, member.id), fetch="all")
-
-                text = f"User between `{time.hour}` and `{time2.hour}` was in:"
-
-            # If not, gets all values from that hour.
-            else:
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT HOUR(the_time), channel_id, channel_name,  member_id
-                    FROM VoiceChannelActivity WHERE HOUR(the_time) = %s AND member_id = %s""",
-                    (time.hour, member.id), fetch="all")
-
-                text = f"User between `{time.hour}` and `{time.hour}` was in:"
-
-        else:
-            # If in format (HOUR:MINUTE)
-            time = datetime.strptime(time, '%H:%M')
-
-            # Checks whether user provided two values
-            if time2:
-                time2 = datetime.strptime(time2, '%H:%M')
-                the_time1 = f"{time.hour}:{time.minute}"
-                the_time2 = f"{time2.hour}:{time2.minute}"
-
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT the_time, channel_id, channel_name, member_id
-                    FROM VoiceChannelActivity
-                    WHERE the_time BETWEEN %s AND %s AND member_id = %s""",
-                    (the_time1, the_time2, member.id), fetch="all")
-
-                text = f"{member} between `{the_time1}` and `{the_time2}` was in:"
-
-            # If not, gets values from either (HOUR:00 - HOUR:29) or (HOUR:30 - HOUR:59)
-            else:
-                # If it's between HOUR:00 and HOUR:29
-                if time.minute >= 0 and time.minute <= 29:
-                    the_time1 = f"{time.hour}:00"
-                    the_time2 = f"{time.hour}:29"
-                    text = f"{member} between `{the_time1}` and `{the_time2}` was in:"
-
-                # If it's between HOUR:30 and HOUR:30
-                else:
-                    the_time1 = f"{time.hour}:30"
-                    the_time2 = f"{time.hour}:59"
-                    text = f"{member} between `{the_time1}` and `{the_time2}` was in:"
+        :param time: The time at around the user that you are looking for has to have information.
+        :param time2: The end of the time range. [Optional] """
 
-                records = await self.db.execute_query("""
-                    SELECT DISTINCT the_time, channel_id, channel_name, member_id
-                    FROM VoiceChannelActivity
-                    WHERE the_time BETWEEN %s AND %s AND member_id = %s""",
-                    (the_time1, the_time2, member.id), fetch="all")
+        start_ts, end_ts, text = get_time_range(time, time2)
+        records = await self.db.execute_query("""
+            SELECT DISTINCT channel_id FROM VoiceChannelActivity
+            WHERE member_id = %s AND the_ts BETWEEN %s AND %s""",
+            (member.id, start_ts, end_ts), fetch="all")
 
-        return records, time, text
+        return records, f"{member} between {text} was in:"
 
     async def format_time(self, time: str) -> str:
         """ Formats the time if needed.
@@ -309,7 +278,8 @@ class VoiceChannelActivity(*tool_cogs):
     async def who_joined(self, ctx, channel: discord.VoiceChannel = None, time: str = None, time2: str = None) -> None:
         """ Shows which members were in the given voice channel at the given time:
         :param channel: The channel you want to check.
-        :param time: The time. """
+        :param time: The time, as HH, HH:MM or DD/MM-HH:MM.
+        :param time2: The end time. [Optional] """
 
         if not channel:
             return await ctx.send("**Hey, inform a channel to fetch users from!**")
@@ -320,11 +290,14 @@ class VoiceChannelActivity(*tool_cogs):
         time = await self.format_time(time)
         time2 = await self.format_time(time2) if time2 else None
 
-        records, ftime, text = await self.get_hour_record_by_channel(channel, time, time2)
+        try:
+            records, text = await self.get_hour_record_by_channel(channel, time, time2)
+        except commands.BadArgument as e:
+            return await ctx.send(f"**{e}**")
         if not records:
             return await ctx.send("**Nothing found for the given channel and/or time!**")
 
-        users = set([m.mention if (m := discord.utils.get(ctx.guild.members, id=member[2])) else member[1] for member in records])
+        users = [m.mention if (m := ctx.guild.get_member(member[0])) else f"<@{member[0]}>" for member in records]
 
         embed = discord.Embed(
             title=text,
@@ -338,7 +311,8 @@ class VoiceChannelActivity(*tool_cogs):
     async def where_joined(self, ctx, member: discord.Member = None, time: str = None, time2: str = None) -> None:
         """ Shows in which voice channel a specific user was at a given time:
         :param member: The member you want to check.
-        :param time: The time. """
+        :param time: The time, as HH, HH:MM or DD/MM-HH:MM.
+        :param time2: The end time. [Optional] """
 
         if not member:
             return await ctx.send("**Hey, inform a channel to fetch users from!**")
@@ -349,12 +323,15 @@ class VoiceChannelActivity(*tool_cogs):
         time = await self.format_time(time)
         time2 = await self.format_time(time2) if time2 else None
 
-        records, ftime, text = await self.get_user_record_by_time(member, time, time2)
+        try:
+            records, text = await self.get_user_record_by_time(member, time, time2)
+        except commands.BadArgument as e:
+            return await ctx.send(f"**{e}**")
 
         if not records:
             return await ctx.send("**Nothing found for the given time and/or member!**")
 
-        channels = set([c.mention if (c := discord.utils.get(ctx.guild.channels, id=channel[1])) else channel[2] for channel in records])
+        channels = [c.mention if (c := ctx.guild.get_channel(channel[0])) else f"<#{channel[0]}>" for channel in records]
 
         embed = discord.Embed(
             title=text,
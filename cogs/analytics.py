@@ -8,12 +8,13 @@ from typing import List
 import discord
 from discord import utils
 from discord.ext import commands, tasks
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 # import.local
 from extra import utils
 from extra.analytics import DataBumpsTable, SlothAnalyticsTable
-from mysqldb import DatabaseCore
+from extra.assets import assets
+from mysqldb import DatabaseCore, write_buffer
 
 
 # variables.textchannel
@@ -49,9 +50,20 @@ class Analytics(*analytics_cogs):
             if not channel:
                 return
             members = channel.guild.members
+            # Writes the buffered message counter before it gets reported and reset
+            await write_buffer.flush()
             info = await self.get_info()
             online_members = [om for om in members if str(om.status) == "online"]
-            small = ImageFont.truetype("built titling sb.ttf", 45)
+
+            # Resets right after reading the counters, so the messages sent while the report is sent count for the new day
+            try:
+                await self.reset_table_sloth_analytics_callback()
+                complete_date = time_now.strftime('%d/%m/%Y')
+                await self.bump_data(info[0], info[1], info[2], len(members), len(online_members), str(complete_date))
+            except Exception as e:
+                print('SlothAnalytics error', e)
+
+            small = assets.get_font("built titling sb.ttf", 45)
             analytics = Image.open("./png/analytics.png").resize((500, 600))
             draw = ImageDraw.Draw(analytics)
             draw.text((140, 270), f"{info[0]}", (255, 255, 255), font=small)
@@ -66,13 +78,6 @@ class Analytics(*analytics_cogs):
                 fp = discord.File(fp, filename="analytics_result.png")
                 await channel.send(file=fp)
 
-            try:
-                await self.reset_table_sloth_analytics_callback()
-                complete_date = time_now.strftime('%d/%m/%Y')
-                await self.bump_data(info[0], info[1], info[2], len(members), len(online_members), str(complete_date))
-            except Exception as e:
-                print('SlothAnalytics error', e)
-
     @commands.Cog.listener()
     async def on_member_join(self, member) -> None:
         """ Tells the newcomer to assign themselves a native language role, and updates the joined members counter. """
@@ -92,7 +97,7 @@ class Analytics(*analytics_cogs):
         if not message.guild:
             return
 
-        await self.update_messages()
+        await self.update_messages(buffered=True)
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
@@ -1,6 +1,7 @@
 # import.standard
 import asyncio
 import os
+from typing import Set
 
 # import.thirdparty
 import discord
@@ -9,7 +10,7 @@ from discord.ext import commands
 # import.local
 from extra import utils
 from extra.moderation.aspirants import AspirantsTable
-from mysqldb import DatabaseCore
+from mysqldb import DatabaseCore, write_buffer
 
 # variables.id
 guild_id = int(os.getenv('SERVER_ID', 123))
@@ -24,11 +25,14 @@ class AspirantActivity(AspirantsTable):
     def __init__(self, client):
         self.client = client
         self.db = DatabaseCore()
+        # IDs of the monitored aspirants, so other members' events don't touch the database
+        self.aspirants: Set[int] = set()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """ Tells when the cog is ready to run. """
 
+        self.aspirants = set(await self.get_all_aspirants())
         print('AspirantActivity cog is ready!')
 
     ### Listeners
@@ -41,16 +45,10 @@ class AspirantActivity(AspirantsTable):
         if message.author.bot:
             return
 
-        # Gets all aspirants
-        if users := await self.get_all_aspirants():
-
-            if message.author.id not in users:
-                return
-        else:
+        if message.author.id not in self.aspirants:
             return
 
-        await self.get_aspirant_current_messages(message.author.id)
-        await self.update_aspirant_message(message.author.id)
+        self.update_aspirant_message(message.author.id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after) -> None:
@@ -59,11 +57,7 @@ class AspirantActivity(AspirantsTable):
         if member.bot:
             return
 
-        # Gets all aspirants
-        if users := await self.get_all_aspirants():
-            if member.id not in users:
-                return
-        else:
+        if member.id not in self.aspirants:
             return
 
         current_ts = await utils.get_timestamp()
@@ -85,6 +79,8 @@ class AspirantActivity(AspirantsTable):
         if not (users_id := await self.get_all_aspirants()):
             return await ctx.send("**There is no aspirants being moderated**")
 
+        # Writes the buffered message counters before reading them
+        await write_buffer.flush()
         users = await self.db.execute_query("SELECT * FROM AspirantActivity", fetch="all")
 
         description = ["Aspirants' activity statuses.\n\n"]
@@ -145,6 +141,7 @@ class AspirantActivity(AspirantsTable):
             if  not await self.get_user(member.id):
                 await self.db.execute_query("INSERT INTO AspirantActivity (user_id, time, timestamp, messages) VALUES (%s, %s, %s, %s)",
                                     (member.id, 0, None, 1))
+                self.aspirants.add(member.id)
                 await ctx.send(f"**The member {member} was successfully added**")
             else:
                 return await ctx.send(f"**The user {member} is already been monitored**")
@@ -163,6 +160,7 @@ class AspirantActivity(AspirantsTable):
 
         for member in members:
             await self.db.execute_query("DELETE FROM AspirantActivity WHERE user_id = %s", (member.id,))
+            self.aspirants.discard(member.id)
             await ctx.send(f"**The member {member} was successfully removed**")
 
 
@@ -155,7 +155,7 @@ class Communication(*tool_cogs):
         if not member:
             return await ctx.send('Inform a member!')
 
-        bots_and_commands_channel = discord.utils.get(ctx.guild.channels, id=bots_and_commands_channel_id)
+        bots_and_commands_channel = ctx.guild.get_channel(bots_and_commands_channel_id)
         await bots_and_commands_channel.send(
             f'''__**Welcome to the Language Sloth**__! {member.mention}
 This is a community of people who are practicing and studying languages from all around the world! While you're here, you will also make tons of new friends! There is a lot to do here in the server but there are some things you should do to start off.
@@ -180,7 +180,7 @@ If you have any questions feel free to ask! And if you experience any type of pr
         elif not member:
             return await ctx.send('**Inform a member!**', delete_after=3)
 
-        bots_and_commands_channel = discord.utils.get(ctx.guild.channels, id=bots_and_commands_channel_id)
+        bots_and_commands_channel = ctx.guild.get_channel(bots_and_commands_channel_id)
         await bots_and_commands_channel.send(
             f'''{member.mention} - Hey! since you didn't assign your native language I went ahead and assigned it for you automatically based on my best guess of what is your native language, I came to the conclusion that it is {language.title()}.  If I'm incorrect please let me know!''')
 
@@ -193,7 +193,7 @@ If you have any questions feel free to ask! And if you experience any type of pr
         if len(ctx.message.content.split()) < 2:
             return await ctx.send('You must inform all parameters!')
 
-        announce_channel = discord.utils.get(ctx.guild.channels, id=announcement_channel_id)
+        announce_channel = ctx.guild.get_channel(announcement_channel_id)
         msg = ctx.message.content.split('!announce', 1)
         await announce_channel.send(msg[1])
             
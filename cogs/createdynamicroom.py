@@ -1,7 +1,7 @@
 # import.standard
 import asyncio
 import os
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Set, Union
 
 # import.thirdparty
 import discord
@@ -341,6 +341,10 @@ class LanguageRoomDatabase:
             json_data = []
             for result in row:
                 json_data.append(dict(zip(row_headers, result)))
+
+            if not json_data:
+                return None
+
             return LanguageRoom.instance_from_dict(json_data[0])
 
         # room_id, room_name
@@ -440,6 +444,14 @@ class CreateDynamicRoom(commands.Cog, DynRoomUserVCstampDatabase, DynamicRoomDat
         self.dr_vc_id = int(os.getenv('CREATE_DYNAMIC_ROOM_VC_ID', 123))
         self.dr_cat_id = int(os.getenv('CREATE_DYNAMIC_ROOM_CAT_ID', 123))
         self.language_rooms = None
+        # Registry of the Dynamic Rooms by voice channel ID, loaded once and kept current from voice events
+        self.dynamic_rooms: Dict[int, DynamicRoom] = {}
+        # How many registered rooms each language room has, to spot duplicates
+        self.room_counts: Dict[int, int] = {}
+        # The scheduled expiration check of each empty room
+        self.room_deadlines: Dict[int, asyncio.TimerHandle] = {}
+        # The expiration checks started by a deadline, kept so they aren't garbage collected while running
+        self.deadline_checks: Set["asyncio.Task[None]"] = set()
         self.error_log = None
         self.error_log_id = int(os.getenv('ERROR_LOG_CHANNEL_ID', 123))
         self.db = DatabaseCore()
@@ -451,50 +463,131 @@ class CreateDynamicRoom(commands.Cog, DynRoomUserVCstampDatabase, DynamicRoomDat
         print("CreateDynamicRoom cog is online")
 
         self.error_log = self.client.get_channel(self.error_log_id)
-        self.check_empty_dynamic_rooms.start()
 
         await self.prefetch_language_room()
+        self.check_empty_dynamic_rooms.start()
 
-    @tasks.loop(seconds=60)
+    @tasks.loop(hours=1)
     async def check_empty_dynamic_rooms(self):
-        """ Task that checks Dynamic Rooms expirations. """
+        """ Task that reloads the Dynamic Rooms registry and reschedules their expirations,
+        in case something changed behind the bot's back. """
 
-        # get current time
-        the_time = await utils.get_timestamp()
+        try:
+            rooms = await self.get_all_dynamic_rooms(object_form=True)
+        except Exception as e:
+            # A failed query keeps the current registry, instead of forgetting every room until the next run
+            print("Couldn't reload the Dynamic Rooms:", e)
+            return
+
+        self.dynamic_rooms = {}
+        self.room_counts = {}
+        for room in rooms:
+            self.register_dynamic_room(room)
+
+        for vc_id in list(self.room_deadlines):
+            self.cancel_room_deadline(vc_id)
 
-        # Looks for empty nonperma rooms to delete
-        all_rooms = await self.get_all_dynamic_rooms(object_form=True)
-        for room in all_rooms:
-            guild = self.client.get_guild(room.guild_id)
-            if not guild:
-                await self.delete_dynamic_rooms_by_vc_id(room.vc_id)
-                continue
+        for vc_id in list(self.dynamic_rooms):
+            await self.try_check_dynamic_room(vc_id)
 
-            channel = discord.utils.get(guild.channels, id=room.vc_id)
-            is_perma_room = room.is_perma_room
+    async def try_check_dynamic_room(self, vc_id: int) -> None:
+        """ Checks a Dynamic Room's expiration, logging what goes wrong instead of raising it.
+        :param vc_id: The voice channel ID of the room. """
 
-            # if channel is no more
-            if not channel:
-                await self.delete_dynamic_rooms_by_vc_id(room.vc_id)
-                continue
+        try:
+            await self.check_dynamic_room(vc_id)
+        except Exception as e:
+            print(f"Couldn't check the Dynamic Room {vc_id}:", e)
+
+    async def check_dynamic_room(self, vc_id: int) -> None:
+        """ Checks a Dynamic Room's expiration, deleting it if it's expired or duplicated,
+        or scheduling the check for when it expires.
+        :param vc_id: The voice channel ID of the room. """
+
+        self.room_deadlines.pop(vc_id, None)
+        if not (room := self.dynamic_rooms.get(vc_id)):
+            return
+
+        guild = self.client.get_guild(room.guild_id)
+        channel = guild.get_channel(room.vc_id) if guild else None
+
+        # if channel is no more
+        if not channel:
+            return await self.forget_dynamic_room(vc_id)
+
+        # if not an empty room
+        if channel.members or room.is_perma_room:
+            return
+
+        # check if duplicated
+        if self.room_counts.get(room.room_id, 0) > 1:
+            await self.delete_things([channel])
+            return await self.forget_dynamic_room(vc_id)
+
+        if not room.empty_since_ts:
+            return
 
-            len_users = len(channel.members)
+        language_room_data = await self.get_language_room_id(room.room_id)
+        if not language_room_data:
             language_room_data = await self.get_language_room_by_id(room.room_id, object_form=True)
-            # if empty room
-            if len_users == 0 and not is_perma_room:
-                # check if room expired
-                if room.empty_since_ts:
-                    is_expired = the_time >= room.empty_since_ts + language_room_data.max_empty_time
-                else:
-                    is_expired = False
-
-                # check if duplicated
-                is_duplicated = len(await self.get_dynamic_room_by_room_id(room.room_id)) > 1
-
-                if is_expired or is_duplicated:
-                    if channel:
-                        await channel.delete()
-                    await self.delete_dynamic_rooms_by_vc_id(room.vc_id)
+
+        # Without its language room, there's no empty time limit to go by
+        if not language_room_data:
+            return
+
+        # check if room expired
+        expires_at = room.empty_since_ts + language_room_data.max_empty_time
+        the_time = await utils.get_timestamp()
+        if the_time >= expires_at:
+            await self.delete_things([channel])
+            return await self.forget_dynamic_room(vc_id)
+
+        self.cancel_room_deadline(vc_id)
+        self.room_deadlines[vc_id] = asyncio.get_running_loop().call_later(
+            expires_at - the_time, self.start_deadline_check, vc_id)
+
+    def start_deadline_check(self, vc_id: int) -> None:
+        """ Starts the expiration check of a Dynamic Room whose deadline was reached.
+        :param vc_id: The voice channel ID of the room. """
+
+        task = asyncio.create_task(self.try_check_dynamic_room(vc_id))
+        self.deadline_checks.add(task)
+        task.add_done_callback(self.deadline_checks.discard)
+
+    def cancel_room_deadline(self, vc_id: int) -> None:
+        """ Cancels the scheduled expiration check of a Dynamic Room.
+        :param vc_id: The voice channel ID of the room. """
+
+        if handle := self.room_deadlines.pop(vc_id, None):
+            handle.cancel()
+
+    def register_dynamic_room(self, room: DynamicRoom) -> None:
+        """ Adds a Dynamic Room to the registry.
+        :param room: The room. """
+
+        self.unregister_dynamic_room(room.vc_id)
+        self.dynamic_rooms[room.vc_id] = room
+        self.room_counts[room.room_id] = self.room_counts.get(room.room_id, 0) + 1
+
+    def unregister_dynamic_room(self, vc_id: int) -> None:
+        """ Removes a Dynamic Room from the registry.
+        :param vc_id: The voice channel ID of the room. """
+
+        if not (room := self.dynamic_rooms.pop(vc_id, None)):
+            return
+
+        if self.room_counts.get(room.room_id, 0) > 1:
+            self.room_counts[room.room_id] -= 1
+        else:
+            self.room_counts.pop(room.room_id, None)
+
+    async def forget_dynamic_room(self, vc_id: int) -> None:
+        """ Removes a Dynamic Room from the registry and the database.
+        :param vc_id: The voice channel ID of the room. """
+
+        self.cancel_room_deadline(vc_id)
+        self.unregister_dynamic_room(vc_id)
+        await self.delete_dynamic_rooms_by_vc_id(vc_id)
 
     @commands.command(hidden=True)
     @utils.is_allowed([analyst_debugger_role_id], throw_exc=True)
@@ -533,27 +626,34 @@ class CreateDynamicRoom(commands.Cog, DynRoomUserVCstampDatabase, DynamicRoomDat
         """ Handler for voice channel activity, that's eventually gonna be used
         for creating a DynamicRoom. """
 
+        # Someone joined a room, so it's no longer expiring
+        if after.channel and after.channel.id in self.room_deadlines:
+            self.cancel_room_deadline(after.channel.id)
+
         # Checks if the user is leaving the vc and whether there still are people in there
-        if before.channel and before.channel.category:
+        if before.channel and before.channel.category and before.channel != after.channel:
             if before.channel.category.id == self.dr_cat_id:
-                # check_empty_dynamic_rooms task fix?
-                await self.check_empty_dynamic_rooms()
 
-                user_voice_channel = discord.utils.get(
-                    member.guild.channels, id=before.channel.id)
+                user_voice_channel = member.guild.get_channel(before.channel.id)
                 # get quant of users in room
                 len_users = len(user_voice_channel.members)
                 # if empty and not waiting room
                 if len_users == 0 and user_voice_channel.id != self.dr_vc_id:
 
-                    room_data = await self.get_dynamic_room_vc_id(user_voice_channel.id, object_form=True)
+                    room_data = self.dynamic_rooms.get(user_voice_channel.id)
+                    if not room_data:
+                        # The registry may not be loaded yet, so the database has the last word before deleting
+                        if room_data := await self.get_dynamic_room_vc_id(user_voice_channel.id, object_form=True):
+                            self.register_dynamic_room(room_data)
 
                     if not room_data:
                         await self.delete_things([user_voice_channel])
-
-                    # upsert empty ts
-                    the_time = await utils.get_timestamp()
-                    await self.upsert_dynamic_room_empty_ts(user_voice_channel.id, the_time)
+                    else:
+                        # upsert empty ts
+                        the_time = await utils.get_timestamp()
+                        room_data.empty_since_ts = the_time
+                        await self.upsert_dynamic_room_empty_ts(user_voice_channel.id, the_time)
+                        await self.check_dynamic_room(user_voice_channel.id)
 
         # Checks if the user is joining the create a room VC
         if not after.channel:
@@ -607,6 +707,7 @@ class CreateDynamicRoom(commands.Cog, DynRoomUserVCstampDatabase, DynamicRoomDat
 
         # Puts the channels ids in the database
         await self.insert_dynamic_rooms(member.guild.id, room_id, vc_channel.id, room_ts)
+        self.register_dynamic_room(DynamicRoom(member.guild.id, room_id, vc_channel.id, room_ts, False, None))
         await member.send(f"**You are being moved to {room_name}** ...")
 
         try:
@@ -618,7 +719,14 @@ class CreateDynamicRoom(commands.Cog, DynRoomUserVCstampDatabase, DynamicRoomDat
             if len(vc_channel.members) == 0:
                 await vc_channel.delete()
 
-    async def get_language_room_id(self, room_id: int) -> List[List[int]]:
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel) -> None:
+        """ Forgets a Dynamic Room whose channel was deleted. """
+
+        if channel.id in self.dynamic_rooms:
+            await self.forget_dynamic_room(channel.id)
+
+    async def get_language_room_id(self, room_id: int) -> Optional[LanguageRoom]:
         """ Returns language room from given id
         :param room_id: Id of the room to be fetched. """
 
@@ -839,6 +947,9 @@ class CreateDynamicRoom(commands.Cog, DynRoomUserVCstampDatabase, DynamicRoomDat
         await ctx.message.delete()
         await ctx.send("**Done!**", delete_after=3)
         await super().make_perma_dynamic_room(vc_id=vc_id)
+        if room := self.dynamic_rooms.get(int(vc_id)):
+            room.is_perma_room = True
+            self.cancel_room_deadline(room.vc_id)
 
 def setup(client):
     """ Cog's setup function. """
@@ -118,13 +118,13 @@ class CreateSmartRoom(*smart_room_cogs):
 		if before.channel:
 			if before.channel.category:
 				if before.channel.category.id == self.cat_id:
-					user_voice_channel = discord.utils.get(member.guild.channels, id=before.channel.id)
+					user_voice_channel = member.guild.get_channel(before.channel.id)
 					len_users = len(user_voice_channel.members)
 					if len_users == 0 and user_voice_channel.id != self.vc_id:
 						try:
 							premium_channels = await self.get_premium_vc(user_voice_channel.id)
 							if premium_channels:
-								the_txt = discord.utils.get(member.guild.channels, id=premium_channels[0][2])
+								the_txt = member.guild.get_channel(premium_channels[0][2])
 								await self.delete_premium_vc(premium_channels[0][0], premium_channels[0][1])
 								await the_txt.delete()
 						except Exception:
@@ -854,7 +854,7 @@ You can only add either **threads** **OR** one **voice channel**"""))
 		if user_galaxy[0] != author.id and not is_admin:
 			return await ctx.send(f"**You cannot run this command outside your Galaxy Room, in case you have one, {author.mention}!**")
 
-		member: discord.Member = discord.utils.get(ctx.guild.members, id=user_galaxy[0])
+		member: discord.Member = ctx.guild.get_member(user_galaxy[0])
 		if not member:
 			return await ctx.send(f"**It looks like the owner of this Galaxy Room is not in the server anymore, {author.mention}!")
 
@@ -1315,7 +1315,7 @@ You can only add either **threads** **OR** one **voice channel**"""))
 		except:
 			await ctx.send(f"**For some reason I couldn't delete it, try again, {member.mention}!**")
 		else:
-			if vc := discord.utils.get(ctx.guild.channels, id=vcs[1]):
+			if vc := ctx.guild.get_channel(vcs[1]):
 				await self.delete_things([vc])
 
 			await ctx.send(f"**Voice Channel deleted, {member.mention}!**")
@@ -1337,7 +1337,7 @@ You can only add either **threads** **OR** one **voice channel**"""))
 			return await ctx.send(f"**You don't even have a tribe, you cannot do this, {member.mention}!**")
 
 		members: List[List[Union[int, str]]] = await SlothClass.get_tribe_members(tribe_name=user_tribe['name'])
-		members: List[discord.Member] = [m for m_id in members if (m := discord.utils.get(ctx.guild.members, id=m_id[0]))]
+		members: List[discord.Member] = [m for m_id in members if (m := ctx.guild.get_member(m_id[0]))]
 
 		if member in members:
 			members.remove(member)
@@ -1379,7 +1379,7 @@ You can only add either **threads** **OR** one **voice channel**"""))
 			return await ctx.send(f"**You don't even have a tribe, you cannot do this, {member.mention}!**")
 
 		members: List[List[Union[int, str]]]  = await SlothClass.get_tribe_members(tribe_name=user_tribe['name'])
-		members: List[discord.Member] = [m for m_id in members if (m := discord.utils.get(ctx.guild.members, id=m_id[0]))]
+		members: List[discord.Member] = [m for m_id in members if (m := ctx.guild.get_member(m_id[0]))]
 
 		if member in members:
 			members.remove(member)
@@ -49,7 +49,7 @@ class CurseMember(CurseTable):
                 await voice_client.move_to(after.channel)
 
             else:
-                voicechannel = discord.utils.get(member.guild.channels, id=voice.channel.id)
+                voicechannel = member.guild.get_channel(voice.channel.id)
                 vc = await voicechannel.connect()
                 await self.play_earrape(member.id, vc)
 
@@ -59,10 +59,10 @@ class CurseMember(CurseTable):
         :param vc: The voice channel that the member's currently in. """
 
         guild = self.client.get_guild(server_id)
-        member = discord.utils.get(guild.members, id=mid)
+        member = guild.get_member(mid)
         voice = member.voice
         if voice:
-            voicechannel = discord.utils.get(guild.channels, id=voice.channel.id)
+            voicechannel = guild.get_channel(voice.channel.id)
             if member in voicechannel.members:
                 try:
                     vc.play(discord.FFmpegPCMAudio("earrape.mp3"), after=lambda e: self.client.loop.create_task(self.play_earrape(mid, vc)))
@@ -81,7 +81,7 @@ class CurseMember(CurseTable):
 
         if member.voice:
             await self.is_connected(ctx)
-            voicechannel = discord.utils.get(member.guild.channels, id=member.voice.channel.id)
+            voicechannel = member.guild.get_channel(member.voice.channel.id)
             vc = await voicechannel.connect()
             await self.play_earrape(member.id, vc)
 
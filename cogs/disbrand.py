@@ -53,7 +53,7 @@ class Disbrand(commands.Cog):
         
         guild = self.client.get_guild(server_id)
         sponsored_by_category = discord.utils.get(guild.categories, id=sponsored_by_category_id)
-        no_ads_role = discord.utils.get(guild.roles, id=no_ads_role_id)
+        no_ads_role = guild.get_role(no_ads_role_id)
 
         for pending_channel in pending_channels:
             overwrites = {}
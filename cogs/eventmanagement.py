@@ -45,10 +45,10 @@ class EventManagement(EventRoomsTable):
         """ Gets permissions for event rooms. """
 
         # Get some roles
-        event_host_role = discord.utils.get(guild.roles, id=event_host_role_id)
-        event_manager_role = discord.utils.get(guild.roles, id=event_manager_role_id)
-        preference_role = discord.utils.get(guild.roles, id=preference_role_id)
-        mod_role = discord.utils.get(guild.roles, id=mod_role_id)
+        event_host_role = guild.get_role(event_host_role_id)
+        event_manager_role = guild.get_role(event_manager_role_id)
+        preference_role = guild.get_role(preference_role_id)
+        mod_role = guild.get_role(mod_role_id)
 
         overwrites = {}
 
@@ -569,7 +569,7 @@ class EventManagement(EventRoomsTable):
 
         author: discord.Member = ctx.author
 
-        event_host = discord.utils.get(ctx.guild.roles, id=event_host_role_id)
+        event_host = ctx.guild.get_role(event_host_role_id)
         if event_host not in member.roles:
             return await ctx.send(f"**{member.mention} is not even an Event Host!**")
 
@@ -609,7 +609,7 @@ class EventManagement(EventRoomsTable):
 
         author: discord.Member = ctx.author
 
-        event_host = discord.utils.get(ctx.guild.roles, id=event_host_role_id)
+        event_host = ctx.guild.get_role(event_host_role_id)
         if event_host in member.roles:
             return await ctx.send(f"**{member.mention} already is an Event Host!**")
 
@@ -649,7 +649,7 @@ class EventManagement(EventRoomsTable):
 
         author: discord.Member = ctx.author
 
-        debate_organizer = discord.utils.get(ctx.guild.roles, id=debate_organizer_role_id)
+        debate_organizer = ctx.guild.get_role(debate_organizer_role_id)
         if debate_organizer not in member.roles:
             return await ctx.send(f"**{member.mention} is not even a `Debate Organizer`!**")
 
@@ -689,7 +689,7 @@ class EventManagement(EventRoomsTable):
 
         author: discord.Member = ctx.author
 
-        debate_organizer = discord.utils.get(ctx.guild.roles, id=debate_organizer_role_id)
+        debate_organizer = ctx.guild.get_role(debate_organizer_role_id)
         if debate_organizer in member.roles:
             return await ctx.send(f"**{member.mention} already is a `Debate Organizer`!**")
 
@@ -1,9 +1,10 @@
 # import.standard
 import math
 import os
+from functools import lru_cache, partial
 from io import BytesIO
 from random import choice
-from typing import Any, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 # import.thirdparty
 import discord
@@ -12,6 +13,195 @@ from PIL import Image, ImageDraw, ImageFont, ImageOps
 
 # import.local
 from extra import utils
+from extra.assets import assets
+from extra.cache import TTLCache
+from extra.customerrors import RenderQueueFull
+from extra.rendering import image_working_set, render_pool
+
+ImageFilter = Callable[[Image.Image], Image.Image]
+
+# Downloaded avatars and banners, so chained edits of the same picture don't fetch it again
+asset_bytes_cache = TTLCache(max_size=int(os.getenv('IMAGE_SOURCE_CACHE_SIZE', 100)), ttl=600)
+
+# The colour channels each colour command changes, as (red, green, blue)
+colour_channels: Dict[str, Tuple[bool, bool, bool]] = {
+    'red': (True, False, False),
+    'green': (False, True, False),
+    'blue': (False, False, True),
+    'yellow': (True, True, False),
+    'light_blue': (False, True, True),
+    'purple': (True, False, True),
+}
+
+@lru_cache(maxsize=128)
+def get_channels_lut(multiplier: float, r: bool = True, g: bool = True, b: bool = True) -> Tuple[int, ...]:
+    """ Gets the lookup table that multiplies the chosen colour channels of an RGBA image, clamped to 0-255.
+    The alpha channel is always kept as it is.
+    :param multiplier: The value to multiply the channels by.
+    :param r: Whether to change the red channel.
+    :param g: Whether to change the green channel.
+    :param b: Whether to change the blue channel. """
+
+    identity = tuple(range(256))
+    scaled = tuple(min(255, max(0, int(value * multiplier))) for value in identity)
+    return (scaled if r else identity) + (scaled if g else identity) + (scaled if b else identity) + identity
+
+def multiply_channels(image: Image.Image, multiplier: float, r: bool = True, g: bool = True, b: bool = True) -> Image.Image:
+    """ Multiplies the chosen colour channels of an image, keeping its transparency.
+    :param image: The image to change.
+    :param multiplier: The value to multiply the channels by.
+    :param r: Whether to change the red channel.
+    :param g: Whether to change the green channel.
+    :param b: Whether to change the blue channel. """
+
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    return image.point(get_channels_lut(multiplier, r, g, b))
+
+def change_image_brightness(image: Image.Image, action: str, percentage: int,
+    r: bool = True, g: bool = True, b: bool = True) -> Image.Image:
+    """ Changes the brightness level of the chosen colour channels of the image.
+    :param image: The image to change.
+    :param action: Whether to lighten or darken the image.
+    :param percentage: The percentage to ligthen or darken the image. """
+
+    brightness_multiplier = 1.0
+
+    if action == 'lighten':
+        brightness_multiplier += (percentage/100)
+    else:
+        brightness_multiplier -= (percentage/100)
+
+    return multiply_channels(image, brightness_multiplier, r, g, b)
+
+class WaveDeformer:
+    """ Deforms an image into a sine wave. """
+
+    def transform(self, x, y):
+        y = y + 10*math.sin(x/20)
+        return x, y
+
+    def transform_rectangle(self, x0, y0, x1, y1):
+        return (*self.transform(x0, y0),
+                *self.transform(x0, y1),
+                *self.transform(x1, y1),
+                *self.transform(x1, y0),
+                )
+
+    def getmesh(self, img):
+        self.w, self.h = img.size
+        gridspace = 20
+
+        target_grid = []
+        for x in range(0, self.w, gridspace):
+            for y in range(0, self.h, gridspace):
+                target_grid.append((x, y, x + gridspace, y + gridspace))
+
+        source_grid = [self.transform_rectangle(*rect) for rect in target_grid]
+
+        return [t for t in zip(target_grid, source_grid)]
+
+def wave_image(image: Image.Image) -> Image.Image:
+    """ Waves an image.
+    :param image: The image to wave. """
+
+    return ImageOps.deform(image, WaveDeformer())
+
+def rain_image(image: Image.Image) -> Image.Image:
+    """ Posterizes an image, making its colors look different.
+    :param image: The image to rain on. """
+
+    return ImageOps.posterize(image.convert('RGB'), 2)
+
+def invert_image(image: Image.Image) -> Image.Image:
+    """ Inverts an image to its negative form.
+    :param image: The image to invert. """
+
+    return ImageOps.invert(image.convert('RGB'))
+
+def rotate_image(image: Image.Image, scale: int) -> Image.Image:
+    """ Rotates an image.
+    :param image: The image to rotate.
+    :param scale: The scale to rotate the image. """
+
+    return image.rotate(int(scale))
+
+def get_font(image: Image.Image, text: str, font_name: str = None) -> ImageFont.FreeTypeFont:
+    """ Gets the font sized proportionally to the image size.
+    :param image: The image to proportion the font to.
+    :param text: The base text. """
+
+    if not font_name:
+        font_name = 'built titling sb.ttf'
+    font_path: str = f'media/fonts/{font_name}'
+
+    # Portion of image width you want text width to be
+    img_fraction = 0.50
+
+    return assets.fit_font(font_path, text, img_fraction*image.size[0])
+
+def caption_image(image: Image.Image, text: str) -> Image.Image:
+    """ Puts a caption in the middle of an image.
+    :param image: The image to put the caption on. It's left untouched, the caption goes on a copy.
+    :param text: The caption text. """
+
+    image = image.copy()
+    font = get_font(image, text)
+    W, H = image.size
+    draw = ImageDraw.Draw(image)
+    _, _, w, h = draw.textbbox((0, 0), text, font=font)
+    draw.text(((W-w)/2,(H-h)/2), text, fill="white", font=font)
+    return image
+
+def make_filter(name: str, value: Optional[int] = None) -> Optional[ImageFilter]:
+    """ Makes a filter that the filters command can chain, by its name.
+    :param name: The name of the filter.
+    :param value: The percentage or rotation scale of the filter, for those that take one. [Optional] """
+
+    name = name.lower().replace('-', '_')
+    if name == 'flip':
+        return ImageOps.flip
+    if name in ('sideways', 'side', 'mirror'):
+        return ImageOps.mirror
+    if name == 'rain':
+        return rain_image
+    if name in ('gray', 'grey'):
+        return ImageOps.grayscale
+    if name == 'wave':
+        return wave_image
+    if name in ('invert', 'negative', 'negate'):
+        return invert_image
+    if name == 'rotate':
+        return partial(rotate_image, scale=value or choice([90, 180, 50, 45, 270, 120, 80]))
+    if name in ('lighten', 'darken'):
+        return partial(change_image_brightness, action=name, percentage=55 if value is None else value)
+    if name in ('lightblue', 'light_blue'):
+        name = 'light_blue'
+    if name in colour_channels:
+        r, g, b = colour_channels[name]
+        return partial(change_image_brightness, action='lighten', percentage=55 if value is None else value, r=r, g=g, b=b)
+    return None
+
+def decode_image(image_bytes: bytes) -> Image.Image:
+    """ Decodes a downloaded image.
+    :param image_bytes: The encoded image. """
+
+    image = Image.open(BytesIO(image_bytes)).convert('RGBA')
+    image.load()
+    return image
+
+def run_filters(source: Union[Image.Image, bytes], filters: List[ImageFilter]) -> Tuple[Image.Image, bytes]:
+    """ Decodes an image if needed, applies a chain of filters to it and encodes the result. (Runs in the render pool)
+    :param source: The image, or the downloaded bytes of it.
+    :param filters: The filters to apply, in order. """
+
+    image = decode_image(source) if isinstance(source, bytes) else source
+    for apply_filter in filters:
+        image = apply_filter(image)
+
+    with BytesIO() as buffer:
+        image.save(buffer, format='png')
+        return image, buffer.getvalue()
 
 class ImageManipulation(commands.Cog):
     """ Categories for image manipulations and visualization. """
@@ -20,9 +210,6 @@ class ImageManipulation(commands.Cog):
         """ Class' init method. """
 
         self.client = client
-        self.cached_image: Union[
-            discord.Member.display_avatar, discord.User.display_avatar,
-            discord.Guild.banner] = None
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
@@ -30,6 +217,45 @@ class ImageManipulation(commands.Cog):
 
         print('ImageManipulation cog is ready!')
 
+    async def read_asset(self, asset: discord.Asset) -> bytes:
+        """ Downloads an asset, reusing a recent download of it.
+        :param asset: The avatar or banner to download. """
+
+        return await asset_bytes_cache.get(str(asset), asset.read)
+
+    async def get_image_source(self, ctx: commands.Context, member: Optional[discord.Member] = None) -> Union[Image.Image, bytes]:
+        """ Gets the image a command works on: the member's profile picture, or else the one the user is editing,
+        or else their own profile picture.
+        :param ctx: The context of the command.
+        :param member: The member whose profile picture to use. [Optional] """
+
+        if not member and (image := image_working_set.get(ctx.author.id)) is not None:
+            return image if isinstance(image, Image.Image) else await self.read_asset(image)
+
+        return await self.read_asset((member or ctx.author).display_avatar)
+
+    async def apply_filters(self, ctx: commands.Context, member: Optional[discord.Member],
+        filters: List[ImageFilter], file_name: str) -> None:
+        """ Applies a chain of filters to the image the command works on in one pass off the event loop,
+        keeps the result as the user's cached image and sends it.
+        :param ctx: The context of the command.
+        :param member: The member whose profile picture to use. [Optional]
+        :param filters: The filters to apply, in order.
+        :param file_name: The file name of the image to send. """
+
+        source = await self.get_image_source(ctx, member)
+        try:
+            image, bytes_image = await render_pool.run(run_filters, source, filters)
+        except RenderQueueFull:
+            return await ctx.reply(f"**{ctx.author.mention}, too many images are being made right now, try again in a bit!**")
+
+        image_working_set.set(ctx.author.id, image)
+        embed = discord.Embed(
+            color=int('36393F', 16)
+        )
+        embed.set_image(url=f'attachment://{file_name}')
+        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), file_name))
+
     @commands.command(aliases=['av', 'pfp', 'pic', 'picture', 'profile_picture'])
     async def avatar(self, ctx, member: Optional[discord.Member] = None) -> None:
         """ Shows the user avatar picture.
@@ -47,7 +273,7 @@ class ImageManipulation(commands.Cog):
         )
 
         embed.set_image(url=display)
-        self.cached_image = display
+        image_working_set.set(ctx.author.id, display)
         await ctx.reply(embed=embed)
 
     @commands.command()
@@ -73,79 +299,56 @@ class ImageManipulation(commands.Cog):
         )
 
         embed.set_image(url=banner)
-        self.cached_image = banner
+        image_working_set.set(ctx.author.id, banner)
         await ctx.send(embed=embed)
 
     @commands.command(aliases=["cache", "cached_image", "ci"])
     async def cached(self, ctx) -> None:
-        """ Shows the cached image. """
-
-        file = self.cached_image
+        """ Shows your cached image. """
 
-        if not file:
+        if image_working_set.get(ctx.author.id) is None:
             return await ctx.reply(f"**There isn't a cached image, {ctx.author.mention}!**")
 
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
+        await self.apply_filters(ctx, None, [], 'cached_image.png')
+
+    @commands.command(aliases=['chain'])
+    @commands.cooldown(1, 5, commands.BucketType.user)
+    async def filters(self, ctx, member: Optional[discord.Member] = None, *names: str) -> None:
+        """ Applies a chain of filters to an image in one go.
+        :param member: The member to apply the filters on the profile picture. [Optional][Default = Cached Image]
+        :param names: The filters to apply, in order. Filters that take a percentage or scale can be given one as filter:value, e.g. red:30. """
+
+        if not names:
+            return await ctx.reply("**Please, inform the `filters` to apply!**")
 
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
+        if len(names) > 10:
+            return await ctx.reply(f"**You can only chain up to 10 filters, {ctx.author.mention}!**")
 
-        embed.set_image(url='attachment://cached_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'cached_image.png'))
+        filters = []
+        for name in names:
+            name, _, value = name.partition(':')
+            if value and not value.lstrip('-').isdigit():
+                return await ctx.reply(f"**`{value}` isn't a valid value for the `{name}` filter, {ctx.author.mention}!**")
+
+            if not (image_filter := make_filter(name, int(value) if value else None)):
+                return await ctx.reply(f"**`{name}` isn't a filter, {ctx.author.mention}!**")
+            filters.append(image_filter)
+
+        await self.apply_filters(ctx, member, filters, 'filtered_image.png')
 
     @commands.command()
     async def flip(self, ctx, member: Optional[discord.Member] = None) -> None:
         """ Flips an image upside down.
         :param member: The member to flip the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image = ImageOps.flip(image)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://flipped_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'flipped_image.png'))
+        await self.apply_filters(ctx, member, [ImageOps.flip], 'flipped_image.png')
 
     @commands.command(aliases=["side"])
     async def sideways(self, ctx, member: Optional[discord.Member] = None) -> None:
         """ Flips an image sideways.
         :param member: The member to flip the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image = ImageOps.mirror(image)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://mirrored_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'mirrored_image.png'))
+        await self.apply_filters(ctx, member, [ImageOps.mirror], 'mirrored_image.png')
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -153,27 +356,7 @@ class ImageManipulation(commands.Cog):
         """ Rains on an image, making its colors look different.
         :param member: The member of whom to rain on the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image: Image.Image = ImageOps.posterize(image, 2)
-
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://rain_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'rain_image.png'))
+        await self.apply_filters(ctx, member, [rain_image], 'rain_image.png')
 
 
     @commands.command()
@@ -198,30 +381,7 @@ class ImageManipulation(commands.Cog):
         :param member: The member to rotate the profile picture from. [Optional][Default = Cached Image]
         :param scale: The scale to rotate the image. [Optional][Default = Random] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-
-        if not scale:
-            scale = choice([90, 180, 50, 45, 270, 120, 80])
-
-        image = image.rotate(int(scale))
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://rotated_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'rotated_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('rotate', scale)], 'rotated_image.png')
 
     @commands.command(aliases=['light', 'brighten', 'bright'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -229,24 +389,7 @@ class ImageManipulation(commands.Cog):
         """ Lightens an image.
         :param member: The member of whom to lighten the picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://lightened_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'lightened_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('lighten', percentage)], 'lightened_image.png')
 
     @commands.command(aliases=['dark', 'dim'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -254,83 +397,7 @@ class ImageManipulation(commands.Cog):
         """ Darkens an image.
         :param member: The member of whom to darken the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='darken', percentage=percentage)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://darkened_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'darkened_image.png'))
-
-    async def image_to_byte_array(self, image: Image.Image) -> bytes:
-        """ Converts an image to bytes.
-        :param image: The image to convert to bytes. """
-
-        imgByteArr = BytesIO()
-        image.save(imgByteArr, format='png')
-        imgByteArr = imgByteArr.getvalue()
-        return imgByteArr
-
-    async def change_image_brightness(self, file: Any, action: str, percentage: int,
-        r: bool = True, g: bool = True, b: bool = True) -> None:
-        """ Changes the brightness level of each pixel of the image.
-        :param file: The file to execute the task on.
-        :param action: Whether to lighten or darken the image.
-        :param percentage: The percentage to ligthen or darken the image. """
-
-        if not isinstance(file, Image.Image):
-            original_image = Image.open(BytesIO(await file.read()))
-        else:
-            original_image = file
-        pixels = original_image.getdata()
-
-        #initialise the new image
-        new_image = Image.new('RGB', original_image.size)
-        new_image_list = []
-
-        brightness_multiplier = 1.0
-
-        if action == 'lighten':
-            brightness_multiplier += (percentage/100)
-        else:
-            brightness_multiplier -= (percentage/100)
-
-
-        # Fixes non tuple pixel sets
-        if isinstance(pixels[0], int):
-            pixels = [(px, px, px, px) for px in pixels]
-
-        #for each pixel, append the brightened or darkened version to the new image list
-        for pixel in pixels:
-            new_pixel = (
-                int(pixel[0] * brightness_multiplier) if r else int(pixel[0]),
-                int(pixel[1] * brightness_multiplier) if g else int(pixel[1]),
-                int(pixel[2] * brightness_multiplier) if b else int(pixel[2])
-            )
-
-            #check the new pixel values are within rgb range
-            for pixel in new_pixel:
-                if pixel > 255:
-                    pixel = 255
-                elif pixel < 0:
-                    pixel = 0
-
-            new_image_list.append(new_pixel)
-
-        #save the new image
-        new_image.putdata(new_image_list)
-        return new_image
+        await self.apply_filters(ctx, member, [make_filter('darken', percentage)], 'darkened_image.png')
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -338,24 +405,7 @@ class ImageManipulation(commands.Cog):
         """ Makes an image redder.
         :param member: The member of whom to increase the red values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, b=False, g=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://red_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'red_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('red', percentage)], 'red_image.png')
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -363,24 +413,7 @@ class ImageManipulation(commands.Cog):
         """ Makes an image bluer.
         :param member: The member of whom to increase the bluer values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, r=False, g=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://blue_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'blue_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('blue', percentage)], 'blue_image.png')
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -388,24 +421,7 @@ class ImageManipulation(commands.Cog):
         """ Makes an image yellower.
         :param member: The member of whom to increase the yellow values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, b=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://yellow_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'yellow_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('yellow', percentage)], 'yellow_image.png')
 
     @commands.command(aliases=['lightblue'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -413,24 +429,7 @@ class ImageManipulation(commands.Cog):
         """ Makes an image light-bluer.
         :param member: The member of whom to increase the light blue values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, r=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://light_blue_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'light_blue_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('light_blue', percentage)], 'light_blue_image.png')
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -438,24 +437,7 @@ class ImageManipulation(commands.Cog):
         """ Makes an image purpleer.
         :param member: The member of whom to increase the purple values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, g=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://purple_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'purple_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('purple', percentage)], 'purple_image.png')
 
     @commands.command()
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -463,24 +445,7 @@ class ImageManipulation(commands.Cog):
         """ Makes an image greener.
         :param member: The member of whom to increase the green values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-        image: Image.Image = await self.change_image_brightness(file=file, action='lighten', percentage=percentage, r=False, b=False)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://green_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'green_image.png'))
+        await self.apply_filters(ctx, member, [make_filter('green', percentage)], 'green_image.png')
 
     @commands.command(aliases=['grey'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -488,27 +453,7 @@ class ImageManipulation(commands.Cog):
         """ Makes an image grayer/greyer.
         :param member: The member of whom to increase the gray/grey values of the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        image: Image.Image = ImageOps.grayscale(image)
-
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://gray_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'gray_image.png'))
+        await self.apply_filters(ctx, member, [ImageOps.grayscale], 'gray_image.png')
 
 
     @commands.command()
@@ -517,108 +462,14 @@ class ImageManipulation(commands.Cog):
         """ Waves an image.
         :param member: The member to wave the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        class WaveDeformer:
-
-            def transform(self, x, y):
-                y = y + 10*math.sin(x/20)
-                return x, y
-
-            def transform_rectangle(self, x0, y0, x1, y1):
-                return (*self.transform(x0, y0),
-                        *self.transform(x0, y1),
-                        *self.transform(x1, y1),
-                        *self.transform(x1, y0),
-                        )
-
-            def getmesh(self, img):
-                self.w, self.h = img.size
-                gridspace = 20
-
-                target_grid = []
-                for x in range(0, self.w, gridspace):
-                    for y in range(0, self.h, gridspace):
-                        target_grid.append((x, y, x + gridspace, y + gridspace))
-
-                source_grid = [self.transform_rectangle(*rect) for rect in target_grid]
-
-                return [t for t in zip(target_grid, source_grid)]
-        
-        wave_image = ImageOps.deform(image, WaveDeformer())
-        self.cached_image = wave_image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://wave_image.png')
-        bytes_image = await self.image_to_byte_array(wave_image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'wave_image.png'))
+        await self.apply_filters(ctx, member, [wave_image], 'wave_image.png')
 
     @commands.command(aliases=["negative", "negate"])
     async def invert(self, ctx, member: Optional[discord.Member] = None) -> None:
         """ Inverts an image to its negative form..
         :param member: The member to invert the profile picture. [Optional][Default = Cached Image] """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        
-        if isinstance(image, Image.Image):
-            image = image.convert('RGB')
-        
-        image = ImageOps.invert(image)
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-        embed.set_image(url='attachment://inverted_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'inverted_image.png'))
-
-
-    async def get_font(self, image: Image.Image, text: str, font_name: str = None) -> ImageFont:
-        """ Gets the font sized proportionally to the image size.
-        :param image: The image to proportion the font to.
-        :param text: The base text. """
-
-        fontsize = 1  # starting font size
-
-        if not font_name:
-            font_name = 'built titling sb.ttf'
-        font_path: str = f'media/fonts/{font_name}'
-
-        # Portion of image width you want text width to be
-        img_fraction = 0.50
-
-        font = ImageFont.truetype(font_path, fontsize)
-
-        while font.getsize(text)[0] < img_fraction*image.size[0]:
-            # Iterates until the text size is just larger than the criteria
-            fontsize += 1
-            font = ImageFont.truetype(font_path, fontsize)
-
-        # Optionally de-increments to be sure it is less than criteria
-        fontsize -= 1
-        font = ImageFont.truetype(font_path, fontsize)
-
-        return font
+        await self.apply_filters(ctx, member, [invert_image], 'inverted_image.png')
 
     @commands.command(aliases=['write', 'cap'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -627,42 +478,14 @@ class ImageManipulation(commands.Cog):
         :param member: The member to put the caption on the profile picture. [Optional][Default = Cached Image].
         :param text: The caption text to put on the image. """
 
-        file: Any = None
-
-        if member:
-            file = member.display_avatar
-        else:
-            if self.cached_image:
-                file = self.cached_image
-            else:
-                file = ctx.author.display_avatar
-
         if not text:
             return await ctx.reply("**Please, inform a `caption text`!**")
 
-        image = file if isinstance(file, Image.Image) else Image.open(BytesIO(await file.read()))
-        
-        text = str(text).strip() if text else None
-        # Puts the caption
-        font = await self.get_font(image, text)
-        W, H = image.size
-        draw = ImageDraw.Draw(image)
-        w, h = draw.textsize(text, font=font)
-        draw.text(((W-w)/2,(H-h)/2), text, fill="white", font=font)
-        # draw.text(((W-w)/2,(H-h)/2-120), text, fill="white", font=small)
-
-
-        self.cached_image = image
-        embed = discord.Embed(
-            color=int('36393F', 16)
-        )
-
-        embed.set_image(url='attachment://captioned_image.png')
-        bytes_image = await self.image_to_byte_array(image)
-        await ctx.reply(embed=embed, file=discord.File(BytesIO(bytes_image), 'captioned_image.png'))
+        text = str(text).strip()
+        await self.apply_filters(ctx, member, [partial(caption_image, text=text)], 'captioned_image.png')
 
 
 def setup(client: commands.Cog) -> None:
     """ Cog's setup function. """
 
-    client.add_cog(ImageManipulation(client))
\ No newline at end of file
+    client.add_cog(ImageManipulation(client))
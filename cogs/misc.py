@@ -48,7 +48,7 @@ class Misc(*misc_cogs):
         reminders = await self.get_due_reminders(current_ts)
         guild = self.client.get_guild(server_id)
         for reminder in reminders:
-            member = discord.utils.get(guild.members, id=reminder[1])
+            member = guild.get_member(reminder[1])
             if member:
                 try:	
                     await member.send(f"**`Reminder:`** {reminder[2]}")
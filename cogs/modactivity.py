@@ -1,6 +1,6 @@
 # import.standard
 import os
-from typing import List
+from typing import List, Set
 
 # import.thirdparty
 import discord
@@ -10,7 +10,7 @@ from discord.ext import commands
 from extra import utils
 from extra.moderation.modactivity import ModActivityTable
 from extra.prompt.menu import ConfirmButton
-from mysqldb import DatabaseCore
+from mysqldb import DatabaseCore, write_buffer
 
 # variables.id
 guild_id = int(os.getenv('SERVER_ID', 123))
@@ -27,32 +27,50 @@ class ModActivity(ModActivityTable):
 
         self.client = client
         self.db = DatabaseCore()
+        # IDs of the members with the moderator role, kept current by the role-change events
+        self.moderators: Set[int] = set()
+        self.tracked_mods: Set[int] = set()
 
     @commands.Cog.listener()
     async def on_ready(self):
+        guild = self.client.get_guild(guild_id)
+        if guild and (moderator_role := guild.get_role(mod_role_id)):
+            self.moderators = {member.id for member in moderator_role.members}
+        self.tracked_mods = {mod[0] for mod in await self.get_mod_activities()}
         print('ModActivity cog is ready!')
 
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        """ Keeps the moderators set current when someone gets or loses the moderator role. """
+
+        if after.get_role(mod_role_id):
+            self.moderators.add(after.id)
+        else:
+            self.moderators.discard(after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.moderators.discard(member.id)
+
     @commands.Cog.listener()
     async def on_message(self, message):
         if not message.guild:
             return
         if message.author.bot:
             return
-        guild = self.client.get_guild(guild_id)
-        moderator_role = discord.utils.get(guild.roles, id=mod_role_id)
-        if moderator_role not in message.author.roles:
+        if message.author.id not in self.moderators:
             return
 
-        await self.get_moderator_current_messages(message.author.id)
-        await self.update_moderator_message(message.author.id)
+        if message.author.id not in self.tracked_mods:
+            return await self.insert_moderator(message.author.id, messages=1)
+
+        self.update_moderator_message(message.author.id)
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
         if member.bot:
             return
-        guild = self.client.get_guild(guild_id)
-        moderator_role = discord.utils.get(guild.roles, id=mod_role_id)
-        if moderator_role not in member.roles:
+        if member.id not in self.moderators:
             return
 
         current_ts = await utils.get_timestamp()
@@ -72,6 +90,8 @@ class ModActivity(ModActivityTable):
     async def modrep(self, ctx):
         """ (STAFF) Shows all the moderators and their statuses in embedded messages. """
 
+        # Writes the buffered message counters before reading them
+        await write_buffer.flush()
         mod_activities = await self.get_mod_activities()
         member: discord.Member = ctx.author
 
@@ -115,7 +135,7 @@ class ModActivity(ModActivityTable):
             mod_id, time_in_vc, _, messages = mod
             m, s = divmod(time_in_vc, 60)
             h, m = divmod(m, 60)
-            user = discord.utils.get(ctx.guild.members, id=mod_id)
+            user = ctx.guild.get_member(mod_id)
             is_active =  h >= 3 or messages >= 30
             icon = '🔹' if is_active else '🔸'
             moderator_data = {"user": user,"icon": icon, "hours": h, "minutes": m, "seconds": s, "messages": messages }
@@ -154,7 +174,7 @@ class ModActivity(ModActivityTable):
     async def track_mod_activity(self, ctx, mod: discord.Member):
         """ (STAFF) Starts tracking a moderator activity. """
         guild = self.client.get_guild(guild_id)
-        moderator_role = discord.utils.get(guild.roles, id=mod_role_id)
+        moderator_role = guild.get_role(mod_role_id)
 
         if moderator_role not in mod.roles:
             return await ctx.send(f"**{mod.mention} is not a moderator!**")
@@ -171,7 +191,7 @@ class ModActivity(ModActivityTable):
         """ (STAFF) Stop tracking a moderator activity. Use this command if an user is no longer a moderator. """
 
         guild = self.client.get_guild(guild_id)
-        moderator_role = discord.utils.get(guild.roles, id=mod_role_id)
+        moderator_role = guild.get_role(mod_role_id)
 
         if moderator_role not in mod.roles:
             return await ctx.send(f"**{mod.mention} is not a moderator!**")
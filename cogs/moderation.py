@@ -12,6 +12,7 @@ from discord.ext import commands, menus, tasks
 
 # import.local
 from extra import utils
+from extra.cache import TTLCache
 from extra.menu import MemberSnipeLooping, SnipeLooping, prompt_message_guild, prompt_number
 from extra.moderation.fakeaccounts import ModerationFakeAccountsTable
 from extra.moderation.firewall import (BypassFirewallTable,
@@ -22,6 +23,7 @@ from extra.moderation.user_muted_galaxies import UserMutedGalaxiesTable
 from extra.moderation.userinfractions import ModerationUserInfractionsTable
 from extra.moderation.watchlist import ModerationWatchlistTable
 from extra.prompt.menu import Confirm
+from extra.snipe import DeletedMessage, deleted_messages
 from extra.useful_variables import banned_links
 from extra.view import ReportSupportView, WarnRulesView
 from mysqldb import DatabaseCore
@@ -53,7 +55,10 @@ frog_catchers_channel_id: int = int(os.getenv("FROG_CATCHERS_CHANNEL_ID", 123))
 teacher_applicant_infraction_thread_id: int = int(os.getenv("TEACHER_APPLICANT_INFRACTION_THREAD_ID", 123))
 host_applicant_infraction_thread_id: int = int(os.getenv("HOST_APPLICANT_INFRACTION_THREAD_ID", 123))
 
-last_deleted_message = []
+# Banned links are matched as whole words, so a set lookup per word is enough
+banned_link_set = frozenset(banned_links)
+# Invite codes that always belong to the server (vanity URL and the permanent invite)
+allowed_invite_codes = frozenset(['languages', 'TE6hPrn65a'])
 
 moderation_cogs: List[commands.Cog] = [
     ModerationFirewallTable, BypassFirewallTable, ModerationMutedMemberTable, 
@@ -64,14 +69,14 @@ moderation_cogs: List[commands.Cog] = [
 class Moderation(*moderation_cogs):
     """ Moderation related commands. """
 
-    INVITE_TYPES = [
-        "discord.gg/", "discord.com/invites/",
-        "discord.gg/events/", "discord.com/events/"
-    ]
+    # Event links (discord.gg/events/, discord.com/events/) aren't invites, so they're left out
+    INVITE_REGEX = re.compile(r'discord(?:\.gg|(?:app)?\.com/invites?)/(?!events/)([a-z0-9-]+)', re.IGNORECASE)
 
     def __init__(self, client):
         self.client = client
         self.db = DatabaseCore()
+        # The server's own invite codes by guild ID, kept current by the invite events
+        self.invite_codes = TTLCache(max_size=10, ttl=3600)
 
     @commands.Cog.listener()
     async def on_ready(self):
@@ -95,17 +100,30 @@ class Moderation(*moderation_cogs):
         await self.check_banned_links(message)
 
         # Invite tracker
-        msg = str(message.content)
-        invite_root = self.get_invite_root(msg.lower().strip())
+        invite_codes = self.get_invite_codes(str(message.content))
 
-        if invite_root and invite_root not in ("discord.gg/events/", "discord.com/events/"):
+        if invite_codes:
             ctx = await self.client.get_context(message)
             if not await utils.is_allowed([*allowed_roles, sponsor_role_id]).predicate(ctx):
-                is_from_guild = await self.check_invite_guild(msg, message.guild, invite_root)
+                is_from_guild = await self.check_invite_guild(invite_codes, message.guild)
 
                 if not is_from_guild:
                     return await self._mute_callback(ctx, member=message.author, reason="Invite Advertisement.")
 
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite: discord.Invite) -> None:
+        """ Adds a new invite to the cached invite codes of its guild. """
+
+        if invite.guild:
+            self.invite_codes.update(invite.guild.id, lambda codes: codes | {invite.code})
+
+    @commands.Cog.listener()
+    async def on_invite_delete(self, invite: discord.Invite) -> None:
+        """ Removes a deleted invite from the cached invite codes of its guild. """
+
+        if invite.guild:
+            self.invite_codes.update(invite.guild.id, lambda codes: codes - {invite.code})
+
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
         """ Checks whether a member is picking roles while muted. """
@@ -143,7 +161,7 @@ class Moderation(*moderation_cogs):
         # Checks whether the user has muted roles in the database
         if await self.get_muted_roles(member.id):
             keep_roles, _ = await self.get_remove_roles(member, keep_roles=allowed_roles)
-            muted_role = discord.utils.get(member.guild.roles, id=muted_role_id)
+            muted_role = member.guild.get_role(muted_role_id)
 
             # If the user, for some reason, doesn't have the muted role, adds it
             if muted_role not in keep_roles:
@@ -152,15 +170,11 @@ class Moderation(*moderation_cogs):
             # Updates the user roles
             await member.edit(roles=keep_roles)
 
-    def get_invite_root(self, message: str) -> str:
-        """ Gets the invite root from an invite link.
+    def get_invite_codes(self, message: str) -> List[str]:
+        """ Gets the codes of the invite links in a message.
         :param message: The message content. """
 
-        for invite_type in self.INVITE_TYPES:
-            if invite_type in message:
-                return invite_type
-            
-        return ""
+        return self.INVITE_REGEX.findall(message)
 
     async def check_banned_links(self, message: discord.Message) -> None:
         """ Checks if the message sent was or contains a banned link. """
@@ -169,17 +183,16 @@ class Moderation(*moderation_cogs):
 
         # Checks it in the message attachments
         for video in videos:
-            if str(video) in banned_links:
+            if str(video) in banned_link_set:
                 ctx = await self.client.get_context(message)
                 if not await utils.is_allowed(allowed_roles).predicate(ctx):
                     return await self._mute_callback(ctx, member=message.author, reason="Banned Link")
 
         # Checks it in the message content
-        for word in message.content.split():
-            if word in banned_links:
-                ctx = await self.client.get_context(message)
-                if not await utils.is_allowed(allowed_roles).predicate(ctx):
-                    return await self._mute_callback(ctx, member=message.author, reason="Banned Link")
+        if not banned_link_set.isdisjoint(message.content.split()):
+            ctx = await self.client.get_context(message)
+            if not await utils.is_allowed(allowed_roles).predicate(ctx):
+                return await self._mute_callback(ctx, member=message.author, reason="Banned Link")
 
     @tasks.loop(minutes=1)
     async def look_for_expired_tempmutes(self) -> None:
@@ -190,19 +203,19 @@ class Moderation(*moderation_cogs):
         guild = self.client.get_guild(server_id)
 
         for tm in tempmutes:
-            member = discord.utils.get(guild.members, id=tm)
+            member = guild.get_member(tm)
             if not member:
                 continue
 
             try:
-                role = discord.utils.get(guild.roles, id=muted_role_id)
+                role = guild.get_role(muted_role_id)
                 if role:
                     if user_roles := await self.get_muted_roles(member.id):
 
-                        bot = discord.utils.get(guild.members, id=self.client.user.id)
+                        bot = guild.get_member(self.client.user.id)
 
                         member_roles = list([
-                            a_role for the_role in user_roles if (a_role := discord.utils.get(guild.roles, id=the_role[1]))
+                            a_role for the_role in user_roles if (a_role := guild.get_role(the_role[1]))
                             and a_role < bot.top_role
                         ])
                         member_roles.extend(member.roles)
@@ -223,7 +236,7 @@ class Moderation(*moderation_cogs):
                             current_time = await utils.get_time_now()
 
                             # Moderation log embed
-                            moderation_log = discord.utils.get(guild.channels, id=mod_log_id)
+                            moderation_log = guild.get_channel(mod_log_id)
                             embed = discord.Embed(title='__**Unmute**__', colour=discord.Colour.light_grey(), timestamp=current_time)
                             embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
                             inline=False)
@@ -238,35 +251,24 @@ class Moderation(*moderation_cogs):
                 print(e)
                 continue
 
-    async def check_invite_guild(self, msg, guild, invite_root: str):
-        """ Checks whether it's a guild invite or not. """
+    async def check_invite_guild(self, invite_codes: List[str], guild: discord.Guild) -> bool:
+        """ Checks whether all the invites are from the guild or not.
+        :param invite_codes: The codes of the invites.
+        :param guild: The guild. """
 
-        start_index = msg.index(invite_root)
-        end_index = start_index + len(invite_root)
-        invite_hash = ''
-        for c in msg[end_index:]:
-            if c == ' ':
-                break
+        invite_codes = set(invite_codes) - allowed_invite_codes
+        if not invite_codes:
+            return True
 
-            invite_hash += c
+        guild_codes = await self.invite_codes.get(guild.id, lambda: self.load_invite_codes(guild))
+        return invite_codes <= guild_codes
 
-        for char in ['!', '@', '.', '(', ')', '[', ']', '#', '?', ':', ';', '`', '"', "'", ',', '{', '}']:
-            invite_hash = invite_hash.replace(char, '')
-        invite = invite_root + invite_hash
-        inv_code = discord.utils.resolve_invite(invite)
-        print(inv_code)
-        if inv_code == 'languages':
-            return True
+    async def load_invite_codes(self, guild: discord.Guild) -> frozenset:
+        """ Loads the codes of the guild's invites.
+        :param guild: The guild. """
 
-        if inv_code in ['TE6hPrn65a']:
-            return True
+        return frozenset(invite.code for invite in await guild.invites())
 
-        guild_inv = discord.utils.get(await guild.invites(), code=inv_code)
-        if guild_inv:
-            return True
-        else:
-            return False
-        
     async def check_if_pinged_staff(self, message: discord.Message) -> None:
         """ Checks whether the member pinged the Staff in the message.
         :param message: The message the member sent. """
@@ -281,9 +283,9 @@ class Moderation(*moderation_cogs):
 
         # Makes a set with the Staff roles
         staff_mentions = set([
-            discord.utils.get(guild.roles, id=mod_role_id), # Mod
-            discord.utils.get(guild.roles, id=senior_mod_role_id), # Staff Manager
-            discord.utils.get(guild.roles, id=admin_role_id) # Admin
+            guild.get_role(mod_role_id), # Mod
+            guild.get_role(senior_mod_role_id), # Staff Manager
+            guild.get_role(admin_role_id) # Admin
         ])
 
         # Checks whether any of the Staff roles were in the list of roles pinged in the message
@@ -298,7 +300,7 @@ class Moderation(*moderation_cogs):
             return
 
         if await self.get_muted_roles(member.id):
-            muted_role = discord.utils.get(member.guild.roles, id=muted_role_id)
+            muted_role = member.guild.get_role(muted_role_id)
             await member.add_roles(muted_role)
 
     @commands.Cog.listener(name="on_member_join")
@@ -336,7 +338,7 @@ class Moderation(*moderation_cogs):
                         from_time = current_time + time_check
                         timedout_until = datetime.fromtimestamp(from_time)
 
-                        timedout_role = discord.utils.get(member.guild.roles, id=timedout_role_id)
+                        timedout_role = member.guild.get_role(timedout_role_id)
                         if timedout_role not in member.roles:
                             await member.add_roles(timedout_role)
 
@@ -355,20 +357,7 @@ class Moderation(*moderation_cogs):
         if message.author.bot:
             return
 
-        if len(last_deleted_message) >= 1000:
-            last_deleted_message[1:]
-        last_deleted_message.append({message.author.id : {"content" : message.content, "time" : (message.created_at).timestamp(), 'channel' : message.channel }})
-
-    async def search_user_deleted_messages(self, member) -> List[Dict]:
-        deleteds_messages = []
-        for message in last_deleted_message:
-            member_id = next(iter(message))
-            if member_id == member.id:
-                message = message[member_id]
-                deleteds_messages.append({"content" : message["content"], "time" : message["time"], "channel" : message["channel"]})
-
-        deleteds_messages = (sorted(deleteds_messages, key = lambda d: d['time']))
-        return deleteds_messages
+        deleted_messages.add(message)
 
 
     @commands.command()
@@ -380,32 +369,28 @@ class Moderation(*moderation_cogs):
 
         member, message_qtd = await utils.greedy_member_reason(ctx, message)
 
-        if not last_deleted_message:
+        if not deleted_messages:
             #await ctx.message.delete()
             return await ctx.send("**I couldn't snipe any message.**")
 
         if not member:
             if not message_qtd:
                 # Gets the last deleted message
-                messages: List[Dict] = [last_deleted_message[-1]]
+                messages: List[DeletedMessage] = deleted_messages.latest()
 
             else:
                 # Gets the requested amount of deleted messages
                 if int(message_qtd) <= 0:
                     return await ctx.send("**I couldn't snipe any message.**")
 
-                if int(message_qtd) > len(last_deleted_message):
-                    message_qtd: int = len(last_deleted_message)
-
-                messages: List[Dict] = sorted(last_deleted_message, key = lambda d:  d[next(iter(d))]['time'])
-                messages: List[Dict] = messages[- int(message_qtd): ]
+                messages: List[DeletedMessage] = deleted_messages.latest(int(message_qtd))
             menu = menus.MenuPages(SnipeLooping(messages))
             #await ctx.message.delete()
             await menu.start(ctx)
 
         else:
             # Gets all deleted messsages from the user
-            messages: List[Dict] = await self.search_user_deleted_messages(member[0])
+            messages: List[DeletedMessage] = deleted_messages.by_author(member[0].id)
 
             if not messages:
                 return await ctx.send("**I couldn't snipe any messages from this member.**")
@@ -656,7 +641,7 @@ class Moderation(*moderation_cogs):
                     general_embed.set_author(name=f'{member} has been {warn_msg}warned', icon_url=member.display_avatar)
                     await ctx.send(embed=general_embed)
                     # Moderation log embed
-                    moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                    moderation_log = ctx.guild.get_channel(mod_log_id)
                     embed = discord.Embed(title=f'__**{warn_type.capitalize()} Warning**__', colour=discord.Colour.dark_gold(),
                                         timestamp=ctx.message.created_at)
                     embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
@@ -779,7 +764,7 @@ class Moderation(*moderation_cogs):
         if await utils.is_allowed(allowed_roles).predicate(channel=ctx.channel, member=member):
             return
 
-        muted_role = discord.utils.get(ctx.guild.roles, id=muted_role_id)
+        muted_role = ctx.guild.get_role(muted_role_id)
         if muted_role in member.roles:
             await self._unmute_callback(ctx, member)
           
@@ -789,7 +774,7 @@ class Moderation(*moderation_cogs):
         if hours == 0 and days == 0 and weeks == 0:
             return
         
-        timedout_role = discord.utils.get(ctx.guild.roles, id=timedout_role_id)
+        timedout_role = ctx.guild.get_role(timedout_role_id)
         if timedout_role not in member.roles:
             await member.add_roles(timedout_role)
         
@@ -811,7 +796,7 @@ class Moderation(*moderation_cogs):
         """ Task that checks Timeouts expirations. """
         
         guild = self.client.get_guild(server_id)
-        role = discord.utils.get(guild.roles, id=timedout_role_id)
+        role = guild.get_role(timedout_role_id)
         members = role.members
         
         for member in members:
@@ -830,11 +815,11 @@ class Moderation(*moderation_cogs):
         :param keep_roles: The list of roles to keep. [Optional] """
 
 
-        bot = discord.utils.get(member.guild.members, id=self.client.user.id)
+        bot = member.guild.get_member(self.client.user.id)
 
         keep_roles: List[int] = [
             keep_role if isinstance(keep_role, discord.Role) else
-            discord.utils.get(member.guild.roles, id=keep_role)
+            member.guild.get_role(keep_role)
             for keep_role in keep_roles
         ]
 
@@ -1003,7 +988,7 @@ class Moderation(*moderation_cogs):
         else:
             answer = ctx.respond
 
-        role = discord.utils.get(ctx.guild.roles, id=muted_role_id)
+        role = ctx.guild.get_role(muted_role_id)
         if not member:
             return await ctx.send("**Please, specify a member!**")
         
@@ -1051,7 +1036,7 @@ class Moderation(*moderation_cogs):
                 pass
 
             # Moderation log embed
-            moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+            moderation_log = ctx.guild.get_channel(mod_log_id)
             embed = discord.Embed(title='__**Mute**__', color=discord.Color.dark_grey(),
                                 timestamp=current_time)
             embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
@@ -1096,7 +1081,7 @@ class Moderation(*moderation_cogs):
                 else:
                     await ctx.send(f"** The user `{member}` is not on the server**")
         else:
-            role = discord.utils.get(ctx.guild.roles, id=muted_role_id)
+            role = ctx.guild.get_role(muted_role_id)
             for member in members:
                 if ctx.guild.get_member(member.id):
                     if role in member.roles:
@@ -1107,7 +1092,7 @@ class Moderation(*moderation_cogs):
                         general_embed.set_author(name=f"{member} will be unmuted", icon_url=member.display_avatar)
                         await ctx.send(embed=general_embed)
 
-                        moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                        moderation_log = ctx.guild.get_channel(mod_log_id)
                         embed = discord.Embed(
                             description=F"**Unmuting** {member.mention}\n **In:** `{time_dict['days']}d`, `{time_dict['hours']}h`, `{time_dict['minutes']}m`\n**Location:** {ctx.channel.mention}",
                             color=discord.Color.lighter_grey(),
@@ -1147,7 +1132,7 @@ class Moderation(*moderation_cogs):
         else:
             answer = ctx.respond
 
-        role = discord.utils.get(ctx.guild.roles, id=muted_role_id)
+        role = ctx.guild.get_role(muted_role_id)
         if not member:
             return await answer("**Please, specify a member!**")
 
@@ -1156,10 +1141,10 @@ class Moderation(*moderation_cogs):
 
         if user_roles := await self.get_muted_roles(member.id):
 
-            bot = discord.utils.get(ctx.guild.members, id=self.client.user.id)
+            bot = ctx.guild.get_member(self.client.user.id)
 
             member_roles = list([
-                a_role for the_role in user_roles if (a_role := discord.utils.get(member.guild.roles, id=the_role[1]))
+                a_role for the_role in user_roles if (a_role := member.guild.get_role(the_role[1]))
                 and a_role < bot.top_role
             ])
             member_roles.extend(member.roles)
@@ -1191,7 +1176,7 @@ class Moderation(*moderation_cogs):
         general_embed.set_author(name=f'{member} has been unmuted', icon_url=member.display_avatar)
         await answer(embed=general_embed)
         # Moderation log embed
-        moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+        moderation_log = ctx.guild.get_channel(mod_log_id)
         embed = discord.Embed(title='__**Unmute**__', colour=discord.Colour.light_grey(),
                                 timestamp=current_time)
         embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
@@ -1216,7 +1201,7 @@ class Moderation(*moderation_cogs):
 
         await ctx.message.delete()
 
-        role = discord.utils.get(ctx.guild.roles, id=muted_role_id)
+        role = ctx.guild.get_role(muted_role_id)
 
         if not member:
             return await ctx.send("**Please, specify a member!**", delete_after=3)
@@ -1247,7 +1232,7 @@ class Moderation(*moderation_cogs):
             general_embed.set_author(name=f"{member} has been tempmuted", icon_url=member.display_avatar)
             await ctx.send(embed=general_embed)
             # Moderation log embed
-            moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+            moderation_log = ctx.guild.get_channel(mod_log_id)
             embed = discord.Embed(
                 description=F"**Tempmuted** {member.mention} for `{time_dict['days']}d`, `{time_dict['hours']}h`, `{time_dict['minutes']}m` and `{time_dict['seconds']}s`\n**Reason:** {reason}\n**Location:** {ctx.channel.mention}",
                 color=discord.Color.lighter_grey(),
@@ -1275,11 +1260,11 @@ class Moderation(*moderation_cogs):
         await ctx.message.delete()
         perpetrator = ctx.author
 
-        muted_role = discord.utils.get(ctx.guild.roles, id=muted_role_id)
+        muted_role = ctx.guild.get_role(muted_role_id)
         current_ts = await utils.get_timestamp()
         muted_members = [
             muted_member for m in await self.get_muted_members(current_ts, 2) 
-            if (muted_member := discord.utils.get(ctx.guild.members, id=m)) and muted_role in muted_member.roles
+            if (muted_member := ctx.guild.get_member(m)) and muted_role in muted_member.roles
         ]
 
         if len(muted_members) == 0:
@@ -1314,7 +1299,7 @@ class Moderation(*moderation_cogs):
                 await ctx.send(embed=general_embed)
 
                 # Moderation log embed
-                moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                moderation_log = ctx.guild.get_channel(mod_log_id)
                 embed = discord.Embed(title='__**Kick**__', color=discord.Color.teal(),
                                     timestamp=ctx.message.created_at)
                 muted_text = '\n'.join(kicked_members)
@@ -1369,7 +1354,7 @@ class Moderation(*moderation_cogs):
                         await ctx.send('**You cannot do that!**', delete_after=3)
                     else:
                         # Moderation log embed
-                        moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                        moderation_log = ctx.guild.get_channel(mod_log_id)
                         embed = discord.Embed(title='__**Kick**__', colour=discord.Colour.magenta(),
                                                 timestamp=ctx.message.created_at)
                         embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
@@ -1504,7 +1489,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
                 await ctx.send('**You cannot do that!**', delete_after=3)
             else:
                 # Moderation log embed
-                moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                moderation_log = ctx.guild.get_channel(mod_log_id)
                 embed = discord.Embed(title='__**Banishment**__', colour=discord.Colour.dark_red(),
                                     timestamp=ctx.message.created_at)
                 embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
@@ -1569,7 +1554,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
                 general_embed.set_author(name=f'{user} has been unbanned', icon_url=user.display_avatar)
                 await ctx.send(embed=general_embed)
                 # Moderation log embed
-                moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                moderation_log = ctx.guild.get_channel(mod_log_id)
                 embed = discord.Embed(title='__**Unbanishment**__', colour=discord.Colour.red(),
                                     timestamp=ctx.message.created_at)
                 embed.add_field(name='User info:', value=f'```Name: {user.display_name}\nId: {user.id}```',
@@ -1681,7 +1666,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
             await ctx.send('**You cannot do that!**', delete_after=3)
         else:
             # Moderation log embed
-            moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+            moderation_log = ctx.guild.get_channel(mod_log_id)
             embed = discord.Embed(title='__**SoftBanishment**__', colour=discord.Colour.dark_purple(),
                                 timestamp=ctx.message.created_at)
             embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
@@ -1815,7 +1800,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
             await ctx.send('**You cannot do that!**', delete_after=3)
         else:
             # Moderation log embed
-            moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+            moderation_log = ctx.guild.get_channel(mod_log_id)
             embed = discord.Embed(title='__**NitroKick**__', color=discord.Color.nitro_pink(),
                                 timestamp=ctx.message.created_at)
             embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
@@ -1938,7 +1923,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
                     pass
 
                 # Moderation log embed
-                moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                moderation_log = ctx.guild.get_channel(mod_log_id)
                 embed = discord.Embed(title='__**HackBanishment**__', colour=discord.Colour.dark_teal(),
                                     timestamp=ctx.message.created_at)
                 embed.add_field(name='User info:', value=f'```Name: {self.client.get_user(member.id)}\nId: {member.id}```',
@@ -2235,7 +2220,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
             for i, infr in enumerate(user_infractions):
                 infr_type = infr[1] if infr[1] not in ["hwarn", "lwarn"] else "warn"
                 infr_date = datetime.fromtimestamp(infr[3]).strftime('%Y/%m/%d at %H:%M')
-                perpetrator_member = discord.utils.get(ctx.guild.members, id=infr[5])
+                perpetrator_member = ctx.guild.get_member(infr[5])
                 perpetrator = perpetrator_member.name if perpetrator_member else "Unknown"
 
                 next_infr_type = user_infractions[i + 1][1] if i + 1 < len(user_infractions) else None
@@ -2320,14 +2305,14 @@ We appreciate your understanding and look forward to hearing from you. """, embe
         for infr_id in infrs_id:
             if user_infractions := await self.get_user_infraction_by_infraction_id(infr_id):
                 # Moderation log embed
-                member = discord.utils.get(ctx.guild.members, id=user_infractions[0][0])
+                member = ctx.guild.get_member(user_infractions[0][0])
                 perms = ctx.channel.permissions_for(ctx.author)
                 if not perms.administrator:
-                    moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                    moderation_log = ctx.guild.get_channel(mod_log_id)
                     infr_date = datetime.fromtimestamp(user_infractions[0][3]).strftime('%Y/%m/%d at %H:%M')
                     infr_type = user_infractions[0][1]
                     reason = user_infractions[0][2]
-                    perpetrator_member = discord.utils.get(ctx.guild.members, id=user_infractions[0][5])
+                    perpetrator_member = ctx.guild.get_member(user_infractions[0][5])
                     perpetrator = perpetrator_member.name if perpetrator_member else "Unknown"
                     
                     embed = discord.Embed(title=f'__**Removed Infraction**__ ({infr_type})', colour=discord.Colour.dark_red(),
@@ -2363,7 +2348,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
                 # Moderation log embed
                 perms = ctx.channel.permissions_for(ctx.author)
                 if not perms.administrator:
-                    moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                    moderation_log = ctx.guild.get_channel(mod_log_id)
 
                     if user_infractions:
                         lwarns = len([w for w in user_infractions if w[1] == 'lwarn'])
@@ -2395,7 +2380,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
                     for i, infr in enumerate(user_infractions):
                         infr_type = infr[1] if infr[1] not in ["hwarn", "lwarn"] else "warn"
                         infr_date = datetime.fromtimestamp(infr[3]).strftime('%Y/%m/%d at %H:%M')
-                        perpetrator_member = discord.utils.get(ctx.guild.members, id=infr[5])
+                        perpetrator_member = ctx.guild.get_member(infr[5])
                         perpetrator = perpetrator_member.name if perpetrator_member else "Unknown"
 
                         next_infr_type = user_infractions[i + 1][1] if i + 1 < len(user_infractions) else None
@@ -2506,7 +2491,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
                 await ctx.send(embed=general_embed)
 
                 # Moderation log embed
-                moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                moderation_log = ctx.guild.get_channel(mod_log_id)
 
                 embed = discord.Embed(title=f'__**{user_infraction[0][1].lower()} Edited**__', colour=discord.Colour.lighter_grey(),
                                     timestamp=ctx.message.created_at)
@@ -2598,7 +2583,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
 
         perms = ctx.channel.permissions_for(ctx.author)
 
-        senior_mod_role = discord.utils.get(ctx.guild.roles, id=senior_mod_role_id)
+        senior_mod_role = ctx.guild.get_role(senior_mod_role_id)
 
         members, _ = await utils.greedy_member_reason(ctx, message)
 
@@ -2680,7 +2665,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
         general_embed.set_author(name=f'{member} got their nickname moderated.', icon_url=member.display_avatar)
         await ctx.send(embed=general_embed)
         # Moderation log embed
-        moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+        moderation_log = ctx.guild.get_channel(mod_log_id)
         embed = discord.Embed(title='__**Moderated Nickname:**__', color=discord.Color.blue(), timestamp=ctx.message.created_at)
         embed.add_field(name='User info:', value=f'```Name: {name}\nId: {member.id}```', inline=False)
         embed.add_field(name='Reason:', value=f'```{reason}```')
@@ -2719,7 +2704,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
         general_embed.set_author(name=f'{member} got their nickname unmoderated.', icon_url=member.display_avatar)
         await ctx.send(embed=general_embed)
         # Moderation log embed
-        moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+        moderation_log = ctx.guild.get_channel(mod_log_id)
         embed = discord.Embed(title='__**Unmoderated Nickname:**__', color=discord.Color.dark_blue(), timestamp=ctx.message.created_at)
         embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```', inline=False)
         embed.set_author(name=member.display_name)
@@ -2760,7 +2745,7 @@ We appreciate your understanding and look forward to hearing from you. """, embe
     async def muted_infractions(self, ctx) -> None:
         """Shows the infractions for all muted members"""
 
-        muted_role = discord.utils.get(ctx.guild.roles, id=muted_role_id)
+        muted_role = ctx.guild.get_role(muted_role_id)
 
         muted_members = []
 
@@ -83,7 +83,7 @@ class ReportSupport(*report_support_classes):
         inactive_cases = await self.get_inactive_cases(current_ts)
         for inactive_case in inactive_cases:
             guild = self.client.get_guild(server_id)
-            channel = discord.utils.get(guild.channels, id=inactive_case[1])
+            channel = guild.get_channel(inactive_case[1])
 
             if channel:
                 try:
@@ -118,7 +118,7 @@ class ReportSupport(*report_support_classes):
         inactive_cases = await self.get_inactive_cases(current_ts)
 
         for inactive_case in inactive_cases:
-            channel = discord.utils.get(guild.channels, id=inactive_case[1])
+            channel = guild.get_channel(inactive_case[1])
 
             if channel:
                 try:
@@ -218,7 +218,7 @@ class ReportSupport(*report_support_classes):
                 app_msg = await app_channel.fetch_message(payload.message_id)
                 await app_msg.add_reaction('🔏')
                 
-                if applicant := discord.utils.get(guild.members, id=app[1]):
+                if applicant := guild.get_member(app[1]):
                     return await applicant.send(embed=discord.Embed(description=interview_info['message']))
 
     async def send_verified_selfies_verification(self, interaction: discord.Interaction) -> None:
@@ -299,8 +299,8 @@ class ReportSupport(*report_support_classes):
         # Report someone
         case_cat = discord.utils.get(guild.categories, id=case_cat_id)
         counter = await self.get_case_number()
-        moderator = discord.utils.get(guild.roles, id=moderator_role_id)
-        owner_role = discord.utils.get(guild.roles, id=self.owner_role_id)
+        moderator = guild.get_role(moderator_role_id)
+        owner_role = guild.get_role(self.owner_role_id)
         overwrites = {guild.default_role: discord.PermissionOverwrite(
             read_messages=False, send_messages=False, connect=False, view_channel=False),
         member: discord.PermissionOverwrite(
@@ -363,8 +363,8 @@ class ReportSupport(*report_support_classes):
         # Report someone
         case_cat = discord.utils.get(guild.categories, id=case_cat_id)
         counter = await self.get_case_number()
-        moderator = discord.utils.get(guild.roles, id=moderator_role_id)
-        senior_mod = discord.utils.get(guild.roles, id=senior_role_id)
+        moderator = guild.get_role(moderator_role_id)
+        senior_mod = guild.get_role(senior_role_id)
         overwrites = {guild.default_role: discord.PermissionOverwrite(
             read_messages=False, send_messages=False, connect=False, view_channel=False),
         member: discord.PermissionOverwrite(
@@ -433,7 +433,7 @@ class ReportSupport(*report_support_classes):
 
         # General help
         case_cat = discord.utils.get(guild.categories, id=case_cat_id)
-        moderator = discord.utils.get(guild.roles, id=moderator_role_id)
+        moderator = guild.get_role(moderator_role_id)
         overwrites = {guild.default_role: discord.PermissionOverwrite(
             read_messages=False, send_messages=False, connect=False, view_channel=False),
         member: discord.PermissionOverwrite(
@@ -521,7 +521,7 @@ class ReportSupport(*report_support_classes):
         if not confirm:
             return await ctx.send(f"**Not allowing them, then!**")
 
-        channel = discord.utils.get(ctx.guild.channels, id=user_channel[0][1])
+        channel = ctx.guild.get_channel(user_channel[0][1])
         allowed: int = 0
 
         embed = discord.Embed(
@@ -562,7 +562,7 @@ class ReportSupport(*report_support_classes):
         if not confirm:
             return await ctx.send(f"**Not forbidding them, then!**")
 
-        channel = discord.utils.get(ctx.guild.channels, id=user_channel[0][1])
+        channel = ctx.guild.get_channel(user_channel[0][1])
         forbid: int = 0
         for member in members:
             try:
@@ -611,7 +611,7 @@ class ReportSupport(*report_support_classes):
                 await channel.delete()
                 await self.remove_user_open_channel(user_channel[0][0])
                 # Moderation log embed
-                moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                moderation_log = ctx.guild.get_channel(mod_log_id)
                 embed = discord.Embed(
                     title='__**Case Closed**__',
                     color=discord.Color.red(),
@@ -628,7 +628,7 @@ class ReportSupport(*report_support_classes):
         :param guild: The server in which the interview will be.
         :param app: The applicant info. """
 
-        applicant = discord.utils.get(guild.members, id=app[1])
+        applicant = guild.get_member(app[1])
 
         interview_info = self.interview_info.get(app[2])
 
@@ -728,7 +728,7 @@ class ReportSupport(*report_support_classes):
                 await bot_state.disconnect()
                 await bot_state.move_to(staff_vc)
             elif not bot_state:
-                voicechannel = discord.utils.get(member.guild.channels, id=staff_vc.id)
+                voicechannel = member.guild.get_channel(staff_vc.id)
                 vc = await voicechannel.connect()
 
             await asyncio.sleep(2)
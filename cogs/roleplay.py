@@ -225,7 +225,7 @@ class RolePlay(commands.Cog):
             self.client.get_command('honeymoon').reset_cooldown(ctx)
             return await ctx.send(f"**You already had a honeymoon, what are you doing, {member.mention}?**")
 
-        partner = discord.utils.get(ctx.guild.members, id=member_marriage['partner'])
+        partner = ctx.guild.get_member(member_marriage['partner'])
         if not partner:
             self.client.get_command('honeymoon').reset_cooldown(ctx)
             return await ctx.send(f"**It looks like your partner has left the server, {member.mention}. RIP!")
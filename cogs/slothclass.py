@@ -5,13 +5,14 @@ from typing import Dict, List, Optional, Union
 
 # import.thirdparty
 import discord
-from discord.ext import commands, menus, tasks
+from discord.ext import commands, menus
 
 # import.local
 from extra import utils
 from extra.customerrors import (ActionSkillOnCooldown, ActionSkillsLocked,
                                 CommandNotReady, SkillsUsedRequirement)
 from extra.menu import SlothClassPagination
+from extra.scheduler import expiry_scheduler
 from extra.slothclasses import (agares, cybersloth, db_commands, merchant,
                                 metamorph, munk, prawler, seraph, warrior)
 from extra.slothclasses.player import Player, Skill
@@ -43,39 +44,32 @@ class SlothClass(*classes.values(), db_commands.SlothClassDatabaseCommands):
         """ Tells when the cog is ready to use. """
 
         self.bots_txt = await self.client.fetch_channel(bots_and_commands_channel_id)
-        self.check_skill_actions.start()
+        await self.start_expiry_scheduler()
         self.check_mission_one_completion.start()
         self.check_mission_six_completion.start()
         print("SlothClass cog is online")
 
-    @tasks.loop(minutes=1)
-    async def check_skill_actions(self):
-        """ Checks all skill actions and events. """
-
-        await self.try_to_run(self.check_reflects)
-        await self.try_to_run(self.check_steals)
-        await self.try_to_run(self.check_protections)
-        await self.try_to_run(self.check_transmutations)
-        await self.try_to_run(self.check_shop_potion_items)
-        await self.try_to_run(self.check_shop_ring_items)
-        await self.try_to_run(self.check_shop_egg_items)
-        await self.try_to_run(self.check_hacks)
-        await self.try_to_run(self.check_knock_outs)
-        await self.try_to_run(self.check_wires)
-        await self.try_to_run(self.check_tribe_creations)
-        await self.try_to_run(self.check_frogs)
-        await self.try_to_run(self.check_sabotages)
-        await self.try_to_run(self.check_poisons)
-        await self.try_to_run(self.check_pet_food)
-        await self.try_to_run(self.check_baby_food)
-
-    async def try_to_run(self, func):
-        """ Tries to run a function/method and ignore failures. """
-
-        try:
-            await func()
-        except:
-            pass
+    async def start_expiry_scheduler(self) -> None:
+        """ Registers the handler of each expirable skill action and event, and starts firing them when due. """
+
+        skill_handlers = {
+            'reflect': self.check_reflects, 'steal': self.check_steals,
+            'divine_protection': self.check_protections, 'transmutation': self.check_transmutations,
+            'potion': self.check_shop_potion_items, 'ring': self.check_shop_ring_items,
+            'pet_egg': self.check_shop_egg_items, 'hack': self.check_hacks,
+            'hit': self.check_knock_outs, 'wire': self.check_wires,
+            'tribe_creation': self.check_tribe_creations, 'frog': self.check_frogs,
+            'sabotage': self.check_sabotages, 'poison': self.check_poisons,
+        }
+        for skill_type, handler in skill_handlers.items():
+            expiry_scheduler.register(
+                skill_type, handler, lambda skill_type=skill_type: self.get_next_skill_action_expiration(skill_type))
+
+        # Hatching and births aren't scheduled by their writes, so these also run every 10 minutes at the latest
+        expiry_scheduler.register('pet_food', self.check_pet_food, self.get_next_hungry_pet_ts, max_delay=600)
+        expiry_scheduler.register('baby_food', self.check_baby_food, self.get_next_hungry_baby_ts, max_delay=600)
+
+        await expiry_scheduler.start()
 
     @commands.command(aliases=['sloth_class', 'slothclasses'])
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -1,9 +1,8 @@
 # import.standard
 import asyncio
-import glob
 import os
 import shutil
-from itertools import cycle
+from io import BytesIO
 from typing import Dict, List, Optional, Tuple, Union
 
 # import.thirdparty
@@ -12,17 +11,20 @@ from discord import Option, slash_command
 from discord.ext import commands, menus
 from discord.member import VoiceState
 from discord.utils import escape_mentions
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 # import.local
 from external_cons import the_drive
 from extra import utils
+from extra.assets import assets, warm_profile_assets
 from extra.currency.usercurrency import UserCurrencyTable
 from extra.currency.useritems import UserItemsTable
 from extra.currency.userserveractivity import (UserServerActivityTable,
                                                UserVoiceSystem)
+from extra.customerrors import RenderQueueFull
 from extra.gif_manager import GIF
 from extra.menu import InventoryLoop
+from extra.rendering import profile_cache, render_pool
 from extra.slothclasses.player import Player
 from extra.useful_variables import flag_badges, level_badges, patreon_roles
 from extra.view import ExchangeActivityView
@@ -55,6 +57,7 @@ class SlothCurrency(*currency_cogs):
     async def on_ready(self) -> None:
         """ Tells when the cog is ready to go. """
 
+        await asyncio.get_running_loop().run_in_executor(None, warm_profile_assets)
         print("SlothCurrency cog is online!")
 
     @commands.Cog.listener()
@@ -75,7 +78,7 @@ class SlothCurrency(*currency_cogs):
 
         effects = await self.client.get_cog('SlothClass').get_user_effects(message.author)
         if 'sabotaged' not in effects:
-            await self.update_user_server_messages(message.author.id, 1)
+            await self.update_user_server_messages(message.author.id, 1, buffered=True)
 
 
     # In-game commands
@@ -101,7 +104,7 @@ class SlothCurrency(*currency_cogs):
 
         await ctx.message.delete()
         if not member:
-            member = discord.utils.get(ctx.guild.members, id=ctx.author.id)
+            member = ctx.guild.get_member(ctx.author.id)
 
         user_items = await self.get_user_items(member.id)
 
@@ -240,20 +243,17 @@ class SlothCurrency(*currency_cogs):
             skill_action = await SlothClass.get_skill_action_by_target_id_and_skill_type(member.id, 'hack')
             skill_action = skill_action[0] if skill_action else '??'
             hacker = self.client.get_user(skill_action)
-            # Makes the Hacked image and saves it
-            big = ImageFont.truetype("built titling sb.ttf", 80)
-            background = Image.open('sloth_custom_images/background/hacked.png').convert('RGBA')
-            draw = ImageDraw.Draw(background)
-            draw.text((350, 300), f"Hacked by {hacker}", font=big, fill=(0, 0, 0))
-            file_path = f'media/temporary/hacked_{member.id}.png'
-            background.save(file_path, 'png', quality=90)
+            # Makes the Hacked image
+            image = await render_pool.run(
+                self.render_text_card, 'sloth_custom_images/background/hacked.png',
+                (350, 300), f"Hacked by {hacker}", (0, 0, 0))
+        except RenderQueueFull:
+            return await answer(f"**{author.mention}, too many images are being made right now, try again in a bit!**")
         except Exception as e:
             print(e)
             return await answer(f"**{author.mention}, something went wrong with it!**")
         else:
-            await answer(file=discord.File(file_path))
-            # await asyncio.sleep(0.5)
-            return os.remove(file_path)
+            return await answer(file=discord.File(image, filename=f"hacked_{member.id}.png"))
 
     async def send_frogged_image(self, answer: discord.PartialMessageable, author: discord.Member, member: discord.Member, knocked_out: bool = False) -> None:
         """ Makes and sends a frogged image.
@@ -268,26 +268,34 @@ class SlothCurrency(*currency_cogs):
             skill_action = await SlothClass.get_skill_action_by_target_id_and_skill_type(member.id, 'frog')
             skill_action = skill_action[0] if skill_action else '??'
             metamorph = self.client.get_user(skill_action)
-            # Makes the Hacked image and saves it
-            big = ImageFont.truetype("built titling sb.ttf", 80)
-            background = None
-
-            if knocked_out:
-                background = Image.open('sloth_custom_images/background/frogged_ko.png').convert('RGBA')
-            else:
-                background = Image.open('sloth_custom_images/background/frogged.png').convert('RGBA')
-
-            draw = ImageDraw.Draw(background)
-            draw.text((170, 170), f"{metamorph}", font=big, fill=(39, 126, 205))
-            file_path = f'media/temporary/frogged_{member.id}.png'
-            background.save(file_path, 'png', quality=90)
+            # Makes the Frogged image
+            background_path = 'sloth_custom_images/background/frogged_ko.png' if knocked_out else 'sloth_custom_images/background/frogged.png'
+            image = await render_pool.run(
+                self.render_text_card, background_path, (170, 170), f"{metamorph}", (39, 126, 205))
+        except RenderQueueFull:
+            return await answer(f"**{author.mention}, too many images are being made right now, try again in a bit!**")
         except Exception as e:
             print(e)
             return await answer(f"**{author.mention}, something went wrong with it!**")
         else:
-            await answer(file=discord.File(file_path))
-            # await asyncio.sleep(0.5)
-            return os.remove(file_path)
+            return await answer(file=discord.File(image, filename=f"frogged_{member.id}.png"))
+
+    def render_text_card(self, background_path: str, cords: Tuple[int, int], text: str, fill: Tuple[int, int, int]) -> BytesIO:
+        """ Writes a text onto a background image. (Runs in the render pool)
+        :param background_path: The path of the background image.
+        :param cords: Where to write the text.
+        :param text: The text to write.
+        :param fill: The color of the text. """
+
+        big = assets.get_font("built titling sb.ttf", 80)
+        background = assets.get_image(background_path).copy()
+        draw = ImageDraw.Draw(background)
+        draw.text(cords, text, font=big, fill=fill)
+
+        image = BytesIO()
+        background.save(image, 'png', quality=90)
+        image.seek(0)
+        return image
 
     @commands.command(name="profile")
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -360,49 +368,36 @@ class SlothCurrency(*currency_cogs):
                 await SlothClass.check_virus(ctx=ctx, target=member)
             return
 
-        small = ImageFont.truetype("built titling sb.ttf", 45)
-        background = Image.open(await self.get_user_specific_type_item(member.id, 'background'))
-
-        # Checks whether user is transmutated
-        sloth = None
+        # Gathers everything the card is made of, so it can be composited off the event loop
         if await SlothClass.has_effect(effects, 'transmutated'):
-            sloth = Image.open(f"./sloth_custom_images/sloth/transmutated_sloth.png")
+            sloth_path = f"./sloth_custom_images/sloth/transmutated_sloth.png"
         else:
-            sloth = Image.open(f"./sloth_custom_images/sloth/{sloth_profile[1].title()}.png")
+            sloth_path = f"./sloth_custom_images/sloth/{sloth_profile[1].title()}.png"
 
         # Gets an item image for each equippable slot
-        body = Image.open(await self.get_user_specific_type_item(member.id, 'body'))
-        hand = Image.open(await self.get_user_specific_type_item(member.id, 'hand'))
-        foot = Image.open(await self.get_user_specific_type_item(member.id, 'foot'))
-        head = Image.open(await self.get_user_specific_type_item(member.id, 'head'))
-        hud = Image.open(await self.get_user_specific_type_item(member.id, 'hud'))
-        
-        # Pastes all item images
-        pfp = await utils.get_user_pfp(member)
-        background.paste(sloth, (0, 0), sloth)
-        background.paste(body, (0, 0), body)
-        background.paste(head, (0, 0), head)
-        background.paste(foot, (0, 0), foot)
-        background.paste(hand, (0, 0), hand)
-        background.paste(hud, (0, 0), hud)
+        background_path = await self.get_user_specific_type_item(member.id, 'background')
+        layer_paths = [sloth_path] + [
+            await self.get_user_specific_type_item(member.id, item_type)
+            for item_type in ('body', 'head', 'foot', 'hand', 'hud')
+        ]
+
+        badges: List[Tuple[str, Optional[Tuple[int, int]], Tuple[int, int]]] = []
 
         # Checks if user is a booster
-        booster_role = discord.utils.get(ctx.guild.roles, id=booster_role_id)
+        booster_role = ctx.guild.get_role(booster_role_id)
         if booster_role in member.roles:
             if flag_badge := flag_badges.get('discord_server_booster'):
                 file_path = f"./sloth_custom_images/badge/{flag_badge[0]}"
                 if os.path.isfile(file_path):
-                    booster_badge = Image.open(file_path).resize((50, 50)).convert('RGBA')
-                    background.paste(booster_badge, flag_badge[1], booster_badge)
+                    badges.append((file_path, (50, 50), flag_badge[1]))
 
-        # Pastes all flag badges that the user has
+        # Gets all flag badges that the user has
         flags = await utils.get_member_public_flags(member)
         for flag in flags:
             if flag_badge := flag_badges.get(flag):
                 file_path = f"./sloth_custom_images/badge/{flag_badge[0]}"
                 if os.path.isfile(file_path):
-                    flag_image = Image.open(file_path).resize((50, 50)).convert('RGBA')
-                    background.paste(flag_image, flag_badge[1], flag_image)
+                    badges.append((file_path, (50, 50), flag_badge[1]))
 
         # Checks whether user has level badges
         user_level = await self.client.get_cog('SlothReputation').get_specific_user(member.id)
@@ -410,10 +405,68 @@ class SlothCurrency(*currency_cogs):
             if user_level[0][2] >= key:
                 file_path = f"sloth_custom_images/badge/{value[0]}.png"
                 if os.path.isfile(file_path):
-                    level_badge = Image.open(file_path)
-                    background.paste(level_badge, value[1], level_badge)
+                    badges.append((file_path, None, value[1]))
                     break
 
+        texts = [
+            ((310, 5), f"{str(member)[:10]}"),
+            ((80, 525), f"{user_info[0][1]}"),
+            ((730, 525), f"🍂 {user_info[0][7]}"),
+        ]
+
+        all_effects = {key: value for (key, value) in effects.items() if value.get('has_gif')}
+        # Identical inputs make an identical card, so it's only rendered when something changed
+        fingerprint = profile_cache.fingerprint(
+            background_path, layer_paths, badges, member.display_avatar.key, texts,
+            sorted((effect, value.get('cords'), value.get('resize')) for effect, value in all_effects.items()))
+
+        async with ctx.typing():
+            if cached := profile_cache.get(fingerprint):
+                data, extension = cached
+            else:
+                try:
+                    pfp = await utils.get_user_pfp(member)
+                    image, extension = await render_pool.run(
+                        self.render_profile, background_path, layer_paths, badges, pfp, texts, all_effects)
+                except RenderQueueFull:
+                    return await answer(f"**{author.mention}, too many profiles are being made right now, try again in a bit!**")
+                except Exception as e:
+                    return print(e)
+
+                data = image.getvalue()
+                profile_cache.set(member.id, fingerprint, data, extension)
+
+            try:
+                await answer(file=discord.File(BytesIO(data), filename=f"profile_{member.id}.{extension}"))
+            except Exception:
+                pass
+
+    def render_profile(self,
+        background_path: str, layer_paths: List[str], badges: List[Tuple[str, Optional[Tuple[int, int]], Tuple[int, int]]],
+        pfp: Optional[Image.Image], texts: List[Tuple[Tuple[int, int], str]], all_effects: Dict[str, Dict[str, Union[List[str], Tuple[int]]]]
+    ) -> Tuple[BytesIO, str]:
+        """ Composites a profile card, animated if the user has effects. (Runs in the render pool)
+        :param background_path: The path of the background image.
+        :param layer_paths: The paths of the sloth and item images, pasted in order.
+        :param badges: The path, resize and position of each badge.
+        :param pfp: The user's profile picture.
+        :param texts: The position and content of each text.
+        :param all_effects: The effects to animate on the profile. """
+
+        small = assets.get_font("built titling sb.ttf", 45)
+        # The cached images are shared, so only a copy of the background is drawn on
+        background = assets.get_image(background_path).copy()
+
+        # Pastes all item images
+        for layer_path in layer_paths:
+            layer = assets.get_image(layer_path)
+            background.paste(layer, (0, 0), layer)
+
+        # Pastes all badges
+        for file_path, size, cords in badges:
+            badge = assets.get_image(file_path, size=size)
+            background.paste(badge, cords, badge)
+
         # Tries to print the user's profile picture
         try:
             background.paste(pfp, (201, 2), pfp)
@@ -421,89 +474,56 @@ class SlothCurrency(*currency_cogs):
             pass
 
         draw = ImageDraw.Draw(background)
-        draw.text((310, 5), f"{str(member)[:10]}", (255, 255, 255), font=small)
-        draw.text((80, 525), f"{user_info[0][1]}", (255, 255, 255), font=small)
-        draw.text((730, 525), f"🍂 {user_info[0][7]}", (255, 255, 255), font=small)
-        file_path = f'media/temporary/profile_{member.id}.png'
-        background.save(file_path, 'png', quality=90)
+        for cords, text in texts:
+            draw.text(cords, text, (255, 255, 255), font=small)
 
-        all_effects = {key: value for (key, value) in effects.items() if value.get('has_gif')}
-        async with ctx.typing():
+        if all_effects:
+            try:
+                return self.make_gif_image(profile=background, all_effects=all_effects), 'gif'
+            except Exception as e:
+                print(e)
 
-            if all_effects:
-                try:
-                    gif_file_path = await self.make_gif_image(user_id=member.id, all_effects=all_effects)
-                    await answer(file=discord.File(gif_file_path))
+        image = BytesIO()
+        background.save(image, 'png', quality=90)
+        image.seek(0)
+        return image, 'png'
 
-                except Exception as e:
-                    print(e)
-                    pass
-                finally:
-                    os.remove(file_path)
-                    os.remove(gif_file_path)
-            else:
-                try:
-                    await answer(file=discord.File(file_path))
-                except:
-                    pass
-                finally:
-                    os.remove(file_path)
-
-    async def make_gif_image(self, user_id: int, all_effects: Dict[str, Dict[str, Union[List[str], Tuple[int]]]]) -> str:
-        """ Makes a gif image out a profile image.
-        :param user_id: The ID of the user for whom to make the GIF.
+    def make_gif_image(self, profile: Image.Image, all_effects: Dict[str, Dict[str, Union[List[str], Tuple[int]]]]) -> BytesIO:
+        """ Makes a gif image out a profile image. (Runs in the render pool)
+        :param profile: The profile image onto which to animate the effects.
         :param all_effects: All effects that the user currently has. """
 
-        gif_file_path = f'media/temporary/profile_{user_id}.gif'
-
-        try:
-            profile = Image.open(f'media/temporary/profile_{user_id}.png').convert('RGBA')
-            gif = GIF(image=profile, frame_duration=40)
-            path = 'media/effects'
-
-            # Gets all frames of each effect and resize them properly, respectively.
-            for effect in all_effects:
-                full_path = f"{path}/{effect}"
-                # Checks whether the effect folder exists
-                if os.path.isdir(full_path):
-                    # Gets all frame images from the folder
-                    for i in range(len(glob.glob(f"{full_path}/*.png"))):
-                        frame = Image.open(f"{full_path}/{effect}_{i+1}.png")  # convert('RGBA') # remove this convert later
-                        # Checs whether frame has to be resized
-                        if all_effects[effect]['resize']:
-                            frame = frame.resize(all_effects[effect]['resize']).convert('RGBA')
-                        # Appends to its respective frame list
-                        all_effects[effect]['frames'].append(frame)
-
-            # Loops through the frames based on the amount of frames of the longest effect.
-            longest_gif = max([len(frames['frames']) for frames in all_effects.values()])
-
-            for efx in all_effects.keys():
-                all_effects[efx]['frames'] = cycle(all_effects[efx]['frames'])
-
-            for i in range(longest_gif):
-                # Gets a frame of each effect in each iteration of the loop
-                base = gif.new_frame()
-                await asyncio.sleep(0)
-                for efx, value in all_effects.items():
-                    # print(all_effects[efx]['cords'])
-                    cords = all_effects[efx]['cords']
-                    frame = next(all_effects[efx]['frames'])
-                    # print(efx, frame)
-                    base.paste(frame, cords, frame)
-                    gif.add_frame(base)
-
-                if i >= 400:
-                    break
-
-            else:
-                gif.export(gif_file_path)
-
-        except Exception as e:
-            print(e)
-            pass
-        finally:
-            return gif_file_path
+        profile = profile.convert('RGBA')
+        # Every other effect frame is shown for twice as long, so the effects move as fast in half the frames
+        frame_step = 2
+        gif = GIF(image=profile, frame_duration=40 * frame_step)
+        path = 'media/effects'
+
+        # Gets the preloaded frames of each effect, resized properly, respectively.
+        overlays = []
+        for effect, value in all_effects.items():
+            full_path = f"{path}/{effect}"
+            # Checks whether the effect folder exists
+            if os.path.isdir(full_path):
+                if frames := assets.get_effect_frames(full_path, value['resize']):
+                    overlays.append((frames, value['cords']))
+
+        # Loops through the frames based on the amount of frames of the longest effect.
+        longest_gif = min(max((len(frames) for frames, _ in overlays), default=1), 401)
+
+        for i in range(0, longest_gif, frame_step):
+            # Composites a frame of each effect onto the output frame, once
+            base = gif.new_frame()
+            for frames, cords in overlays:
+                frame, offset = frames[i % len(frames)]
+                if frame is not None:
+                    base.paste(frame, (cords[0] + offset[0], cords[1] + offset[1]), frame)
+            gif.add_frame(base)
+
+        image = BytesIO()
+        gif.export(image)
+        image.seek(0)
+        return image
 
     @commands.command()
     @commands.has_permissions(administrator=True)
@@ -572,6 +592,11 @@ class SlothCurrency(*currency_cogs):
                         pass
                     # print(f"File '{file['title']}' downloaded!")
 
+        # Drops the images that were removed or replaced and preloads the new ones
+        assets.clear()
+        profile_cache.clear()
+        await asyncio.get_running_loop().run_in_executor(None, warm_profile_assets)
+
         if ctx:
             return await ctx.send("**Download update is done!**", delete_after=5)
 
@@ -9,6 +9,7 @@ from discord.ext import commands
 
 # import.local
 from extra import utils
+from extra.cache import TTLCache
 from extra.slothclasses.player import Player
 from extra.view import ExchangeActivityView
 from mysqldb import DatabaseCore
@@ -22,6 +23,15 @@ guild_ids = [int(os.getenv('SERVER_ID', 123))]
 # variables.textchannel
 commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
 
+# The top ten rows of each leaderboard, briefly cached so repeated calls don't query them again
+leaderboard_cache = TTLCache(max_size=20, ttl=int(os.getenv('LEADERBOARD_CACHE_TTL', 60)))
+
+# The (table, column) of each ranked column, indexed so that a user's position is counted with a range scan
+leaderboard_indexes = [
+    ('MembersScore', 'score_points'), ('MembersScore', 'user_xp'), ('UserCurrency', 'user_money'),
+    ('UserServerActivity', 'user_time'), ('Blackjack', 'wins'), ('CoinflipMember', 'wins'), ('MemoryMember', 'level'),
+]
+
 currency_cogs: List[commands.Cog] = [
     MembersScoreTable, SlothActionsTable
 ]
@@ -55,8 +65,8 @@ class SlothReputation(*currency_cogs):
         the_member = await self.get_specific_user(user.id)
         if the_member:
             if current_ts - the_member[0][3] >= 3 or the_member[0][1] == 0:
-                await self.update_user_xp_time(user.id, current_ts)
-                await self.update_user_xp(user.id, 5)
+                await self.update_user_xp_time(user.id, current_ts, buffered=True)
+                await self.update_user_xp(user.id, 5, buffered=True)
                 return await self.level_up(user)
         # else:
         #     return await self.insert_user(user.id, 5, 1, current_ts, 0, time_xp - 36001)
@@ -71,7 +81,7 @@ class SlothReputation(*currency_cogs):
             await self.client.get_cog('SlothCurrency').update_user_money(user.id, (the_user[0][2] + 1) * 5)
             await self.update_user_lvl(user.id)
             await self.update_user_score_points(user.id, 100)
-            channel = discord.utils.get(user.guild.channels, id=commands_channel_id)
+            channel = user.guild.get_channel(commands_channel_id)
             return await channel.send(f"**{user.mention} has leveled up to lvl {the_user[0][2] + 1}! <:zslothrich:701157794686042183> Here's {(the_user[0][2] + 1) * 5}łł! <:zslothrich:701157794686042183>**")
 
 
@@ -160,9 +170,7 @@ class SlothReputation(*currency_cogs):
                  await SlothClass.check_virus(ctx=ctx, target=member)
             return
 
-        all_users = await self.get_all_users_by_score_points()
-        position = [[i+1, u[4]] for i, u in enumerate(all_users) if u[0] == member.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(self.get_user_score_points_position, member.id)
 
         # Gets user Server Activity info, such as messages sent and time in voice channels
         user_info = await SlothCurrency.get_user_activity_info(member.id)
@@ -283,6 +291,33 @@ class SlothReputation(*currency_cogs):
 
             return await answer(embed=embed, view=view)
 
+    @commands.has_permissions(administrator=True)
+    @commands.command(hidden=True)
+    async def add_leaderboard_indexes(self, ctx) -> None:
+        """ (ADM) Adds the leaderboard indexes to the tables that were created without them. """
+
+        await ctx.message.delete()
+        added = []
+        for table, column in leaderboard_indexes:
+            if not await self.db.table_exists(table) or await self.db.index_exists(table, column):
+                continue
+
+            await self.db.execute_query(f"ALTER TABLE {table} ADD INDEX {column} ({column})")
+            added.append(f"`{table}.{column}`")
+
+        if not added:
+            return await ctx.send(f"**The leaderboard indexes already exist, {ctx.author.mention}!**")
+        await ctx.send(f"**Indexes added to {', '.join(added)}, {ctx.author.mention}!**")
+
+    async def get_user_position(self, get_position, user_id: int) -> List[Union[int, str]]:
+        """ Gets a user's position and value in a leaderboard, or ['??', 0] if they aren't in it.
+        :param get_position: The method that gets the user's value and position.
+        :param user_id: The ID of the user. """
+
+        if row := await get_position(user_id):
+            return [row[1], row[0]]
+        return ['??', 0]
+
     @slash_command(name="leaderboard", guild_ids=guild_ids)
     @Player.poisoned()
     async def _leaderboard(self, ctx, 
@@ -328,20 +363,18 @@ class SlothReputation(*currency_cogs):
         if not await self.check_members_score_table_exists():
             return await answer("**This command may be on maintenance!**")
 
-        top_ten_users = await self.get_top_ten_users()
+        top_ten_users = await leaderboard_cache.get('score', self.get_top_ten_users)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await self.get_all_users_by_score_points()
-        position = [[i+1, u[4]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(self.get_user_score_points_position, ctx.author.id)
 
         leaderboard.set_footer(text=f"Your score: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(name=f"[{i + 1}]# - __**{member}**__", value=f"__**Score:**__ `{sm[4]}`",
                                   inline=False)
             if i + 1 == 10:
@@ -359,20 +392,18 @@ class SlothReputation(*currency_cogs):
         else:
             answer = ctx.respond
 
-        top_ten_users = await self.get_top_ten_xp_users()
+        top_ten_users = await leaderboard_cache.get('level', self.get_top_ten_xp_users)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Level Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await self.get_all_users_by_xp()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(self.get_user_xp_position, ctx.author.id)
 
         leaderboard.set_footer(text=f"Your XP: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(name=f"[{i + 1}]# - __**{member}**__", value=f"__**Level:**__ `{sm[2]}` | __**XP:**__ `{sm[1]}`",
                                   inline=False)
             if i + 1 == 10:
@@ -392,21 +423,19 @@ class SlothReputation(*currency_cogs):
 
         SlothCurrency = self.client.get_cog('SlothCurrency')
 
-        top_ten_users = await SlothCurrency.get_top_ten_leaves_users()
+        top_ten_users = await leaderboard_cache.get('leaves', SlothCurrency.get_top_ten_leaves_users)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="🍃 __The Language Sloth's Leaf Ranking Leaderboard__ 🍃", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
 
-        all_users = await SlothCurrency.get_all_leaves_users()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(SlothCurrency.get_user_leaves_position, ctx.author.id)
 
         leaderboard.set_footer(text=f"Your leaves: {position[1]} 🍃| #{position[0]}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(name=f"[{i + 1}]# - __**{member}**__", value=f"__**Leaves:**__ `{sm[1]}` 🍃",
                                   inline=False)
             if i + 1 == 10:
@@ -426,7 +455,7 @@ class SlothReputation(*currency_cogs):
 
         SlothClass = self.client.get_cog('SlothClass')
 
-        top_ten_tribes = await SlothClass.get_top_ten_tribe_leaves()
+        top_ten_tribes = await leaderboard_cache.get('tribe_leaves', SlothClass.get_top_ten_tribe_leaves)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="🍃 __The Language Sloth's Tribe Leaf Ranking Leaderboard__ 🍃", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
@@ -453,14 +482,12 @@ class SlothReputation(*currency_cogs):
 
         SlothCurrency = self.client.get_cog('SlothCurrency')
 
-        top_ten_users = await SlothCurrency.get_top_ten_time_users()
+        top_ten_users = await leaderboard_cache.get('time', SlothCurrency.get_top_ten_time_users)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="⏰ __The Language Sloth's Time Ranking Leaderboard__ ⏰", color=discord.Color.dark_green(),
                                     timestamp=current_time)
 
-        all_users = await SlothCurrency.get_all_time_users()
-        position = [[i+1, u[2]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(SlothCurrency.get_user_time_position, ctx.author.id)
 
         m, s = divmod(position[1], 60)
         h, m = divmod(m, 60)
@@ -470,7 +497,7 @@ class SlothReputation(*currency_cogs):
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             m, s = divmod(sm[2], 60)
             h, m = divmod(m, 60)
             leaderboard.add_field(name=f"[{i + 1}]# - __**{member}**__", value=f"__**Time:**__ `{h:d}h, {m:02d}m.` ⏰",
@@ -492,21 +519,19 @@ class SlothReputation(*currency_cogs):
 
         SlothCurrency = self.client.get_cog('SlothCurrency')
 
-        top_ten_users = await SlothCurrency.get_top_ten_item_counter_users()
+        top_ten_users = await leaderboard_cache.get('items', SlothCurrency.get_top_ten_item_counter_users)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="🐮 __The Language Sloth's Items Ranking Leaderboard__ 🐮", color=discord.Color.dark_green(),
                                     timestamp=current_time)
 
-        all_users = await SlothCurrency.get_item_counter_users()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(SlothCurrency.get_user_item_counter_position, ctx.author.id)
 
         leaderboard.set_footer(text=f"Your time: {position[1]} items | #{position[0]}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(name=f"[{i + 1}]# - __**{member}**__", value=f"__**Items:**__ `{sm[1]}` items 🐮", inline=False)
             if i + 1 == 10:
                 break
@@ -525,20 +550,18 @@ class SlothReputation(*currency_cogs):
 
         Games = self.client.get_cog("Games")
 
-        top_ten_users = await Games.get_top_ten_memory_users()
+        top_ten_users = await leaderboard_cache.get('memory', Games.get_top_ten_memory_users)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Memory Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await Games.get_all_memory_users_by_level()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(Games.get_memory_user_position, ctx.author.id)
 
         leaderboard.set_footer(text=f"Your level: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(name=f"[{i + 1}]# - __**{member}**__", 
                 value=f"__**Level:**__ `{sm[1]}` (<t:{sm[2]}:R>)",
                                   inline=False)
@@ -569,7 +592,7 @@ class SlothReputation(*currency_cogs):
         # Embeds each one of the top ten users.
         for i, sm in enumerate(get_all_galaxies):
             deadline = sm[1] + 1209600
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(
                 name=f"[{i + 1}]# - __**{member}**__", value=f"Galaxy Room Expires in: <t:{deadline}:R>", inline=False
             )
@@ -593,20 +616,18 @@ class SlothReputation(*currency_cogs):
             answer = ctx.respond
 
         Games = self.client.get_cog("Games")
-        top_ten_users = await Games.get_top_ten_blackjack_members_by_wins()
+        top_ten_users = await leaderboard_cache.get('blackjack', Games.get_top_ten_blackjack_members_by_wins)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Blackjack Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await Games.get_all_blackjack_members_by_wins()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(Games.get_blackjack_member_position, ctx.author.id)
 
         leaderboard.set_footer(text=f"Your wins: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(name=f"[{i + 1}]#", value=f"**__{member}__ • Wins:** `{sm[1]}`", inline=False)
             if i + 1 == 10:
                 break
@@ -624,20 +645,18 @@ class SlothReputation(*currency_cogs):
             answer = ctx.respond
 
         Games = self.client.get_cog("Games")
-        top_ten_users = await Games.get_top_ten_coinflip_members_by_wins()
+        top_ten_users = await leaderboard_cache.get('coinflips', Games.get_top_ten_coinflip_members_by_wins)
         current_time = await utils.get_time_now()
         leaderboard = discord.Embed(title="__The Language Sloth's Coinflips Ranking Leaderboard__", colour=discord.Colour.dark_green(),
                                     timestamp=current_time)
-        all_users = await Games.get_all_coinflip_members_by_wins()
-        position = [[i+1, u[1]] for i, u in enumerate(all_users) if u[0] == ctx.author.id]
-        position = [it for subpos in position for it in subpos] if position else ['??', 0]
+        position = await self.get_user_position(Games.get_coinflip_member_position, ctx.author.id)
 
         leaderboard.set_footer(text=f"Your wins: {position[1]} | #{position[0]}", icon_url=ctx.author.display_avatar)
         leaderboard.set_thumbnail(url=ctx.guild.icon.url)
 
         # Embeds each one of the top ten users.
         for i, sm in enumerate(top_ten_users):
-            member = discord.utils.get(ctx.guild.members, id=sm[0])
+            member = ctx.guild.get_member(sm[0])
             leaderboard.add_field(name=f"[{i + 1}]# - __**{member}**__", value=f"**Wins:** `{sm[1]}` • **Last time played:** <t:{sm[3]}:R>)", inline=False)
             if i + 1 == 10:
                 break
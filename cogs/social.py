@@ -55,15 +55,15 @@ class Social(*social_cogs):
         em.add_field(name="Server ID", value=guild.id, inline=True)
         em.add_field(name="Owner", value=guild.owner.mention, inline=False)
 
-        admins_role = discord.utils.get(guild.roles, id=admin_role_id)
+        admins_role = guild.get_role(admin_role_id)
         admins = len([m.mention for m in guild.members if admins_role in m.roles])
         em.add_field(name="👑 Admins", value=admins, inline=True)
 
-        mods_role = discord.utils.get(guild.roles, id=mod_role_id)
+        mods_role = guild.get_role(mod_role_id)
         mods = len([m.mention for m in guild.members if mods_role in m.roles])
         em.add_field(name="<:zslothmod:737325517077872697> Mods", value=mods, inline=True)
 
-        teachers_role = discord.utils.get(guild.roles, id=teacher_role_id)
+        teachers_role = guild.get_role(teacher_role_id)
         teachers = len([m.mention for m in guild.members if teachers_role in m.roles])
         em.add_field(name="🧑‍🏫 Teachers", value=teachers, inline=True)
 
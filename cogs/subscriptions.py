@@ -70,8 +70,8 @@ class Subscriptions(commands.Cog):
             return
         
         guild = self.client.get_guild(server_id)
-        sloth_subscriber_role = discord.utils.get(guild.roles, id=sloth_subscriber_role_id)
-        member = discord.utils.get(guild.members, id=entitlement.user_id)
+        sloth_subscriber_role = guild.get_role(sloth_subscriber_role_id)
+        member = guild.get_member(entitlement.user_id)
 
         # Add the Sloth Subscriber role to the member
         try:
@@ -124,8 +124,8 @@ class Subscriptions(commands.Cog):
             return
         
         guild = self.client.get_guild(server_id)
-        sloth_subscriber_role = discord.utils.get(guild.roles, id=sloth_subscriber_role_id)
-        member = discord.utils.get(guild.members, id=entitlement.user_id)
+        sloth_subscriber_role = guild.get_role(sloth_subscriber_role_id)
+        member = guild.get_member(entitlement.user_id)
         
         # Remove the Sloth Subscriber role from the member.
         try:
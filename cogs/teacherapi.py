@@ -188,7 +188,7 @@ class TeacherAPI(commands.Cog):
 
         path = 'media/icons/'
         guild = ctx.guild
-        teacher_role = discord.utils.get(guild.roles, id=self.teacher_role_id)
+        teacher_role = guild.get_role(self.teacher_role_id)
         teachers = [m for m in guild.members if teacher_role in m.roles]
         teacher_names = []
 
@@ -291,7 +291,7 @@ class TeacherAPI(commands.Cog):
         if not member:
             return await ctx.send("**Please, inform a member to promote to a teacher!**")
 
-        teacher_role = discord.utils.get(ctx.guild.roles, id=self.teacher_role_id)
+        teacher_role = ctx.guild.get_role(self.teacher_role_id)
         if teacher_role not in member.roles:
             try:
                 await member.add_roles(teacher_role)
@@ -352,7 +352,7 @@ class TeacherAPI(commands.Cog):
 
         author: discord.Member = ctx.author
 
-        teacher_role = discord.utils.get(ctx.guild.roles, id=self.teacher_role_id)
+        teacher_role = ctx.guild.get_role(self.teacher_role_id)
         if teacher_role in member.roles:
             try:
                 await member.remove_roles(teacher_role)
@@ -416,7 +416,7 @@ class TeacherAPI(commands.Cog):
         if not member:
             return await ctx.send("**Inform the the member to check whether they're a teacher!**")
 
-        teacher_role = discord.utils.get(ctx.guild.roles, id=self.teacher_role_id)
+        teacher_role = ctx.guild.get_role(self.teacher_role_id)
         teacher_state = await self._get_teacher_state(member.id)
         teacher_embed = discord.Embed(
             title=f"__Is {member} a teacher__",
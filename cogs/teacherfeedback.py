@@ -11,6 +11,7 @@ from discord.ext import commands, menus
 
 # import.local
 from extra import utils
+from extra.currency.usercurrency import write_through_user_currency
 from extra.menu import (ConfirmSkill, SwitchSavedClasses,
                         SwitchSavedClassesButtons, prompt_message,
                         prompt_message_guild)
@@ -83,7 +84,7 @@ class TeacherFeedback(commands.Cog):
         lenactive = 0 if not user else user[-1]
         if lenactive:
             emoji = str(payload.emoji)
-            channel = discord.utils.get(guild.channels, id=reward_channel_id)
+            channel = guild.get_channel(reward_channel_id)
             msg = await channel.fetch_message(payload.message_id)
             await msg.remove_reaction(payload.emoji.name, payload.member)
             if emoji == '✅':
@@ -296,14 +297,14 @@ class TeacherFeedback(commands.Cog):
         :param member: The class host/hostess. """
 
         # Checks whether the member is a teacher
-        teacher_role = discord.utils.get(member.guild.roles, id=teacher_role_id)
+        teacher_role = member.guild.get_role(teacher_role_id)
         if teacher_role not in member.roles:
             return
 
         # Checks whether the teacher has an existing class.
         if teacher_class := await self.db.get_active_teacher_class_by_teacher_id(member.id):
             # Checks whether the class vc still exists
-            if class_vc := discord.utils.get(member.guild.channels, id=teacher_class[2]):
+            if class_vc := member.guild.get_channel(teacher_class[2]):
                 try:
                     await member.move_to(class_vc)
                 except:
@@ -335,7 +336,7 @@ class TeacherFeedback(commands.Cog):
 
         additional = {'cog': self, 'db': self.db, 'change_embed': self._make_saved_class_embed}
 
-        cc_channel = discord.utils.get(member.guild.channels, id=create_room_txt_id)
+        cc_channel = member.guild.get_channel(create_room_txt_id)
         msg = await cc_channel.send(f"**Welcome back, {member.mention}!**")
         ctx = await self.client.get_context(msg)
         ctx.author = member
@@ -380,7 +381,7 @@ class TeacherFeedback(commands.Cog):
         :param class_info: The information about the class. """
 
         current_ts = await utils.get_timestamp()
-        cc_channel = discord.utils.get(member.guild.channels, id=create_room_txt_id)
+        cc_channel = member.guild.get_channel(create_room_txt_id)
         txt, vc = await self.create_channels(member, cc_channel, class_info)
         await self.db.insert_active_teacher_class(
             member.id,
@@ -409,7 +410,7 @@ class TeacherFeedback(commands.Cog):
             await self.db.update_all_students_ts(member.id, current_ts)
 
         else:  # Otherwise, it's a student
-            teacher = discord.utils.get(member.guild.members, id=teacher_class[0])
+            teacher = member.guild.get_member(teacher_class[0])
             teacher_in_class = teacher and teacher in class_vc.members
 
             # Check whether user is already in the system
@@ -438,7 +439,7 @@ class TeacherFeedback(commands.Cog):
             await self.db.update_teacher_class_time(member.id, current_ts)
             await self.db.update_all_students_time(member.id, current_ts)
 
-            class_txt = discord.utils.get(member.guild.channels, id=teacher_class[1])
+            class_txt = member.guild.get_channel(teacher_class[1])
             try:
                 msg = await class_txt.send(f"**I saw you left your room, {member.mention}.**")
             except:
@@ -489,7 +490,7 @@ class TeacherFeedback(commands.Cog):
         formatted_text = await TeacherFeedback.get_formatted_time_text(teacher_class[6])
 
         # Makes a class history report
-        history_channel = discord.utils.get(member.guild.channels, id=class_history_channel_id)
+        history_channel = member.guild.get_channel(class_history_channel_id)
 
         class_embed = discord.Embed(title=f"__{teacher_class[3].title()} Class__",
             description=teacher_class[8], colour=member.colour, timestamp=datetime.utcnow())
@@ -517,7 +518,7 @@ class TeacherFeedback(commands.Cog):
             title=f"All {member.display_name}'s students", description="**LOADING...**", colour=discord.Colour.green())
         simple_embed.set_thumbnail(url=guild.icon.url)
         simple_embed.set_footer(text=guild.name, icon_url=guild.icon.url)
-        reward_channel = discord.utils.get(guild.channels, id=reward_channel_id)
+        reward_channel = guild.get_channel(reward_channel_id)
         simple = await reward_channel.send(content=member.mention, embed=simple_embed)
 
         await simple.add_reaction('✅')
@@ -570,7 +571,7 @@ class TeacherFeedback(commands.Cog):
             else:
                 return
 
-        member = discord.utils.get(guild.members, id=user[1])
+        member = guild.get_member(user[1])
 
         if not member:
             await self.db.delete_waiting_reward_student(msg_id=user[0], user_id=user[1], teacher_id=user[4])
@@ -629,7 +630,7 @@ class TeacherFeedback(commands.Cog):
             rewarded_members_text = []
             for ru in users_to_reward:
                 try:
-                    member = discord.utils.get(teacher.guild.members, id=ru[0])
+                    member = teacher.guild.get_member(ru[0])
                     rewarded_members_text.append(f"{member.mention}")
                     if await SlothCurrency.get_user_currency(member.id):
                         await SlothCurrency.update_user_money(member.id, 10)
@@ -808,11 +809,11 @@ class TeacherFeedback(commands.Cog):
         :param taught_in: The language in which the class is taught. """
 
         # Get some roles
-        teacher_role = discord.utils.get(member.guild.roles, id=teacher_role_id)
-        mod_role = discord.utils.get(member.guild.roles, id=mod_role_id)
-        lesson_management_role = discord.utils.get(member.guild.roles, id=lesson_management_role_id)
-        sloth_explorer_role = discord.utils.get(member.guild.roles, id=sloth_explorer_role_id)
-        # all_vcs_role = discord.utils.get(member.guild.roles, id=all_vcs_role_id)
+        teacher_role = member.guild.get_role(teacher_role_id)
+        mod_role = member.guild.get_role(mod_role_id)
+        lesson_management_role = member.guild.get_role(lesson_management_role_id)
+        sloth_explorer_role = member.guild.get_role(sloth_explorer_role_id)
+        # all_vcs_role = member.guild.get_role(all_vcs_role_id)
 
         overwrites = {}
         # Gets permissions for general roles
@@ -824,7 +825,7 @@ class TeacherFeedback(commands.Cog):
         # Class taught in
         overwrites = await self.get_perms_for_taught_in(member, language, taught_in, overwrites)
 
-        if queuebot := discord.utils.get(member.guild.members, id=queuebot_id):
+        if queuebot := member.guild.get_member(queuebot_id):
             overwrites[queuebot] = discord.PermissionOverwrite(
                 read_messages=True, send_messages=True, connect=True, view_channel=True
             )
@@ -904,7 +905,7 @@ class TeacherFeedback(commands.Cog):
     # ===== Interactions =====
     async def ask_class_creation_questions(self, member) -> Union[None, Dict[str, str]]:
 
-        cc_channel = discord.utils.get(member.guild.channels, id=create_room_txt_id)
+        cc_channel = member.guild.get_channel(create_room_txt_id)
 
         initial_msg = await cc_channel.send(f"**Let's start your class creation!**")
         ctx = await self.client.get_context(initial_msg)
@@ -1092,10 +1093,10 @@ class TeacherFeedback(commands.Cog):
         if not (teacher_class := await self.db.get_active_teacher_class_by_txt_id(channel.id)):
             await ctx.send(f"**This isn't a class channel, {member.mention}!**")
 
-        text_channel = discord.utils.get(guild.channels, id=teacher_class[1])
-        voice_channel = discord.utils.get(guild.channels, id=teacher_class[2])
+        text_channel = guild.get_channel(teacher_class[1])
+        voice_channel = guild.get_channel(teacher_class[2])
 
-        teacher = discord.utils.get(guild.members, id=teacher_class[0])
+        teacher = guild.get_member(teacher_class[0])
         embed = discord.Embed(title=f"__{teacher}'s Class__", description=teacher_class[8], color=teacher.color, timestamp=ctx.message.created_at)
 
         # Adds the general information field
@@ -1131,8 +1132,8 @@ class TeacherFeedback(commands.Cog):
         if teacher_class:
             confirm = await ConfirmSkill(f"**Do you want to close this class channel, {member.mention}?**").prompt(ctx)
             if confirm:
-                text_channel = discord.utils.get(member.guild.channels, id=teacher_class[1])
-                voice_channel = discord.utils.get(member.guild.channels, id=teacher_class[2])
+                text_channel = member.guild.get_channel(teacher_class[1])
+                voice_channel = member.guild.get_channel(teacher_class[2])
                 await self.end_class(member, text_channel, voice_channel, teacher_class)
             else:
                 await ctx.send(f"**Not closing it, then!**")
@@ -1313,6 +1314,8 @@ class TeacherFeedbackDatabaseUpdate:
         :param students_ids: A list containing all ids of the users. """
 
         await self.db.execute_query("UPDATE UserCurrency SET user_classes = user_classes + 1 WHERE user_id IN %s", (students_ids,))
+        for student_id in students_ids:
+            write_through_user_currency(student_id, {"user_classes": ["+", 1]})
 
     # ===== Teacher =====
     async def update_teacher_class_time(self, teacher_id: int, the_time: int) -> None:
@@ -13,12 +13,10 @@ from typing import List, Optional, Union
 
 # import.thirdparty
 import discord
-import gtts
 import pytz
 from discord import (Option, OptionChoice, message_command, slash_command,
                      user_command)
 from discord.ext import commands, menus, tasks
-from googletrans import Translator
 from pytz import timezone
 from treelib import Tree
 
@@ -29,6 +27,8 @@ from extra.prompt.menu import Confirm
 from extra.select import SoundBoardSelect
 from extra.slothclasses.player import Player
 from extra.tool.stealthstatus import StealthStatusTable
+from extra.translation import translator
+from extra.tts import speech_synthesizer, tts_queue
 from extra.useful_variables import patreon_roles
 from extra.view import BasicUserCheckView, SoundBoardView
 from mysqldb import DatabaseCore
@@ -95,7 +95,7 @@ class Tools(*tool_cogs):
 		if before.self_video != after.self_video:
 			return
 
-		role = discord.utils.get(member.guild.roles, id=in_a_vc_role_id)  # Replace with your role name
+		role = member.guild.get_role(in_a_vc_role_id)  # Replace with your role name
 
 		if after.channel:  # User joins a voice channel
 			if member.get_role(role.id):
@@ -261,6 +261,7 @@ class Tools(*tool_cogs):
 
 		if voice_client:
 			if user_voice.channel == voice_client.channel:
+				tts_queue.clear(guild.id)
 				await voice_client.disconnect()
 				await ctx.send('**Disconnected!**')
 			else:
@@ -298,15 +299,23 @@ class Tools(*tool_cogs):
 			voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=ctx.guild)
 
 		# Checks if the bot is in the same voice channel that the user
-		if voice.channel == voice_client.channel:
-			# Plays the song
-			if not voice_client.is_playing():
-				tts = gTTS(text=message, lang=language)
-				tts.save(f'tts/audio.mp3')
-				audio_source = discord.FFmpegPCMAudio('tts/audio.mp3')
-				voice_client.play(audio_source, after=lambda e: print('finished playing the tts!'))
-		else:
-			await ctx.send("**The bot is in a different voice channel!**")
+		if voice.channel != voice_client.channel:
+			return await ctx.send("**The bot is in a different voice channel!**")
+
+		try:
+			clip_path = await speech_synthesizer.get_clip(language, message)
+		except ValueError:
+			return await ctx.send(f"**`{language}` isn't a supported language!**", delete_after=5)
+		except Exception as e:
+			print('TTS error', e)
+			return await ctx.send("**Couldn't make the TTS message, try again later!**", delete_after=5)
+
+		# Queues the message, so it plays after the ones before it
+		position = tts_queue.enqueue(voice_client, clip_path)
+		if position is None:
+			await ctx.send("**There are too many TTS messages waiting to be played, try again in a bit!**", delete_after=5)
+		elif position:
+			await ctx.send(f"**Your TTS message is number `{position}` in the queue!**", delete_after=5)
 
 	@commands.command(name="translate", aliases=["tr"])
 	@Player.poisoned()
@@ -345,12 +354,14 @@ class Tools(*tool_cogs):
 		else:
 			answer = ctx.respond
 
-		trans = Translator(service_urls=['translate.googleapis.com'])
 		current_time = await utils.get_time_now()
 		try:
-			translation = trans.translate(f'{message}', dest=f'{language}')
+			translation = await translator.translate(f'{message}', f'{language}')
 		except ValueError:
 			return await answer("**Invalid parameter for 'language'!**", delete_after=5)
+		except Exception as e:
+			print('Translation error', e)
+			return await answer("**Couldn't translate it, try again later!**", delete_after=5)
 
 		embed = discord.Embed(title="__Sloth Translator__", color=ctx.author.color, timestamp=current_time)
 
@@ -584,7 +595,7 @@ class Tools(*tool_cogs):
 				await bot_state.disconnect()
 				await bot_state.move_to(user_state.channel)
 			elif not bot_state:
-				voicechannel = discord.utils.get(ctx.author.guild.channels, id=user_state.channel.id)
+				voicechannel = ctx.author.guild.get_channel(user_state.channel.id)
 				vc = await voicechannel.connect()
 
 			await asyncio.sleep(2)
@@ -917,7 +928,7 @@ class Tools(*tool_cogs):
 		""" A command for pinging Cosmos, the stealthy little guy. """
 
 		cosmos_id = int(os.getenv('COSMOS_ID', 123))
-		cosmos = discord.utils.get(ctx.guild.members, id=cosmos_id)
+		cosmos = ctx.guild.get_member(cosmos_id)
 		await ctx.send(cosmos.mention)
 
 	@commands.command()
@@ -926,7 +937,7 @@ class Tools(*tool_cogs):
 		""" A command for pinging Prisca, the photoshop Turk. """
 
 		prisca_id = int(os.getenv('PRISCA_ID', 123))
-		prisca = discord.utils.get(ctx.guild.members, id=prisca_id)
+		prisca = ctx.guild.get_member(prisca_id)
 		await ctx.send(prisca.mention)
 
 	@commands.command(aliases=['musicbot', 'music_bot', 'musicbots', 'music', 'mb'])
@@ -935,7 +946,7 @@ class Tools(*tool_cogs):
 	async def music_bots(self, ctx) -> None:
 		""" Shows a list with all music bots available in the server. """
 
-		music_bot_role = discord.utils.get(ctx.guild.roles, id=int(os.getenv('MUSIC_BOT_ROLE_ID', 123)))
+		music_bot_role = ctx.guild.get_role(int(os.getenv('MUSIC_BOT_ROLE_ID', 123)))
 		music_bots = [mb for mb in ctx.guild.members if music_bot_role in mb.roles]
 		music_bots = [f"{mb.mention} ❌" if mb.voice and mb.voice.channel else f"{mb.mention} ✅" for mb in music_bots]
 
@@ -1032,7 +1043,7 @@ class Tools(*tool_cogs):
 		)) -> None:
 		""" (ADMIN) Used to mention staff members. """
 
-		if staff_member := discord.utils.get(ctx.guild.members, id=int(member)):
+		if staff_member := ctx.guild.get_member(int(member)):
 			await ctx.respond(staff_member.mention)
 		else:
 			await ctx.respond("**For some reason I couldn't ping them =\ **")
@@ -7,7 +7,7 @@ from discord.ext import commands
 
 # import.local
 from extra import utils
-from mysqldb import DatabaseCore
+from mysqldb import DatabaseCore, write_buffer
 
 class SlothAnalyticsTable(commands.Cog):
     """ Class for managing the SlothAnalytics table in the database. """
@@ -57,7 +57,11 @@ class SlothAnalyticsTable(commands.Cog):
         """ (ADM) Resets the SlothAnalytics table. (Callback) """
 
         time_now = await utils.get_time_now()
-        await self.db.execute_query("UPDATE SlothAnalytics SET day_now = %s, m_joined = 0, m_left = 0, messages_sent = 0", (time_now.day,))
+        # Goes through the buffer, so the reset replaces the increments still buffered for the day that's over
+        # and is written after the ones being flushed, instead of them landing on the row once it's zeroed
+        for column, value in (("day_now", time_now.day), ("m_joined", 0), ("m_left", 0), ("messages_sent", 0)):
+            write_buffer.set("SlothAnalytics", column, value)
+        await write_buffer.flush()
 
     async def update_joined(self) -> None:
         """ Updates the joined members counting. """
@@ -69,8 +73,12 @@ class SlothAnalyticsTable(commands.Cog):
 
         await self.db.execute_query("UPDATE SlothAnalytics SET m_left = m_left + 1")
 
-    async def update_messages(self) -> None:
-        """ Updates the message counting. """
+    async def update_messages(self, buffered: bool = False) -> None:
+        """ Updates the message counting.
+        :param buffered: Whether to write it in the next batch instead of right away. [Default = False] """
+
+        if buffered:
+            return write_buffer.increment("SlothAnalytics", "messages_sent", 1)
 
         await self.db.execute_query("UPDATE SlothAnalytics SET messages_sent = messages_sent + 1")
 
@@ -93,7 +101,10 @@ class SlothAnalyticsTable(commands.Cog):
     async def get_info(self) -> List[int]:
         """ Gets the analytics info. """
 
-        return await self.db.execute_query("SELECT * from SlothAnalytics", fetch="one")
+        info = await self.db.execute_query("SELECT * from SlothAnalytics", fetch="one")
+        if info:
+            info = write_buffer.overlay("SlothAnalytics", info, {"messages_sent": 2})
+        return info
 
 
 class DataBumpsTable(commands.Cog):
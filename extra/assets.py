@@ -0,0 +1,187 @@
+# import.standard
+import glob
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Iterable, List, Optional, Tuple
+
+# import.thirdparty
+from PIL import Image, ImageFont
+
+# import.local
+from extra.useful_variables import flag_badges
+
+EffectFrames = List[Tuple[Optional[Image.Image], Tuple[int, int]]]
+
+class AssetCache:
+    """ A bounded in-memory cache of decoded images, effect frames and loaded fonts, shared by the image renderers.
+    Entries are keyed by path and modification time, so replaced files are reloaded. """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, max_fonts: int = 128) -> None:
+        """ Class init method.
+        :param max_bytes: The maximum amount of decoded pixel bytes to keep.
+        :param max_fonts: The maximum amount of loaded fonts to keep. """
+
+        self.max_bytes = max_bytes
+        self.max_fonts = max_fonts
+        self.used_bytes: int = 0
+        # Holds both single images and effect frame sequences, under the same byte budget
+        self._images: "OrderedDict[Tuple[str, float, Optional[Tuple[int, int]]], Any]" = OrderedDict()
+        self._fonts: "OrderedDict[Tuple[str, float, int], ImageFont.FreeTypeFont]" = OrderedDict()
+        # Warming and rendering run in threads, so the LRU bookkeeping must be guarded
+        self._lock = Lock()
+
+    def get_image(self, path: str, size: Optional[Tuple[int, int]] = None) -> Image.Image:
+        """ Gets a decoded RGBA image. The cached image is shared, so copy it before drawing on it.
+        :param path: The path of the image.
+        :param size: The size to resize the image to. [Optional] """
+
+        key = (path, os.path.getmtime(path), size)
+        with self._lock:
+            if (image := self._images.get(key)) is not None:
+                self._images.move_to_end(key)
+                return image
+
+        image = Image.open(path)
+        if size:
+            image = image.resize(size)
+        image = image.convert('RGBA')
+        image.load()
+
+        self._store(key, image)
+        return image
+
+    def get_effect_frames(self, directory: str, size: Optional[Tuple[int, int]] = None) -> EffectFrames:
+        """ Gets the frames of an effect as RGBA images, cropped to their visible part.
+        Each frame comes with the offset of its crop, or as None if it's fully transparent.
+        :param directory: The folder of the effect, whose frames are named <effect>_<n>.png.
+        :param size: The size to resize the frames to. [Optional] """
+
+        directory = os.path.normpath(directory)
+        key = (directory, os.path.getmtime(directory), size)
+        with self._lock:
+            if (frames := self._images.get(key)) is not None:
+                self._images.move_to_end(key)
+                return frames
+
+        effect = os.path.basename(directory)
+        frames = []
+        for i in range(len(glob.glob(f"{directory}/*.png"))):
+            frame = Image.open(f"{directory}/{effect}_{i+1}.png")
+            if size:
+                frame = frame.resize(size)
+            frame = frame.convert('RGBA')
+            # Full-size overlays are mostly transparent, so only their visible box is kept
+            if (bbox := frame.getchannel('A').getbbox()) is None:
+                frames.append((None, (0, 0)))
+            else:
+                frames.append((frame.crop(bbox), bbox[:2]))
+
+        self._store(key, frames)
+        return frames
+
+    def get_font(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+        """ Gets a loaded TrueType font.
+        :param path: The path of the font file.
+        :param size: The size of the font. """
+
+        key = (path, os.path.getmtime(path), size)
+        with self._lock:
+            if (font := self._fonts.get(key)) is not None:
+                self._fonts.move_to_end(key)
+                return font
+
+        font = ImageFont.truetype(path, size)
+        with self._lock:
+            self._fonts[key] = font
+            while len(self._fonts) > self.max_fonts:
+                self._fonts.popitem(last=False)
+        return font
+
+    def fit_font(self, path: str, text: str, max_width: float, max_size: int = 512) -> ImageFont.FreeTypeFont:
+        """ Gets the largest size of a font that writes the text narrower than the given width.
+        :param path: The path of the font file.
+        :param text: The text to fit.
+        :param max_width: The width the text must stay under.
+        :param max_size: The largest size to try. [Default = 512] """
+
+        def fits(size: int) -> bool:
+            return self.get_font(path, size).getlength(text) < max_width
+
+        # Doubles the size until the text is too wide, then binary searches between the last two sizes
+        fitting, too_wide = 0, 1
+        while too_wide <= max_size and fits(too_wide):
+            fitting, too_wide = too_wide, too_wide * 2
+
+        too_wide = min(too_wide, max_size + 1)
+        while too_wide - fitting > 1:
+            middle = (fitting + too_wide) // 2
+            if fits(middle):
+                fitting = middle
+            else:
+                too_wide = middle
+
+        return self.get_font(path, max(fitting, 1))
+
+    def warm(self, paths: Iterable[str], size: Optional[Tuple[int, int]] = None) -> int:
+        """ Preloads images into the cache, skipping files that can't be decoded.
+        :param paths: The paths of the images to preload.
+        :param size: The size to resize the images to. [Optional] """
+
+        loaded = 0
+        for path in paths:
+            try:
+                self.get_image(path, size)
+                loaded += 1
+            except Exception:
+                pass
+        return loaded
+
+    def clear(self) -> None:
+        """ Drops every cached image and font. """
+
+        with self._lock:
+            self._images.clear()
+            self._fonts.clear()
+            self.used_bytes = 0
+
+    def _store(self, key: Tuple[str, float, Optional[Tuple[int, int]]], entry: Any) -> None:
+        """ Stores an image or frame sequence, evicting the least recently used ones if full. """
+
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = entry
+                self.used_bytes += self._entry_bytes(entry)
+                while self.used_bytes > self.max_bytes and len(self._images) > 1:
+                    _, evicted = self._images.popitem(last=False)
+                    self.used_bytes -= self._entry_bytes(evicted)
+
+    @staticmethod
+    def _entry_bytes(entry: Any) -> int:
+        """ Gets the amount of bytes of an RGBA image's or frame sequence's pixels. """
+
+        if isinstance(entry, list):
+            return sum(frame.width * frame.height * 4 for frame, _ in entry if frame is not None)
+        return entry.width * entry.height * 4
+
+
+# ASSET_CACHE_MAX_MB bounds the decoded pixels, which take far more memory than the files on disk
+assets = AssetCache(
+    max_bytes=int(os.getenv('ASSET_CACHE_MAX_MB', 128)) * 1024 * 1024,
+    max_fonts=int(os.getenv('ASSET_CACHE_MAX_FONTS', 128)),
+)
+
+def warm_profile_assets() -> int:
+    """ Preloads the images most profiles are made of: sloths, base items, badges and effect frames. """
+
+    loaded = assets.warm(sorted(glob.glob('./sloth_custom_images/sloth/*.png')))
+    loaded += assets.warm(sorted(glob.glob('./sloth_custom_images/*/base_*.png')))
+    loaded += assets.warm(sorted(glob.glob('./sloth_custom_images/badge/*.png')))
+    loaded += assets.warm(
+        (f"./sloth_custom_images/badge/{flag_badge[0]}" for flag_badge in flag_badges.values()), size=(50, 50))
+    for directory in sorted(glob.glob('media/effects/*/')):
+        try:
+            loaded += len(assets.get_effect_frames(directory))
+        except Exception:
+            pass
+    return loaded
@@ -0,0 +1,122 @@
+# import.standard
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class TTLCache:
+    """ A read-through cache bounded both by age (TTL) and by size (LRU). """
+
+    def __init__(self, max_size: int = 5000, ttl: float = 300) -> None:
+        """ Class init method.
+        :param max_size: The maximum amount of entries to keep.
+        :param ttl: The amount of seconds an entry stays valid. """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # {key: (expires_at, value)}
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Loads in progress, invalidating a key drops its token so a stale load isn't stored
+        self._loading: Dict[Hashable, object] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return (entry := self._entries.get(key)) is not None and entry[0] > time.monotonic()
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """ Gets a value from the cache, loading and storing it on a miss.
+        :param key: The key of the value.
+        :param loader: A coroutine function that loads the value.
+        :param cache_if: A function that tells whether a loaded value can be stored. [Optional][Default = Always] """
+
+        if (entry := self._entries.get(key)) is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        self.misses += 1
+        token = self._loading[key] = object()
+        try:
+            value = await loader()
+        finally:
+            # A failed load leaves nothing behind, and a newer load's token is left for it to use
+            stored = self._loading.get(key) is token
+            if stored:
+                del self._loading[key]
+
+        if stored and (cache_if is None or cache_if(value)):
+            self.set(key, value)
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """ Gets a value only if it's cached, without loading it.
+        :param key: The key of the value.
+        :param default: What to return when it isn't cached. [Optional] """
+
+        if (entry := self._entries.get(key)) is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """ Stores a value, evicting the least recently used entries if full.
+        :param key: The key of the value.
+        :param value: The value to store. """
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def update(self, key: Hashable, updater: Callable[[Any], Any]) -> None:
+        """ Applies a write to a cached value, so it stays coherent without a reload.
+        :param key: The key of the value.
+        :param updater: A function that takes the cached value and returns the updated one. """
+
+        self._loading.pop(key, None)
+        if (entry := self._entries.get(key)) is not None:
+            self._entries[key] = (entry[0], updater(entry[1]))
+
+    def invalidate(self, key: Hashable) -> None:
+        """ Drops a value from the cache.
+        :param key: The key of the value. """
+
+        self._loading.pop(key, None)
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """ Drops every value from the cache. """
+
+        self._loading.clear()
+        self._entries.clear()
+
+
+class SingleFlight:
+    """ Runs one load per key at a time. Callers asking for a key that's already loading wait for that load. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self._running: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    async def run(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """ Gets the result of the key's running load, starting it if there's none.
+        :param key: The key of the load.
+        :param loader: A function that returns an awaitable of the result. """
+
+        if (running := self._running.get(key)) is None:
+            running = self._running[key] = asyncio.ensure_future(loader())
+            running.add_done_callback(lambda _: self._running.pop(key, None))
+
+        # Shielded, since the load is shared and one caller giving up shouldn't cancel it for the others
+        return await asyncio.shield(running)
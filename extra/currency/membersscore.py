@@ -1,12 +1,34 @@
 # import.standard
-from typing import List, Union
+from typing import Any, Dict, List, Union
 
 # import.thirdparty
 import discord
 from discord.ext import commands
 
 # import.local
-from mysqldb import DatabaseCore
+from extra.cache import TTLCache
+from extra.rendering import profile_cache
+from mysqldb import DatabaseCore, WriteBehindBuffer, write_buffer
+
+# Position of each column in the MembersScore rows
+members_score_columns: Dict[str, int] = {
+    "user_id": 0, "user_xp": 1, "user_lvl": 2, "user_xp_time": 3, "score_points": 4, "rep_time": 5,
+}
+members_score_cache = TTLCache(max_size=5000, ttl=300)
+
+def write_through_members_score(user_id: int, columns_update: Dict[str, List[Any]]) -> None:
+    """ Applies a write onto the cached MembersScore rows of a user.
+    :param user_id: The ID of the user that was updated.
+    :param columns_update: The operation ("+" or "=") and value of each updated column. """
+
+    members_score_cache.update(user_id, lambda rows: [
+        WriteBehindBuffer.apply_updates(row, columns_update, members_score_columns) for row in rows
+    ])
+    # The level picks the badge on the profile card
+    if "user_lvl" in columns_update:
+        profile_cache.invalidate(user_id)
+
+write_buffer.add_flush_listener("MembersScore", write_through_members_score)
 
 class MembersScoreTable(commands.Cog):
     """ Class for the MembersScore table in the database. """
@@ -29,7 +51,7 @@ class MembersScoreTable(commands.Cog):
             return await ctx.send(f"**The `MembersScore` table already exists, {member.mention}!**")
 
         await self.db.execute_query(
-            "CREATE TABLE MembersScore (user_id bigint, user_xp bigint, user_lvl int, user_xp_time int, score_points bigint, rep_time bigint)")
+            "CREATE TABLE MembersScore (user_id bigint, user_xp bigint, user_lvl int, user_xp_time int, score_points bigint, rep_time bigint, KEY score_points (score_points), KEY user_xp (user_xp))")
 
         await ctx.send(f"**Table `MembersScore` created, {member.mention}!**")
 
@@ -44,6 +66,7 @@ class MembersScoreTable(commands.Cog):
             return await ctx.send(f"**The `MembersScore` table doesn't exist, {member.mention}!**")
 
         await self.db.execute_query("DROP TABLE MembersScore")
+        members_score_cache.clear()
 
         await ctx.send(f"**Table `MembersScore` dropped, {member.mention}!**")
 
@@ -58,6 +81,7 @@ class MembersScoreTable(commands.Cog):
             return await ctx.send(f"**The `MembersScore` table doesn't exist yet, {member.mention}!**")
 
         await self.db.execute_query("DELETE FROM MembersScore")
+        members_score_cache.clear()
 
         await ctx.send(f"**Table `MembersScore` reset, {member.mention}!**")
 
@@ -78,6 +102,7 @@ class MembersScoreTable(commands.Cog):
         :param rep_time: The initial rep timestamp. """
 
         await self.db.execute_query("INSERT INTO MembersScore VALUES (%s, %s, %s, %s, %s, %s)", (user_id, xp, lvl, xp_time, score_points, rep_time))
+        members_score_cache.invalidate(user_id)
 
     # ===== SELECT =====
 
@@ -85,7 +110,12 @@ class MembersScoreTable(commands.Cog):
         """ Gets a specifc user from the MembersScore table.
         :param user_id: The ID of the user to get. """
 
-        return await self.db.execute_query("SELECT * FROM MembersScore WHERE user_id = %s", (user_id,), fetch="all")
+        the_member = await members_score_cache.get(user_id, lambda: self.db.execute_query(
+            "SELECT * FROM MembersScore WHERE user_id = %s", (user_id,), fetch="all"), cache_if=bool)
+        return [
+            write_buffer.overlay("MembersScore", row, members_score_columns, "user_id", user_id)
+            for row in the_member
+        ]
 
     async def get_member_scores(self) -> List[List[int]]:
         """ Gets all users from the MembersScore table. """
@@ -112,32 +142,62 @@ class MembersScoreTable(commands.Cog):
 
         return await self.db.execute_query("SELECT * FROM MembersScore ORDER BY user_xp DESC", fetch="all")
 
+    async def get_user_score_points_position(self, user_id: int) -> List[int]:
+        """ Gets a user's score points and their position in the reputation ranking, counted in the database.
+        :param user_id: The ID of the user. """
+
+        return await self.db.execute_query("""
+            SELECT T.score_points, (SELECT COUNT(*) FROM MembersScore WHERE score_points > T.score_points) + 1
+            FROM MembersScore AS T WHERE T.user_id = %s
+            """, (user_id,), fetch="one")
+
+    async def get_user_xp_position(self, user_id: int) -> List[int]:
+        """ Gets a user's XP and their position in the level ranking, counted in the database.
+        :param user_id: The ID of the user. """
+
+        return await self.db.execute_query("""
+            SELECT T.user_xp, (SELECT COUNT(*) FROM MembersScore WHERE user_xp > T.user_xp) + 1
+            FROM MembersScore AS T WHERE T.user_id = %s
+            """, (user_id,), fetch="one")
+
     # ===== UPDATE =====
     async def clear_user_lvl(self, user_id: int) -> None:
         """ Clears the level and XP of a user.
         :param user_id: The ID of the user to clear. """
 
         await self.db.execute_query("UPDATE MembersScore SET user_xp = 0, user_lvl = 1 WHERE user_id = %s", (user_id,))
+        write_through_members_score(user_id, {"user_xp": ["=", 0], "user_lvl": ["=", 1]})
 
-    async def update_user_xp(self, user_id: int, xp: int) -> None:
+    async def update_user_xp(self, user_id: int, xp: int, buffered: bool = False) -> None:
         """ Updates the user Xp in the MembersScore table.
         :param user_id: The ID of the user to update.
-        :pram xp: The XP incremention value to apply. """
+        :pram xp: The XP incremention value to apply.
+        :param buffered: Whether to write it in the next batch instead of right away. [Default = False] """
+
+        if buffered:
+            return write_buffer.increment("MembersScore", "user_xp", xp, "user_id", user_id)
 
         await self.db.execute_query("UPDATE MembersScore SET user_xp = user_xp + %s WHERE user_id = %s", (xp, user_id))
+        write_through_members_score(user_id, {"user_xp": ["+", xp]})
 
     async def update_user_lvl(self, user_id: int) -> None:
         """ Updates the user level in the MembersScore table.
         :param user_id: The ID of the user to update the level. """
 
         await self.db.execute_query("UPDATE MembersScore set user_lvl = user_lvl + 1 WHERE user_id = %s", (user_id,))
+        write_through_members_score(user_id, {"user_lvl": ["+", 1]})
 
-    async def update_user_xp_time(self, user_id: int, time: int) -> None:
+    async def update_user_xp_time(self, user_id: int, time: int, buffered: bool = False) -> None:
         """ Updates the user XP time in the MembersScore table.
         :param user_id: The ID of the user to update.
-        :param time: The current timestamp. """
+        :param time: The current timestamp.
+        :param buffered: Whether to write it in the next batch instead of right away. [Default = False] """
+
+        if buffered:
+            return write_buffer.set("MembersScore", "user_xp_time", time, "user_id", user_id)
 
         await self.db.execute_query("UPDATE MembersScore SET user_xp_time = %s WHERE user_id = %s", (time, user_id))
+        write_through_members_score(user_id, {"user_xp_time": ["=", time]})
 
     async def update_user_score_points(self, user_id: int, score_points: int) -> None:
         """ Updates the user's score points in the MembersScore table.
@@ -145,6 +205,7 @@ class MembersScoreTable(commands.Cog):
         :param score_points: The increment value to apply to the score points. """
 
         await self.db.execute_query("UPDATE MembersScore SET score_points = score_points + %s WHERE user_id = %s", (score_points, user_id))
+        write_through_members_score(user_id, {"score_points": ["+", score_points]})
 
     async def update_user_rep_time(self, user_id: int, rep_time: int) -> None:
         """ Updates the user rep time.
@@ -152,6 +213,7 @@ class MembersScoreTable(commands.Cog):
         :param rep_time: The rep time. """
 
         await self.db.execute_query("UPDATE MembersScore SET rep_time = %s WHERE user_id = %s", (rep_time, user_id))
+        write_through_members_score(user_id, {"rep_time": ["=", rep_time]})
 
     # ===== DELETE =====
 
@@ -160,3 +222,4 @@ class MembersScoreTable(commands.Cog):
         :param user_id: The ID of the user to remove. """
 
         await self.db.execute_query("DELETE FROM MembersScore WHERE user_id = %s", (user_id,))
+        members_score_cache.invalidate(user_id)
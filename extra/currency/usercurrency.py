@@ -1,10 +1,34 @@
 # import.standard
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
 # import.thirdparty
 import discord
 from discord.ext import commands
 
+# import.local
+from extra.cache import TTLCache
+from extra.rendering import profile_cache
+from mysqldb import WriteBehindBuffer
+
+# Position of each column in the UserCurrency rows
+user_currency_columns: Dict[str, int] = {
+    "user_id": 0, "user_money": 1, "last_purchase_ts": 2, "user_classes": 3,
+    "user_class_reward": 4, "user_hosted": 5, "user_lotto": 6, "user_premium_money": 7,
+}
+user_currency_cache = TTLCache(max_size=5000, ttl=300)
+
+def write_through_user_currency(user_id: int, columns_update: Dict[str, List[Any]]) -> None:
+    """ Applies a write onto the cached UserCurrency rows of a user.
+    :param user_id: The ID of the user that was updated.
+    :param columns_update: The operation ("+" or "=") and value of each updated column. """
+
+    user_currency_cache.update(user_id, lambda rows: [
+        WriteBehindBuffer.apply_updates(row, columns_update, user_currency_columns) for row in rows
+    ])
+    # The leaves are printed on the profile card
+    if "user_money" in columns_update or "user_premium_money" in columns_update:
+        profile_cache.invalidate(user_id)
+
 class UserCurrencyTable:
     """ Class for the UserCurrency table in the database. """
 
@@ -30,8 +54,9 @@ class UserCurrencyTable:
                 user_class_reward BIGINT DEFAULT 0, 
                 user_hosted BIGINT DEFAULT 0,
                 user_lotto BIGINT DEFAULT NULL,
-                user_premium_money BIGINT DEFAULT 0
-                PRIMARY KEY (user_id))
+                user_premium_money BIGINT DEFAULT 0,
+                PRIMARY KEY (user_id),
+                KEY user_money (user_money))
             """)
         return await ctx.send(f"**Table `{self.TABLE_NAME}` created, {member.mention}!**")
 
@@ -46,6 +71,7 @@ class UserCurrencyTable:
             return await ctx.send(f"**The `{self.TABLE_NAME}` table doesn't exist, {member.mention}!**")
 
         await self.db.execute_query("DROP TABLE UserCurrency")
+        user_currency_cache.clear()
         return await ctx.send(f"**Table `{self.TABLE_NAME}` dropped, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -59,6 +85,7 @@ class UserCurrencyTable:
             return await ctx.send(f"**The `{self.TABLE_NAME}` table doesn't exist yet, {member.mention}!**")
 
         await self.db.execute_query("DELETE FROM UserCurrency")
+        user_currency_cache.clear()
 
         return await ctx.send(f"**Table `{self.TABLE_NAME}` reset, {member.mention}!**")
 
@@ -68,7 +95,8 @@ class UserCurrencyTable:
         """ Gets the user's currency info.
         :param user_id: The ID of the user to get. """
 
-        return await self.db.execute_query("SELECT * FROM UserCurrency WHERE user_id = %s", (user_id,), fetch="all")
+        return await user_currency_cache.get(user_id, lambda: self.db.execute_query(
+            "SELECT * FROM UserCurrency WHERE user_id = %s", (user_id,), fetch="all"), cache_if=bool)
 
     async def get_top_ten_leaves_users(self) -> List[List[int]]:
         """ Gets the top ten users with the most leaves. """
@@ -96,6 +124,24 @@ class UserCurrencyTable:
 
         return await self.db.execute_query("SELECT * FROM UserServerActivity ORDER BY user_time DESC", fetch="all")
 
+    async def get_user_leaves_position(self, user_id: int) -> List[int]:
+        """ Gets a user's leaves and their position in the leaves ranking, counted in the database.
+        :param user_id: The ID of the user. """
+
+        return await self.db.execute_query("""
+            SELECT T.user_money, (SELECT COUNT(*) FROM UserCurrency WHERE user_money > T.user_money) + 1
+            FROM UserCurrency AS T WHERE T.user_id = %s
+            """, (user_id,), fetch="one")
+
+    async def get_user_time_position(self, user_id: int) -> List[int]:
+        """ Gets a user's time and their position in the time ranking, counted in the database.
+        :param user_id: The ID of the user. """
+
+        return await self.db.execute_query("""
+            SELECT T.user_time, (SELECT COUNT(*) FROM UserServerActivity WHERE user_time > T.user_time) + 1
+            FROM UserServerActivity AS T WHERE T.user_id = %s
+            """, (user_id,), fetch="one")
+
     # ===== INSERT =====
 
     async def insert_user_currency(self, user_id: int, the_time: int) -> None:
@@ -104,6 +150,7 @@ class UserCurrencyTable:
         :param the_time: The current timestamp. """
 
         await self.db.execute_query("INSERT INTO UserCurrency (user_id, user_money, last_purchase_ts) VALUES (%s, %s, %s)", (user_id, 0, the_time))
+        user_currency_cache.invalidate(user_id)
 
     # ===== UPDATE =====
     async def update_user_money(self, user_id: int, money: int) -> None:
@@ -112,6 +159,7 @@ class UserCurrencyTable:
         :param money: The money addition. (It can be negative)"""
 
         await self.db.execute_query("UPDATE UserCurrency SET user_money = user_money + %s WHERE user_id = %s", (money, user_id))
+        write_through_user_currency(user_id, {"user_money": ["+", money]})
 
     async def update_user_premium_money(self, user_id: int, money: int) -> None:
         """ Updates the user money.
@@ -119,12 +167,15 @@ class UserCurrencyTable:
         :param premium_money: The money addition. (It can be negative)"""
 
         await self.db.execute_query("UPDATE UserCurrency SET user_premium_money = user_premium_money + %s WHERE user_id = %s", (money, user_id))
+        write_through_user_currency(user_id, {"user_premium_money": ["+", money]})
 
     async def update_user_many_money(self, users: List[Tuple[int, int]]) -> None:
         """ Updates many the money of many users.
         :param users: The users to update the money. """
 
         await self.db.execute_query("UPDATE UserCurrency SET user_money = user_money + %s WHERE user_id = %s", users, execute_many=True)
+        for money, user_id in users:
+            write_through_user_currency(user_id, {"user_money": ["+", money]})
 
     async def update_user_purchase_ts(self, user_id: int, the_time: int) -> None:
         """ Updates the user purchase timestamp.
@@ -132,6 +183,7 @@ class UserCurrencyTable:
         :param the_time: The current timestamp. """
 
         await self.db.execute_query("UPDATE UserCurrency SET last_purchase_ts = %s WHERE user_id = %s", (the_time, user_id))
+        write_through_user_currency(user_id, {"last_purchase_ts": ["=", the_time]})
 
     async def update_user_lotto_ts(self, user_id: int, the_time: int) -> None:
         """ Updates the user lotto timestamp.
@@ -139,21 +191,25 @@ class UserCurrencyTable:
         :param the_time: The current timestamp. """
 
         await self.db.execute_query("UPDATE UserCurrency SET user_lotto = %s WHERE user_id = %s", (the_time, user_id))
+        write_through_user_currency(user_id, {"user_lotto": ["=", the_time]})
 
     async def update_user_hosted(self, user_id: int) -> None:
         """ Updates the user hosted classes counter.
         :param user_id: The user's ID. """
 
         await self.db.execute_query("UPDATE UserCurrency SET user_hosted = user_hosted + 1 WHERE user_id = %s", (user_id,))
+        write_through_user_currency(user_id, {"user_hosted": ["+", 1]})
 
     async def update_user_classes(self, user_id: int) -> None:
         """ Updates the user classes counter.
         :param user_id: The user's ID. """
 
         await self.db.execute_query("UPDATE UserCurrency SET user_classes = user_classes + 1 WHERE user_id = %s", (user_id,))
+        write_through_user_currency(user_id, {"user_classes": ["+", 1]})
 
     async def update_user_class_reward(self, user_id: int) -> None:
         """ Updates the user reward classes counter.
         :param user_id: The user's ID. """
 
         await self.db.execute_query("UPDATE UserCurrency SET user_class_reward = user_class_reward + 1 WHERE user_id = %s", (user_id,))
+        write_through_user_currency(user_id, {"user_class_reward": ["+", 1]})
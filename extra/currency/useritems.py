@@ -1,13 +1,20 @@
 # import.standard
-from typing import List, Union
+import os
+from bisect import bisect_right
+from typing import Dict, List, Tuple, Union
 
 # import.thirdparty
 import discord
 from discord.ext import commands
 
 # import.local
+from extra.cache import TTLCache
+from extra.rendering import profile_cache
 from mysqldb import DatabaseCore
 
+# The item counter of every user and the sorted counters, counted at most once per TTL for the item positions
+item_counters_cache = TTLCache(max_size=1, ttl=int(os.getenv('LEADERBOARD_CACHE_TTL', 60)))
+
 class UserItemsTable(commands.Cog):
     """ Class for the UserItems table in the database. """
 
@@ -48,6 +55,7 @@ class UserItemsTable(commands.Cog):
             return await ctx.send(f"**The `UserItems` table doesn't exist, {member.mention}!**")
 
         await self.db.execute_query("DROP TABLE UserItems")
+        profile_cache.clear()
 
         return await ctx.send(f"**Table `UserItems` dropped, {member.mention}!**")
 
@@ -63,6 +71,7 @@ class UserItemsTable(commands.Cog):
             return await ctx.send(f"**The `UserItems` table doesn't exist yet, {member.mention}!**")
 
         await self.db.execute_query("DELETE FROM UserItems")
+        profile_cache.clear()
 
         return await ctx.send(f"**Table `UserItems` reset, {member.mention}!**")
 
@@ -85,6 +94,7 @@ class UserItemsTable(commands.Cog):
 
         await self.db.execute_query("INSERT INTO UserItems (user_id, item_name, enable, item_type, image_name) VALUES (%s, %s, %s, %s, %s)",
                                (user_id, item_name.title(), enable, item_type.lower(), item_image))
+        profile_cache.invalidate(user_id)
 
     # ===== DELETE =====
 
@@ -94,6 +104,7 @@ class UserItemsTable(commands.Cog):
         :param item_name: The name of the item to remove. """
 
         await self.db.execute_query("DELETE FROM UserItems WHERE item_name = %s and user_id = %s", (item_name, user_id))
+        profile_cache.invalidate(user_id)
 
     # ===== UPDATE =====
 
@@ -104,6 +115,7 @@ class UserItemsTable(commands.Cog):
         :param enable: The new state to set the item to. (equipped/unequipped) """
 
         await self.db.execute_query("UPDATE UserItems SET enable = %s WHERE user_id = %s and item_name = %s", (enable, user_id, item_name))
+        profile_cache.invalidate(user_id)
 
     # ===== SELECT =====
 
@@ -187,3 +199,21 @@ class UserItemsTable(commands.Cog):
         """ Gets the item counter of the all users with most items. """
 
         return await self.db.execute_query("SELECT user_id, COUNT(*) FROM UserItems GROUP BY user_id ORDER BY COUNT(*) DESC", fetch="all")
+
+    async def get_user_item_counter_position(self, user_id: int) -> List[int]:
+        """ Gets a user's item counter and their position in the items ranking, or None if they have no items.
+        :param user_id: The ID of the user. """
+
+        counters, sorted_counters = await item_counters_cache.get('counters', self.load_item_counters, cache_if=lambda counters: bool(counters[0]))
+        if not (items := counters.get(user_id)):
+            return None
+
+        # The users with more items than them, plus one
+        return [items, len(sorted_counters) - bisect_right(sorted_counters, items) + 1]
+
+    async def load_item_counters(self) -> Tuple[Dict[int, int], List[int]]:
+        """ Loads the item counter of every user, along with the counters sorted in ascending order. """
+
+        rows = await self.db.execute_query("SELECT user_id, COUNT(*) FROM UserItems GROUP BY user_id", fetch="all")
+        counters = {user_id: items for user_id, items in rows}
+        return counters, sorted(counters.values())
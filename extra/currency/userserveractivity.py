@@ -1,17 +1,35 @@
 # import.standard
 import os
-from typing import List
+from typing import Any, Dict, List
 
 # import.thirdparty
 from discord.ext import commands
 
 # import.local
 from extra import utils
-from mysqldb import DatabaseCore
+from extra.cache import TTLCache
+from mysqldb import DatabaseCore, WriteBehindBuffer, write_buffer
 
 # variables.voicechannel
 afk_channel_id = int(os.getenv('AFK_CHANNEL_ID', 123))
 
+# Position of each column in the UserServerActivity rows
+server_activity_columns: Dict[str, int] = {
+    "user_id": 0, "user_messages": 1, "user_time": 2, "user_timestamp": 3,
+}
+server_activity_cache = TTLCache(max_size=5000, ttl=300)
+
+def write_through_server_activity(user_id: int, columns_update: Dict[str, List[Any]]) -> None:
+    """ Applies a write onto the cached UserServerActivity rows of a user.
+    :param user_id: The ID of the user that was updated.
+    :param columns_update: The operation ("+" or "=") and value of each updated column. """
+
+    server_activity_cache.update(user_id, lambda rows: [
+        WriteBehindBuffer.apply_updates(row, columns_update, server_activity_columns) for row in rows
+    ])
+
+write_buffer.add_flush_listener("UserServerActivity", write_through_server_activity)
+
 class UserVoiceSystem(commands.Cog):
     """ Cog for the inner systems of UserVoice events. """
 
@@ -277,7 +295,7 @@ class UserServerActivityTable(commands.Cog):
         if await self.check_user_server_activity_table_exists():
             return await ctx.send("The `UserServerActivity` already exists!**")
 
-        await self.db.execute_query("CREATE TABLE UserServerActivity (user_id BIGINT, user_messages BIGINT, user_time BIGINT, user_timestamp BIGINT DEFAULT NULL)")
+        await self.db.execute_query("CREATE TABLE UserServerActivity (user_id BIGINT, user_messages BIGINT, user_time BIGINT, user_timestamp BIGINT DEFAULT NULL, KEY user_time (user_time))")
 
         return await ctx.send("**Table `UserServerActivity` created!**")
 
@@ -292,6 +310,7 @@ class UserServerActivityTable(commands.Cog):
             return await ctx.send("The `UserServerActivity` doesn't exist!**")
 
         await self.db.execute_query("DROP TABLE UserServerActivity")
+        server_activity_cache.clear()
 
         return await ctx.send("**Table `UserServerActivity` dropped!**")
 
@@ -305,6 +324,7 @@ class UserServerActivityTable(commands.Cog):
             return await ctx.send("The `UserServerActivity` doesn't exist yet!**")
 
         await self.db.execute_query("DELETE FROM UserServerActivity")
+        server_activity_cache.clear()
         return await ctx.send("**Table `UserServerActivity` reset!**")
 
     # ===== SHOW =====
@@ -324,6 +344,7 @@ class UserServerActivityTable(commands.Cog):
         await self.db.execute_query(
             "INSERT INTO UserServerActivity (user_id, user_messages, user_time, user_timestamp) VALUES (%s, %s, %s, %s)",
             (user_id, add_msg, 0, new_ts))
+        server_activity_cache.invalidate(user_id)
 
     # ===== SELECT =====
 
@@ -331,15 +352,25 @@ class UserServerActivityTable(commands.Cog):
         """ Gets a user from the UserServerActivity table.
         :param user_id: The ID of the user to get. """
 
-        return await self.db.execute_query("SELECT * FROM UserServerActivity WHERE user_id = %s", (user_id,), fetch="all")
+        user_info = await server_activity_cache.get(user_id, lambda: self.db.execute_query(
+            "SELECT * FROM UserServerActivity WHERE user_id = %s", (user_id,), fetch="all"), cache_if=bool)
+        return [
+            write_buffer.overlay("UserServerActivity", row, server_activity_columns, "user_id", user_id)
+            for row in user_info
+        ]
 
     # ===== UPDATE =====
-    async def update_user_server_messages(self, user_id: int, add_msg: int) -> None:
+    async def update_user_server_messages(self, user_id: int, add_msg: int, buffered: bool = False) -> None:
         """ Updates the user's message counter.
         :param user_id: The ID of the user to update.
-        :param add_msg: The increment to apply to their current message counter. """
+        :param add_msg: The increment to apply to their current message counter.
+        :param buffered: Whether to write it in the next batch instead of right away. [Default = False] """
+
+        if buffered:
+            return write_buffer.increment("UserServerActivity", "user_messages", add_msg, "user_id", user_id)
 
         await self.db.execute_query("UPDATE UserServerActivity SET user_messages = user_messages + %s WHERE user_id = %s", (add_msg, user_id))
+        write_through_server_activity(user_id, {"user_messages": ["+", add_msg]})
 
     async def update_user_server_time(self, user_id: int, increment: int, current_ts: int = None) -> None:
         """ Updates the user's voice time information.
@@ -350,6 +381,7 @@ class UserServerActivityTable(commands.Cog):
         await self.db.execute_query("""
             UPDATE UserServerActivity SET user_time = user_time + %s, user_timestamp = %s WHERE user_id = %s
             """, (increment, current_ts, user_id))
+        write_through_server_activity(user_id, {"user_time": ["+", increment], "user_timestamp": ["=", current_ts]})
 
     async def update_user_server_timestamp(self, user_id: int, new_ts: int) -> None:
         """ Updates the user's Server Activity timestamp.
@@ -357,3 +389,4 @@ class UserServerActivityTable(commands.Cog):
         :param new_ts: The new timestamp to set to. """
 
         await self.db.execute_query("UPDATE UserServerActivity SET user_timestamp = %s WHERE user_id = %s", (new_ts, user_id))
+        write_through_server_activity(user_id, {"user_timestamp": ["=", new_ts]})
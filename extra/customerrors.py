@@ -56,3 +56,6 @@ class NotEnoughMoneyError(commands.CheckFailure):
 
     def __init__(self, required_money: int) -> None:
         self.required_money = required_money
+
+class RenderQueueFull(commands.CommandError):
+    pass
@@ -2,10 +2,10 @@
 import glob
 import os
 from itertools import cycle
-from typing import Any, Dict, Tuple, Union
+from typing import Any, BinaryIO, Dict, List, Tuple, Union
 
 # import.thirdparty
-from PIL import Image
+from PIL import Image, ImageChops
 
 def defragment_gif(path: str, output: str) -> None:
     """ Defragments a gif into frames.
@@ -49,6 +49,9 @@ def remove_background(path: str, output: str) -> None:
 class GIF:
     """ A handler for GIF creations."""
 
+    # The palette index left out of the shared palette, marking the pixels a frame keeps from the previous one
+    TRANSPARENT_INDEX: int = 255
+
     def __init__(self, image: Image.Image, frame_duration: int) -> None:
         """ Class initializing method.
         :param image: The base image of the GIF.
@@ -69,14 +72,55 @@ class GIF:
 
         return self._base_image.copy()
 
-    def export(self, path: str, **kwargs) -> None:
-        """ Saves the gif.
-        :param path: The path that the GIF is gonna be saved in. """
+    def export(self, path: Union[str, BinaryIO], **kwargs) -> None:
+        """ Saves the gif, with every frame mapped once onto a palette built from a sample of the frames.
+        Pixels that are the same as in the previous frame are saved as transparent, so only what moves is stored again.
+        :param path: The path or file object that the GIF is gonna be saved in. """
+
+        frames = self._frames or [self._base_image]
+        palette = self.make_palette(frames)
 
-        image = self._base_image.copy()
-        image.paste(self._frames[0], self._frames[0])
-        image.save(path, "GIF", save_all=True, append_images=self._frames,
-                   duration=self._frame_duration, transparency=0, loop=0, **kwargs)
+        palette_frames = []
+        previous = None
+        for frame in frames:
+            indexes = frame.convert('RGB').quantize(palette=palette, dither=Image.Dither.NONE)
+            if previous is None:
+                palette_frames.append(indexes)
+            else:
+                # Compares the palette indexes, so pixels that map onto the same color count as unchanged
+                difference = ImageChops.difference(self.get_index_band(indexes), self.get_index_band(previous))
+                delta = indexes.copy()
+                delta.paste(self.TRANSPARENT_INDEX, mask=difference.point(lambda value: 255 if value == 0 else 0))
+                palette_frames.append(delta)
+            previous = indexes
+
+        # The frames are kept on the shared palette as they are, since optimizing would remap them one by one
+        palette_frames[0].save(path, "GIF", save_all=True, append_images=palette_frames[1:],
+                   duration=self._frame_duration, loop=0, optimize=False, disposal=1,
+                   transparency=self.TRANSPARENT_INDEX, **kwargs)
+
+    def make_palette(self, frames: List[Image.Image], samples: int = 8) -> Image.Image:
+        """ Builds the palette of the gif out of evenly spaced frames, so colors that only show up later are in it.
+        :param frames: The frames of the gif.
+        :param samples: The maximum amount of frames to sample. """
+
+        sampled = frames[::max(len(frames) // samples, 1)][:samples]
+        # Halved, since the colors are what matters and not the detail
+        sampled = [frame.convert('RGB').reduce(2) for frame in sampled]
+        width, height = sampled[0].size
+        sheet = Image.new('RGB', (width, height * len(sampled)))
+        for i, frame in enumerate(sampled):
+            sheet.paste(frame, (0, height * i))
+
+        # Fast octree keeps the gradients of the effects about as well as median cut, in a fraction of the time
+        return sheet.quantize(colors=self.TRANSPARENT_INDEX, method=Image.Quantize.FASTOCTREE)
+
+    @staticmethod
+    def get_index_band(image: Image.Image) -> Image.Image:
+        """ Gets the palette indexes of a palette image as a grayscale image.
+        :param image: The palette image. """
+
+        return Image.frombytes('L', image.size, image.tobytes())
 
 if __name__ == '__main__':
 
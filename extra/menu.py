@@ -401,14 +401,14 @@ class MemberSnipeLooping(menus.ListPageSource):
         embed.set_author(name=self.member, url=self.member.display_avatar, icon_url=self.member.display_avatar)
 
         for i, message in enumerate(entries, start=offset):
-            if len(message["content"]) > 850:
-                content = message["content"][:850] + '...'
+            if len(message.content) > 850:
+                content = message.content[:850] + '...'
             else:
-                content = message["content"]
+                content = message.content
 
             embed.description = embed.description + f"""
             **>>** {content}
-            **At <t:{int(message['time'])}:T> in <#{message['channel'].id}>**\n\n"""
+            **At <t:{int(message.time)}:T> in <#{message.channel.id}>**\n\n"""
 
             embed.set_footer(text=f"({i+1}-{i+1+6} of {len(self.entries)})")
 
@@ -428,18 +428,15 @@ class SnipeLooping(menus.ListPageSource):
 
         for i, message in enumerate(entries, start=offset):
 
-            member_id = next(iter(message.keys()))
-            message = message[member_id]
-
-            if len (message["content"]) > 850:
-                content = message["content"][:850] + '...'
+            if len (message.content) > 850:
+                content = message.content[:850] + '...'
             else:
-                content = message["content"]
+                content = message.content
 
             embed.description = embed.description + f"""
-            <@{member_id}>
+            <@{message.author_id}>
             **>>** {content}
-            **At <t:{int(message['time'])}:T> in <#{message['channel'].id}>**\n\n"""
+            **At <t:{int(message.time)}:T> in <#{message.channel.id}>**\n\n"""
             embed.set_footer(text=f"({i+1}-{i+1+6} of {len(self.entries)})")
 
         return embed
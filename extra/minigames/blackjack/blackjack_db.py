@@ -21,12 +21,13 @@ class BlackJackDB(commands.Cog):
         await self.db.execute_query("""
             CREATE TABLE Blackjack (
                 user_id BIGINT NOT NULL, 
-                wins INT NOT DEFAULT 0,
+                wins INT DEFAULT 0,
                 losses INT DEFAULT 0,
                 draws INT DEFAULT 0,
                 surrenders INT DEFAULT 0,
                 games INT DEFAULT 0,
-                PRIMARY KEY (user_id)
+                PRIMARY KEY (user_id),
+                KEY wins (wins)
         )""")
         await ctx.send(f"**Table `Blackjack` created, {member.mention}!**")
 
@@ -90,3 +91,12 @@ class BlackJackDB(commands.Cog):
         """ Gets the top ten users with the most wins in the coinflips game. """
 
         return await self.db.execute_query("SELECT * FROM Blackjack ORDER BY wins DESC", fetch="all")
+
+    async def get_blackjack_member_position(self, user_id: int) -> List[int]:
+        """ Gets a user's blackjack wins and their position in the blackjack ranking, counted in the database.
+        :param user_id: The ID of the user. """
+
+        return await self.db.execute_query("""
+            SELECT T.wins, (SELECT COUNT(*) FROM Blackjack WHERE wins > T.wins) + 1
+            FROM Blackjack AS T WHERE T.user_id = %s
+            """, (user_id,), fetch="one")
@@ -32,7 +32,8 @@ class CoinflipMemberTable(commands.Cog):
                 wins INT DEFAULT 0,
                 losses INT DEFAULT 0,
                 last_played_ts BIGINT NOT NULL,
-                PRIMARY KEY (user_id)
+                PRIMARY KEY (user_id),
+                KEY wins (wins)
             )""")
 
         await ctx.send(f"**Table `CoinflipMember` created, {member.mention}!**")
@@ -108,3 +109,12 @@ class CoinflipMemberTable(commands.Cog):
         """ Gets the top ten users with the most wins in the coinflips game. """
 
         return await self.db.execute_query("SELECT * FROM CoinflipMember ORDER BY wins DESC", fetch="all")
+
+    async def get_coinflip_member_position(self, user_id: int) -> List[int]:
+        """ Gets a user's coinflip wins and their position in the coinflips ranking, counted in the database.
+        :param user_id: The ID of the user. """
+
+        return await self.db.execute_query("""
+            SELECT T.wins, (SELECT COUNT(*) FROM CoinflipMember WHERE wins > T.wins) + 1
+            FROM CoinflipMember AS T WHERE T.user_id = %s
+            """, (user_id,), fetch="one")
@@ -31,7 +31,8 @@ class MemoryTable(commands.Cog):
                 user_id BIGINT NOT NULL,
                 level TINYINT(4) NOT NULL,
                 record_ts BIGINT NOT NULL,
-                PRIMARY KEY (user_id)
+                PRIMARY KEY (user_id),
+                KEY level (level)
             )""")
 
         await ctx.send(f"**Table `MemoryMember` created, {member.mention}!**")
@@ -99,3 +100,12 @@ class MemoryTable(commands.Cog):
         """ Gets all users from the MemoryMember table ordered by level. """
 
         return await self.db.execute_query("SELECT * FROM MemoryMember ORDER BY level DESC", fetch="all")
+
+    async def get_memory_user_position(self, user_id: int) -> List[int]:
+        """ Gets a user's Memory level and their position in the memory ranking, counted in the database.
+        :param user_id: The ID of the user. """
+
+        return await self.db.execute_query("""
+            SELECT T.level, (SELECT COUNT(*) FROM MemoryMember WHERE level > T.level) + 1
+            FROM MemoryMember AS T WHERE T.user_id = %s
+            """, (user_id,), fetch="one")
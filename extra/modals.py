@@ -92,7 +92,7 @@ class ModeratorApplicationModal(Modal):
 
 
         moderator_app_channel = await self.client.fetch_channel(self.cog.moderator_app_channel_id)
-        owner_role = discord.utils.get(moderator_app_channel.guild.roles, id=self.cog.owner_role_id)
+        owner_role = moderator_app_channel.guild.get_role(self.cog.owner_role_id)
         app = await moderator_app_channel.send(content=f"{owner_role.mention}, {member.mention}", embed=embed)
         await app.add_reaction('✅')
         await app.add_reaction('❌')
@@ -182,7 +182,7 @@ class TeacherApplicationModal(Modal):
     • We will let you know when we need a new teacher. We check apps when we need it!""", ephemeral=True)
 
         teacher_app_channel = await self.client.fetch_channel(self.cog.teacher_app_channel_id)
-        mayu = discord.utils.get(teacher_app_channel.guild.members, id=self.cog.mayu_id)
+        mayu = teacher_app_channel.guild.get_member(self.cog.mayu_id)
         app = await teacher_app_channel.send(content=f"{mayu.mention}, {member.mention}", embed=embed)
         await app.add_reaction('✅')
         await app.add_reaction('❌')
@@ -1,5 +1,5 @@
 # import.standard
-from typing import List
+from typing import List, Set
 
 # import.thirdparty
 import discord
@@ -7,7 +7,7 @@ from discord.ext import commands
 
 # import.local
 from extra import utils
-from mysqldb import DatabaseCore
+from mysqldb import DatabaseCore, write_buffer
 
 class AspirantsTable(commands.Cog):
     """ Class for managing the AspirantsTable table in the database. """
@@ -17,6 +17,7 @@ class AspirantsTable(commands.Cog):
 
         self.client = client
         self.db = DatabaseCore()
+        self.aspirants: Set[int] = set()
 
     @commands.command(hidden=True)
     @commands.has_permissions(administrator=True)
@@ -42,6 +43,7 @@ class AspirantsTable(commands.Cog):
             return await ctx.send(f"**The AspirantActivity table doesn't exist, {member.mention}!**")
 
         await self.db.execute_query('DROP TABLE AspirantActivity')
+        self.aspirants.clear()
         await ctx.send(f"**Table `AspirantActivity` dropped, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -54,16 +56,13 @@ class AspirantsTable(commands.Cog):
             return await ctx.send(f"**The AspirantActivity table doesn't exist yet, {member.mention}!**")
 
         await self.db.execute_query("DELETE FROM AspirantActivity")
+        self.aspirants.clear()
         await ctx.send(f"**Table `AspirantActivity` reset, {member.mention}!**")
 
     async def check_aspirant_activity_exists(self) -> bool:
         """ Checks whether the AspirantActivity table exists. """
 
-        exists = await self.db.execute_query("SHOW TABLE STATUS LIKE 'AspirantActivity'", fetch="one")
-        if exists:
-            return True
-        else:
-            return False
+        return await self.db.table_exists("AspirantActivity")
 
     async def insert_aspirant(self, user_id: int, old_ts: int) -> None:
         """ Inserts an aspirant to the database.
@@ -73,6 +72,7 @@ class AspirantsTable(commands.Cog):
         await self.db.execute_query(
             "INSERT INTO AspirantActivity (user_id, time, timestamp, messages) VALUES (%s, %s, %s, %s)", 
             (user_id, 0, old_ts, 0))
+        self.aspirants.add(user_id)
 
     async def get_all_aspirants(self) -> List[List[int]]:
         """ Gets all aspirants. """
@@ -113,14 +113,14 @@ class AspirantsTable(commands.Cog):
         :param user_id: The ID of the aspirant to add.
         :param addition: The addition to increment to their current time counter. """
 
-        await self.db.execute_query("UPDATE AspirantActivity SET time = time + %s WHERE user_id = %s", (addition, user_id))
+        write_buffer.increment("AspirantActivity", "time", addition, "user_id", user_id)
         await self.update_aspirant_time(user_id)
 
-    async def update_aspirant_message(self, user_id: int) -> None:
-        """ Updates an aspirant's message counter.
+    def update_aspirant_message(self, user_id: int) -> None:
+        """ Updates an aspirant's message counter, through the write buffer.
         :param user_id: The user for whom to update it. """
 
-        await self.db.execute_query("UPDATE AspirantActivity SET messages = messages + 1 WHERE user_id = %s", (user_id,))
+        write_buffer.increment("AspirantActivity", "messages", 1, "user_id", user_id)
 
     async def update_aspirant_time(self, user_id: int) -> None:
         """ Updates an aspirant's timestamp.
@@ -133,4 +133,5 @@ class AspirantsTable(commands.Cog):
         """ Resets an aspirant's statuses.
         :param user_id: The ID of the user to reset. """
 
+        await write_buffer.flush()
         await self.db.execute_query("UPDATE AspirantActivity SET messages = 0, time = 0 WHERE user_id = %s", (user_id,))
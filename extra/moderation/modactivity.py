@@ -1,5 +1,5 @@
 # import.standard
-from typing import List, Optional
+from typing import List, Optional, Set
 
 # import.thirdparty
 import discord
@@ -7,7 +7,7 @@ from discord.ext import commands
 
 # import.local
 from extra import utils
-from mysqldb import DatabaseCore
+from mysqldb import DatabaseCore, write_buffer
 
 class ModActivityTable(commands.Cog):
     """ Class for managing the ModActivity table in the database. """
@@ -17,6 +17,7 @@ class ModActivityTable(commands.Cog):
 
         self.client = client
         self.db = DatabaseCore()
+        self.tracked_mods: Set[int] = set()
 
     # Database commands
     @commands.command(hidden=True)
@@ -49,6 +50,7 @@ class ModActivityTable(commands.Cog):
             return await ctx.send(f"**The `ModActivity` table doesn't exist, {member.mention}!**")
 
         await self.db.execute_query('DROP TABLE ModActivity')
+        self.tracked_mods.clear()
         await ctx.send(f"**Table `ModActivity` dropped, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -61,6 +63,7 @@ class ModActivityTable(commands.Cog):
             return await ctx.send(f"**The `ModActivity` table doesn't exist yett, {member.mention}!**")
 
         await self.db.execute_query("DELETE FROM ModActivity")
+        self.tracked_mods.clear()
         await ctx.send(f"**Table `ModActivity` reset, {member.mention}!**")
 
     async def check_mod_activity_table_exists(self) -> bool:
@@ -84,6 +87,8 @@ class ModActivityTable(commands.Cog):
         await self.db.execute_query("""
             INSERT INTO ModActivity (mod_id, timestamp, messages) VALUES (%s, %s, %s)
             """, (mod_id, old_ts, messages))
+        self.tracked_mods.add(mod_id)
+
     async def remove_moderator(self, mod_id: int) -> None:
         """ Removes a moderator from ModActivity table.
         :param mod_id: The ID of the moderator to remove.
@@ -92,6 +97,7 @@ class ModActivityTable(commands.Cog):
         await self.db.execute_query("""
             DELETE FROM ModActivity WHERE mod_id = %s
             """, (mod_id,))
+        self.tracked_mods.discard(mod_id)
 
     async def get_mod_activities(self) -> List[List[int]]:
         """ Gets all Mod activities data from the database. """
@@ -123,11 +129,11 @@ class ModActivityTable(commands.Cog):
 
         return mod[3]
 
-    async def update_moderator_message(self, mod_id: int) -> None:
-        """ Updates the moderator's message counter.
+    def update_moderator_message(self, mod_id: int) -> None:
+        """ Updates the moderator's message counter, through the write buffer.
         :param mod_id: The moderator's ID. """
 
-        await self.db.execute_query("UPDATE ModActivity SET messages = messages + 1 WHERE mod_id = %s", (mod_id,))
+        write_buffer.increment("ModActivity", "messages", 1, "mod_id", mod_id)
 
     async def update_moderator_timestamp(self, mod_id: int) -> None:
         """ Updates the moderator's timestamp.
@@ -141,14 +147,16 @@ class ModActivityTable(commands.Cog):
         :param mod_id: The moderator ID.
         :param addition: The addition value. """
 
-        await self.db.execute_query("UPDATE ModActivity SET time = time + %s WHERE mod_id = %s", (addition, mod_id))
+        write_buffer.increment("ModActivity", "time", addition, "mod_id", mod_id)
 
     async def reset_mod_activity(self) -> None:
         """ Reset data from the ModActivity table """
 
+        await write_buffer.flush()
         await self.db.execute_query("UPDATE ModActivity SET time = 0, timestamp = 0, messages = 0")
 
     async def delete_mod_activity(self) -> None:
         """ Deletes all the data from the ModActivity table. """
 
         await self.db.execute_query("DELETE FROM ModActivity")
+        self.tracked_mods.clear()
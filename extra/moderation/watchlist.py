@@ -51,7 +51,7 @@ class ModerationWatchlistTable(commands.Cog):
                 general_embed.set_author(name=f'{member} has been watchlisted', icon_url=member.display_avatar)
                 await ctx.send(embed=general_embed)
                 # Moderation log embed
-                moderation_log = discord.utils.get(ctx.guild.channels, id=mod_log_id)
+                moderation_log = ctx.guild.get_channel(mod_log_id)
                 embed = discord.Embed(title='__**Watchlist**__', colour=discord.Colour.lighter_gray(),
                                 timestamp=ctx.message.created_at)
                 embed.add_field(name='User info:', value=f'```Name: {member.display_name}\nId: {member.id}```',
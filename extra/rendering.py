@@ -0,0 +1,235 @@
+# import.standard
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+# import.local
+from extra.customerrors import RenderQueueFull
+
+class RenderPool:
+    """ Runs Pillow work off the event loop, in a thread pool with a bounded queue.
+    Pillow releases the GIL while decoding, resizing and encoding, so threads are enough
+    and images don't have to be pickled across processes. """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 16) -> None:
+        """ Class init method.
+        :param max_workers: The amount of renders that can run at the same time.
+        :param max_queue: The amount of renders that can wait for a free worker. """
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="render")
+        self._pending: int = 0
+
+    @property
+    def pending(self) -> int:
+        """ The amount of renders either running or waiting. """
+
+        return self._pending
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """ Runs a rendering function in the pool.
+        :param func: The function to run.
+        :param args: The positional arguments of the function.
+        :param kwargs: The keyword arguments of the function. """
+
+        if self._pending >= self.max_workers + self.max_queue:
+            raise RenderQueueFull()
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+        finally:
+            self._pending -= 1
+
+    def shutdown(self, wait: Optional[bool] = False) -> None:
+        """ Stops the pool's workers.
+        :param wait: Whether to wait for the running renders. [Default = False] """
+
+        self._executor.shutdown(wait=wait)
+
+
+class RenderCache:
+    """ A byte-bounded LRU cache of rendered images, keyed by a fingerprint of everything they're made of.
+    Entries are also indexed by their owner, so a user's renders can be dropped when their data changes. """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        """ Class init method.
+        :param max_bytes: The maximum amount of encoded image bytes to keep. """
+
+        self.max_bytes = max_bytes
+        self.used_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        # {fingerprint: (owner_id, data, extension)}
+        self._entries: "OrderedDict[str, Tuple[Hashable, bytes, str]]" = OrderedDict()
+        self._owners: Dict[Hashable, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def fingerprint(*inputs: Any) -> str:
+        """ Makes a stable key out of the inputs of a render.
+        :param inputs: Everything the rendered image depends on. """
+
+        return hashlib.sha256(repr(inputs).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """ Gets a rendered image and its extension, if cached.
+        :param key: The fingerprint of the render. """
+
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def set(self, owner_id: Hashable, key: str, data: bytes, extension: str) -> None:
+        """ Stores a rendered image, evicting the least recently used ones if full.
+        :param owner_id: The ID of the user the image belongs to.
+        :param key: The fingerprint of the render.
+        :param data: The encoded image.
+        :param extension: The extension of the image. (png/gif) """
+
+        if len(data) > self.max_bytes:
+            return
+
+        self._discard(key)
+        self._entries[key] = (owner_id, data, extension)
+        self._owners.setdefault(owner_id, set()).add(key)
+        self.used_bytes += len(data)
+        while self.used_bytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate(self, owner_id: Hashable) -> None:
+        """ Drops every rendered image of a user.
+        :param owner_id: The ID of the user. """
+
+        for key in list(self._owners.get(owner_id, ())):
+            self._discard(key)
+
+    def clear(self) -> None:
+        """ Drops every rendered image. """
+
+        self._entries.clear()
+        self._owners.clear()
+        self.used_bytes = 0
+
+    def _discard(self, key: str) -> None:
+        """ Drops a rendered image by its fingerprint. """
+
+        if (entry := self._entries.pop(key, None)) is None:
+            return
+
+        owner_id, data, _ = entry
+        self.used_bytes -= len(data)
+        if keys := self._owners.get(owner_id):
+            keys.discard(key)
+            if not keys:
+                del self._owners[owner_id]
+
+
+class ImageWorkingSet:
+    """ A byte-bounded LRU cache of decoded images with a time to live, such as the image each user is editing.
+    Images are shared with whoever gets them, so copy them before drawing on them. """
+
+    # The room an entry that isn't a Pillow image, like an asset to download later, is counted as taking
+    NOMINAL_BYTES: int = 4096
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 1800, max_entries: int = 1000) -> None:
+        """ Class init method.
+        :param max_bytes: The maximum amount of decoded pixel bytes to keep.
+        :param ttl: How many seconds an image is kept after it was last stored.
+        :param max_entries: The maximum amount of images to keep, whatever their size. """
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.used_bytes: int = 0
+        # {key: (expires_at, image, size)}
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """ Gets an image, if it's cached and hasn't expired.
+        :param key: The key of the image. """
+
+        if (entry := self._entries.get(key)) is None:
+            return None
+
+        if entry[0] <= time.monotonic():
+            self._discard(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, image: Any) -> None:
+        """ Stores an image, evicting expired and least recently used ones if full.
+        :param key: The key of the image.
+        :param image: The image. Anything that isn't a Pillow image, like an asset to download later, takes NOMINAL_BYTES. """
+
+        size = self._image_bytes(image)
+        self._discard(key)
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, image, size)
+        self.used_bytes += size
+        if self.used_bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            now = time.monotonic()
+            for expired in [key for key, entry in self._entries.items() if entry[0] <= now]:
+                self._discard(expired)
+        while self.used_bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate(self, key: Hashable) -> None:
+        """ Drops an image.
+        :param key: The key of the image. """
+
+        self._discard(key)
+
+    def clear(self) -> None:
+        """ Drops every image. """
+
+        self._entries.clear()
+        self.used_bytes = 0
+
+    def _discard(self, key: Hashable) -> None:
+        """ Drops an image by its key. """
+
+        if (entry := self._entries.pop(key, None)) is not None:
+            self.used_bytes -= entry[2]
+
+    def _image_bytes(self, image: Any) -> int:
+        """ Gets the amount of bytes of an image's pixels. """
+
+        if not hasattr(image, 'getbands'):
+            return self.NOMINAL_BYTES
+        return image.width * image.height * len(image.getbands())
+
+
+# Past RENDER_POOL_QUEUE waiting renders, image commands are turned away with RenderQueueFull
+render_pool = RenderPool(
+    max_workers=int(os.getenv('RENDER_POOL_WORKERS', 2)),
+    max_queue=int(os.getenv('RENDER_POOL_QUEUE', 16)),
+)
+
+profile_cache = RenderCache(max_bytes=int(os.getenv('PROFILE_CACHE_MAX_MB', 64)) * 1024 * 1024)
+
+# Keyed by user, so each user keeps editing their own last image
+image_working_set = ImageWorkingSet(
+    max_bytes=int(os.getenv('IMAGE_WORKING_SET_MAX_MB', 64)) * 1024 * 1024,
+    ttl=int(os.getenv('IMAGE_WORKING_SET_TTL', 1800)),
+    max_entries=int(os.getenv('IMAGE_WORKING_SET_MAX_ENTRIES', 1000)),
+)
@@ -108,10 +108,10 @@ class ApplicationsTable(commands.Cog):
 
         for ping in pings:
             if ping['role']:
-                role = discord.utils.get(guild.roles, id=ping['id'])
+                role = guild.get_role(ping['id'])
                 ping_mentions.append(role.mention)
             else:
-                member = discord.utils.get(guild.members, id=ping['id'])
+                member = guild.get_member(ping['id'])
                 ping_mentions.append(member.mention)
 
         if ping_mentions:
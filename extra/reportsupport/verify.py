@@ -49,11 +49,11 @@ class Verify(commands.Cog):
         if not verify_req:
             return
 
-        verified_user = discord.utils.get(guild.members, id=verify_req[1])
+        verified_user = guild.get_member(verify_req[1])
 
         # Che
         if emoji == '✅':
-            verified_role = discord.utils.get(guild.roles, id=self.verified_role_id)
+            verified_role = guild.get_role(self.verified_role_id)
             msg = f"**Verification Request**\nCongratulations, your verification request just got accepted and now you have the `{verified_role.name}` role!"
             try:
                 await verified_user.add_roles(verified_role)
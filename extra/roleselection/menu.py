@@ -276,7 +276,7 @@ class RoleSelect(discord.ui.Select):
 		for value in interaction.data['values']:
 
 			try:
-				role = discord.utils.get(member.guild.roles, id=int(value))
+				role = member.guild.get_role(int(value))
 			except Exception as e:
 				print('error', e)
 				pass
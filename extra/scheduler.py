@@ -0,0 +1,135 @@
+# import.standard
+import asyncio
+import heapq
+import time
+import traceback
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+class ExpiryScheduler:
+    """ Fires expiry handlers when they're due, instead of polling for expired rows.
+    Each timer knows how to find out when it's due next, and is re-armed after firing. """
+
+    def __init__(self, retry_delay: float = 60) -> None:
+        """ Class init method.
+        :param retry_delay: How long to wait before firing again a timer that's still due after running. """
+
+        self.retry_delay = retry_delay
+        # {name: (handler, next_due, max_delay)}
+        self._timers: Dict[str, Tuple[Callable[[], Awaitable[None]], Callable[[], Awaitable[Optional[float]]], Optional[float]]] = {}
+        # Heap of (due, name). Entries that don't match self._due anymore are stale and skipped
+        self._heap: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._running: Dict[str, "asyncio.Task[None]"] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def register(self, name: str, handler: Callable[[], Awaitable[None]],
+        next_due: Callable[[], Awaitable[Optional[float]]], max_delay: Optional[float] = None) -> None:
+        """ Registers a timer.
+        :param name: The name of the timer.
+        :param handler: The coroutine function that handles what expired.
+        :param next_due: A coroutine function that returns the timestamp the timer is due next, or None if nothing is pending.
+        :param max_delay: The longest to wait between runs, for timers whose writes can't schedule them. [Optional] """
+
+        self._timers[name] = (handler, next_due, max_delay)
+
+    def schedule(self, name: str, due: float) -> None:
+        """ Makes a timer fire at the given timestamp, unless it's already due earlier.
+        :param name: The name of the timer.
+        :param due: The timestamp at which it's due. """
+
+        if name not in self._timers:
+            return
+
+        current = self._due.get(name)
+        if current is not None and current <= due:
+            return
+
+        self._due[name] = due
+        heapq.heappush(self._heap, (due, name))
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """ Arms every registered timer and starts firing them. """
+
+        if self._task and not self._task.done():
+            return
+
+        self._wakeup = asyncio.Event()
+        await asyncio.gather(*(self._arm(name) for name in self._timers))
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """ Stops firing timers. """
+
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _arm(self, name: str, after_run: bool = False) -> None:
+        """ Schedules a timer for when it's due next.
+        :param name: The name of the timer.
+        :param after_run: Whether the timer just ran. """
+
+        _, next_due, max_delay = self._timers[name]
+        now = time.time()
+        try:
+            due = await next_due()
+        except Exception:
+            print(f"[ExpiryScheduler] Couldn't find out when '{name}' is due next:")
+            traceback.print_exc()
+            due = now + self.retry_delay
+
+        # Still due right after running means it couldn't be handled, so it's retried later
+        if due is not None and after_run and due <= now:
+            due = now + self.retry_delay
+        if max_delay is not None:
+            due = min(due, now + max_delay) if due is not None else now + max_delay
+
+        if due is not None:
+            self.schedule(name, due)
+
+    async def _run(self) -> None:
+        """ Waits for the next due timer and fires everything that's due. """
+
+        while True:
+            self._wakeup.clear()
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+
+            timeout = max(self._heap[0][0] - time.time(), 0) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                due, name = heapq.heappop(self._heap)
+                if self._due.get(name) != due:
+                    continue
+
+                del self._due[name]
+                # A timer that's still running is re-armed when it finishes
+                if name not in self._running:
+                    self._running[name] = asyncio.create_task(self._fire(name))
+
+    async def _fire(self, name: str) -> None:
+        """ Runs a timer's handler, reporting its errors on its own, and re-arms it.
+        :param name: The name of the timer. """
+
+        handler, _, _ = self._timers[name]
+        try:
+            await handler()
+        except Exception:
+            print(f"[ExpiryScheduler] The '{name}' expiry handler failed:")
+            traceback.print_exc()
+        finally:
+            del self._running[name]
+            await self._arm(name, after_run=True)
+
+
+# Started by the SlothClass cog once the bot is ready
+expiry_scheduler = ExpiryScheduler()
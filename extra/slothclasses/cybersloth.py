@@ -337,7 +337,7 @@ class Cybersloth(Player):
             return
 
         if 'reflect' in effects:
-            attacker = await discord.utils.get(ctx.guild.members, id=hack[0])
+            attacker = ctx.guild.get_member(hack[0])
             await self.reflect_attack(ctx, attacker, target, 'hack')
         
         try:
@@ -1,6 +1,9 @@
 # import.thirdparty
 from discord.ext import commands
 
+# import.local
+from .player import target_effects_index
+
 class SlothClassDatabaseCommands(commands.Cog):
     """ A class for organizing the bot's table creation/drop/delete/check commands. """
 
@@ -45,6 +48,7 @@ class SlothClassDatabaseCommands(commands.Cog):
             return await ctx.send("**The `SlothSkills` table doesn't exist yet!**")
 
         await self.db.execute_query("DELETE FROM SlothSkills")
+        target_effects_index.clear()
         await ctx.send("**Reset `SlothSkills` table!**")
 
     async def table_sloth_skills_exists(self) -> bool:
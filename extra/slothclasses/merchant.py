@@ -7,10 +7,11 @@ from typing import Dict, List, Optional, Union
 # import.thirdparty
 import discord
 from discord.ext import commands, menus
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageOps
 
 # import.local
 from extra import utils
+from extra.assets import assets
 from extra.menu import ConfirmSkill, OpenShopLoop, prompt_number
 from extra.prompt.menu import Confirm, ConfirmButton
 from extra.view import UserPetView
@@ -779,7 +780,7 @@ class Merchant(Player):
             self.client.get_command('divorce').reset_cooldown(ctx)
             return await ctx.send(f"**This person is not married to you, {member.mention}!** 😔")
 
-        partner = discord.utils.get(ctx.guild.members, id=member_marriage['partner'])
+        partner = ctx.guild.get_member(member_marriage['partner'])
         partner = discord.Object(id=member_marriage['partner']) if not partner else partner
 
         # Checks the member's money
@@ -861,7 +862,7 @@ class Merchant(Player):
 
         filename = f"marriage_{p1.id}_{p2.id}.png"
 
-        medium = ImageFont.truetype("built titling sb.ttf", 60)
+        medium = assets.get_font("built titling sb.ttf", 60)
         SlothCurrency = self.client.get_cog('SlothCurrency')
         background = Image.open(await SlothCurrency.get_user_specific_type_item(p1.id, 'background'))
 
@@ -1119,7 +1120,7 @@ class Merchant(Player):
 
         # Makes the Pet's Image
 
-        small = ImageFont.truetype("built titling sb.ttf", 45)
+        small = assets.get_font("built titling sb.ttf", 45)
         background = Image.open(f"./sloth_custom_images/background/base_pet_background.png")
         hud = Image.open(f"./sloth_custom_images/hud/base_pet_hud.png")
         breed = Image.open(f"./sloth_custom_images/pet/{user_pet[2].lower()}.png")
@@ -1210,7 +1211,7 @@ class Merchant(Player):
         """ Makes an embed for the pet's death.
         :param pet: The data from the dead pet. """
     
-        medium = ImageFont.truetype("built titling sb.ttf", 60)
+        medium = assets.get_font("built titling sb.ttf", 60)
         background = Image.open(f"./sloth_custom_images/background/base_pet_background.png")
         breed = Image.open(f"./sloth_custom_images/pet/{pet[2].lower()}.png")
 
@@ -14,7 +14,7 @@ from extra.menu import ConfirmSkill, SwitchTribePages
 from extra.prompt.menu import Confirm
 from mysqldb import DatabaseCore
 from .enums import QuestEnum
-from .player import Player, Skill
+from .player import Player, Skill, target_effects_index
 
 # variables.textchannel
 bots_and_commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
@@ -703,7 +703,7 @@ class Munk(Player):
             try:
                 # Removes skill action from the database
                 await self.delete_skill_action_by_target_id_and_skill_type(target_id=creation[0], skill_type='tribe_creation')
-                member = discord.utils.get(guild.members, id=creation[0])
+                member = guild.get_member(creation[0])
                 try:
                     await self.update_tribe_name(member=member, two_emojis=creation[6], joining=True)
                 except:
@@ -1481,6 +1481,7 @@ class Munk(Player):
         await self.db.execute_query("""
             UPDATE SlothSkills SET target_id = %s, edited_timestamp = %s 
             WHERE user_id = %s AND skill_type = %s""", (target_id, current_ts, user_id, skill_type))
+        target_effects_index.clear()
 
     async def update_sloth_skill_user_and_target_id(self, user_id: int, target_id: int, current_ts: int, skill_type: str) -> None:
         """ Updates the skill's user and target id.
@@ -1492,6 +1493,7 @@ class Munk(Player):
         await self.db.execute_query("""
             UPDATE SlothSkills SET user_id = %s, target_id = %s, edited_timestamp = %s 
             WHERE user_id = %s AND skill_type = %s""", (target_id, target_id, current_ts, user_id, skill_type))
+        target_effects_index.clear()
 
     async def update_sloth_skill_user_and_target_id_and_int_content(self, user_id: int, target_id: int, int_content: int, current_ts: int, skill_type: str) -> None:
         """ Updates the skill's user and target id.
@@ -1504,6 +1506,7 @@ class Munk(Player):
         await self.db.execute_query("""
             UPDATE SlothSkills SET user_id = %s, target_id = %s, int_content = %s, edited_timestamp = %s 
             WHERE user_id = %s AND skill_type = %s""", (target_id, target_id, int_content, current_ts, user_id, skill_type))
+        target_effects_index.clear()
 
     @tribe.command(aliases=["transferquest", "tq"])
     @commands.cooldown(1, 5, commands.BucketType.user)
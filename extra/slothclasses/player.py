@@ -1,9 +1,10 @@
 # import.standard
+import asyncio
 import os
 from datetime import datetime
 from enum import Enum
 from random import choice, random
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 # import.thirdparty
 import discord
@@ -12,10 +13,12 @@ from pytz import timezone
 
 # import.local
 from extra import utils
+from extra.cache import TTLCache
 from extra.customerrors import (ActionSkillOnCooldown, ActionSkillsLocked,
                                 CommandNotReady, KidnappedCommandError,
                                 MissingRequiredSlothClass,
                                 PoisonedCommandError, SkillsUsedRequirement)
+from extra.scheduler import expiry_scheduler
 from mysqldb import DatabaseCore
 from .userbabies import UserBabiesTable
 from .userpets import UserPetsTable
@@ -28,6 +31,35 @@ additional_cogs: List[commands.Cog] = [
     UserPetsTable, UserBabiesTable, UserMarriagesTable
 ]
 
+# The skill type, effect name, whether it's animated, whether it's a debuff and the fixed cooldown text of each effect,
+# in the order they're shown. A skill type of None is the Munk effect, which comes from the nickname.
+effect_specs: List[Tuple[Optional[str], str, bool, bool, Optional[str]]] = [
+    ('divine_protection', 'protected', True, False, None),
+    ('transmutation', 'transmutated', True, False, None),
+    ('hack', 'hacked', False, True, None),
+    ('wire', 'wired', False, True, None),
+    ('hit', 'knocked_out', False, True, None),
+    ('frog', 'frogged', False, True, None),
+    (None, 'munk', False, True, "Endless"),
+    ('reflect', 'reflect', False, False, None),
+    ('sabotage', 'sabotaged', False, True, None),
+    ('lock', 'locked', False, True, "Ends when completing a Quest"),
+    ('poison', 'poisoned', False, True, None),
+    ('kidnap', 'kidnapped', False, True, "Ends when rescue is paid"),
+]
+effect_skill_types: Tuple[str, ...] = tuple(spec[0] for spec in effect_specs if spec[0])
+
+# How many seconds each expirable skill action lasts, which is when its expiry handler is due
+skill_durations: Dict[str, int] = {
+    'reflect': 86400, 'steal': 2400, 'divine_protection': 86400, 'transmutation': 86400,
+    'potion': 86400, 'ring': 36000, 'pet_egg': 432000, 'hack': 86400, 'hit': 86400,
+    'wire': 86400, 'tribe_creation': 0, 'frog': 86400, 'sabotage': 86400, 'poison': 86400,
+}
+
+# The active effect skill actions of each target, as {target_id: {skill_type: skill_timestamp}},
+# kept up to date by the methods that write to the SlothSkills table
+target_effects_index = TTLCache(max_size=5000, ttl=300)
+
 class Skill(Enum):
 
     ONE = 'skill_one_ts'
@@ -36,6 +68,71 @@ class Skill(Enum):
     FOUR = 'skill_four_ts'
     FIVE = 'skill_five_ts'
 
+class PlayerContext:
+    """ What the checks need to know about a command's author, loaded once per invocation. """
+
+    def __init__(self, sloth_profile: Optional[List[Union[str, int]]], effects: Dict[str, int], skills_cooldown: Optional[List[int]]) -> None:
+        """ Class init method.
+        :param sloth_profile: The author's SlothProfile row, if they have one.
+        :param effects: The author's active effect skill actions, as {skill_type: skill_timestamp}.
+        :param skills_cooldown: The author's SkillsCooldown row, without the user ID, if they have one. """
+
+        self.sloth_profile = sloth_profile
+        self.effects = effects
+        self.skills_cooldown = skills_cooldown
+
+    @property
+    def sloth_class(self) -> Optional[str]:
+        """ The author's Sloth Class. """
+
+        return self.sloth_profile[1] if self.sloth_profile else None
+
+    def get_skill_ts(self, skill: Skill) -> Tuple[Optional[int], bool]:
+        """ Gets the author's last timestamp of an action skill, and whether they have cooldowns at all.
+        :param skill: The action skill. """
+
+        if not self.skills_cooldown:
+            return None, False
+        return self.skills_cooldown[list(Skill).index(skill)], True
+
+async def get_player_context(ctx) -> PlayerContext:
+    """ Gets the author's player context, loading it the first time a Sloth Class or cooldown check asks for it.
+    The profile, effects and cooldowns are fetched concurrently, and attached to the context
+    in ctx.player_contexts, so the other checks and the command itself can read them.
+    :param ctx: The context of the command. """
+
+    # Keyed by the author, since some commands run other commands' checks for another member
+    if (player_contexts := getattr(ctx, 'player_contexts', None)) is None:
+        player_contexts = ctx.player_contexts = {}
+
+    user_id = ctx.author.id
+    if (loading := player_contexts.get(user_id)) is None:
+        SlothClass = ctx.bot.get_cog("SlothClass")
+
+        async def load() -> PlayerContext:
+            sloth_profile, effects, skills_cooldown = await asyncio.gather(
+                SlothClass.get_sloth_profile(user_id),
+                target_effects_index.get(user_id, lambda: SlothClass.load_user_effects(user_id)),
+                SlothClass.get_user_skills_cooldown(user_id),
+            )
+            return PlayerContext(sloth_profile, effects, skills_cooldown)
+
+        loading = player_contexts[user_id] = asyncio.ensure_future(load())
+
+    return await loading
+
+async def get_player_effects(ctx) -> Dict[str, int]:
+    """ Gets the author's active effect skill actions, for the checks that need nothing else.
+    Reuses the player context if a check already loaded it, and otherwise only reads the effects index.
+    :param ctx: The context of the command. """
+
+    user_id = ctx.author.id
+    if (loading := getattr(ctx, 'player_contexts', {}).get(user_id)) is not None:
+        return (await loading).effects
+
+    SlothClass = ctx.bot.get_cog("SlothClass")
+    return await target_effects_index.get(user_id, lambda: SlothClass.load_user_effects(user_id))
+
 class Player(*additional_cogs):
 
     def __init__(self, client) -> None:
@@ -51,17 +148,10 @@ class Player(*additional_cogs):
         """ Checks whether the user has the required Sloth Class to run the command.
         :param command_class: The Sloth Class required to run that command. """
 
-        async def get_user_sloth_class(user_id: int) -> Union[str, bool]:
-            """ Gets the user Sloth Class from the database.
-            :param user_id: The ID of the user to get the Sloth Class. """
-
-            user_sloth_class = await DatabaseCore().execute_query("SELECT sloth_class FROM SlothProfile WHERE user_id = %s", (user_id,), fetch="one")
-            return None if not user_sloth_class else user_sloth_class[0]
-
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            user_sloth_class = await get_user_sloth_class(ctx.author.id)
+            user_sloth_class = (await get_player_context(ctx)).sloth_class
             if user_sloth_class and user_sloth_class.lower() == command_class:
                 return True
             raise MissingRequiredSlothClass(
@@ -74,7 +164,7 @@ class Player(*additional_cogs):
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            skill_ts, exists = await ctx.bot.get_cog("SlothClass").get_user_action_skill_ts(user_id=ctx.author.id, skill_field=skill.value)
+            skill_ts, exists = (await get_player_context(ctx)).get_skill_ts(skill)
             if not skill_ts:
                 return True, exists
 
@@ -98,7 +188,7 @@ class Player(*additional_cogs):
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            locked = await ctx.bot.get_cog("SlothClass").get_skill_action_by_target_id_and_skill_type(target_id=ctx.author.id, skill_type='lock')
+            locked = 'lock' in await get_player_effects(ctx)
             if not locked:
                 return True
 
@@ -129,7 +219,7 @@ class Player(*additional_cogs):
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            sloth_profile = await ctx.bot.get_cog("SlothClass").get_sloth_profile(user_id=ctx.author.id)
+            sloth_profile = (await get_player_context(ctx)).sloth_profile
 
             if sloth_profile[2] >= requirement:
                 return True
@@ -156,7 +246,7 @@ class Player(*additional_cogs):
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            poisoned = await ctx.bot.get_cog("SlothClass").get_skill_action_by_target_id_and_skill_type(target_id=ctx.author.id, skill_type='poison')
+            poisoned = 'poison' in await get_player_effects(ctx)
             if not poisoned:
                 return True
 
@@ -207,7 +297,7 @@ class Player(*additional_cogs):
         async def real_check(ctx):
             """ Perfoms the real check. """
 
-            kidnapped = await ctx.bot.get_cog("SlothClass").get_skill_action_by_target_id_and_skill_type(target_id=ctx.author.id, skill_type='kidnap')
+            kidnapped = 'kidnap' in await get_player_effects(ctx)
             if not kidnapped:
                 return True
 
@@ -227,110 +317,41 @@ class Player(*additional_cogs):
     async def get_user_effects(self, member: Union[discord.User, discord.Member]) -> List[str]:
         """ Gets the effects that the user is under. """
 
+        skill_actions = await target_effects_index.get(member.id, lambda: self.load_user_effects(member.id))
         effects = {}
         general_cooldown = 86400 # Worth a day in seconds
 
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='divine_protection'):
-            effects['protected'] = {}
-    
-            effects['protected']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['protected']['frames'] = []
-            effects['protected']['cords'] = (0, 0)
-            effects['protected']['resize'] = None
-            effects['protected']['has_gif'] = True
-            effects['protected']['debuff'] = False
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='transmutation'):
-            effects['transmutated'] = {}
-            effects['transmutated']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['transmutated']['frames'] = []
-            effects['transmutated']['cords'] = (0, 0)
-            effects['transmutated']['resize'] = None
-            effects['transmutated']['has_gif'] = True
-            effects['transmutated']['debuff'] = False
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='hack'):
-            effects['hacked'] = {}
-            effects['hacked']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['hacked']['frames'] = []
-            effects['hacked']['cords'] = (0, 0)
-            effects['hacked']['resize'] = None
-            effects['hacked']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='wire'):
-            effects['wired'] = {}
-            effects['wired']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['wired']['frames'] = []
-            effects['wired']['cords'] = (0, 0)
-            effects['wired']['resize'] = None
-            effects['wired']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='hit'):
-            effects['knocked_out'] = {}
-            effects['knocked_out']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['knocked_out']['frames'] = []
-            effects['knocked_out']['cords'] = (0, 0)
-            effects['knocked_out']['resize'] = None
-            effects['knocked_out']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='frog'):
-            effects['frogged'] = {}
-            effects['frogged']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['frogged']['frames'] = []
-            effects['frogged']['cords'] = (0, 0)
-            effects['frogged']['resize'] = None
-            effects['frogged']['debuff'] = True
-
-        if 'Munk' in member.display_name:
-            effects['munk'] = {}
-            effects['munk']['cooldown'] = "Endless"
-            effects['munk']['frames'] = []
-            effects['munk']['cords'] = (0, 0)
-            effects['munk']['resize'] = None
-            effects['munk']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='reflect'):
-            effects['reflect'] = {}
-            effects['reflect']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['reflect']['frames'] = []
-            effects['reflect']['cords'] = (0, 0)
-            effects['reflect']['resize'] = None
-            effects['reflect']['debuff'] = False
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='sabotage'):
-            effects['sabotaged'] = {}
-            effects['sabotaged']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['sabotaged']['frames'] = []
-            effects['sabotaged']['cords'] = (0, 0)
-            effects['sabotaged']['resize'] = None
-            effects['sabotaged']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='lock'):
-            effects['locked'] = {}
-            effects['locked']['cooldown'] = "Ends when completing a Quest"
-            effects['locked']['frames'] = []
-            effects['locked']['cords'] = (0, 0)
-            effects['locked']['resize'] = None
-            effects['locked']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='poison'):
-            effects['poisoned'] = {}
-            effects['poisoned']['cooldown'] = f"Ends <t:{int(then[2]) + general_cooldown}:R>" if then else 'Ends in ??'
-            effects['poisoned']['frames'] = []
-            effects['poisoned']['cords'] = (0, 0)
-            effects['poisoned']['resize'] = None
-            effects['poisoned']['debuff'] = True
-
-        if then := await self.get_skill_action_by_target_id_and_skill_type(target_id=member.id, skill_type='kidnap'):
-            effects['kidnapped'] = {}
-            effects['kidnapped']['cooldown'] = f"Ends when rescue is paid"
-            effects['kidnapped']['frames'] = []
-            effects['kidnapped']['cords'] = (0, 0)
-            effects['kidnapped']['resize'] = None
-            effects['kidnapped']['debuff'] = True
+        for skill_type, effect, has_gif, debuff, cooldown in effect_specs:
+            if skill_type is None:
+                if 'Munk' not in member.display_name:
+                    continue
+            elif skill_type not in skill_actions:
+                continue
+
+            effects[effect] = {}
+            effects[effect]['cooldown'] = cooldown or f"Ends <t:{int(skill_actions[skill_type]) + general_cooldown}:R>"
+            effects[effect]['frames'] = []
+            effects[effect]['cords'] = (0, 0)
+            effects[effect]['resize'] = None
+            if has_gif:
+                effects[effect]['has_gif'] = True
+            effects[effect]['debuff'] = debuff
 
         return effects
 
+    async def load_user_effects(self, target_id: int) -> Dict[str, int]:
+        """ Loads all active effect skill actions of a target from the database, in a single query.
+        :param target_id: The ID of the target. """
+
+        skill_actions = await self.db.execute_query("""
+            SELECT skill_type, skill_timestamp FROM SlothSkills
+            WHERE target_id = %s AND skill_type IN %s""", (target_id, effect_skill_types), fetch="all")
+
+        effects = {}
+        for skill_type, skill_timestamp in skill_actions:
+            effects.setdefault(skill_type, skill_timestamp)
+        return effects
+
     async def get_sloth_class_skills(self, sloth_class: str) -> List[commands.Command]:
         """ Gets all skills for a given Sloth Class.
         :param sloth_class: The name of the Sloth Class. """
@@ -362,6 +383,10 @@ class Player(*additional_cogs):
         await self.db.execute_query("""
             INSERT INTO SlothSkills (user_id, skill_type, skill_timestamp, target_id, message_id, channel_id, emoji, price, content)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""", (user_id, skill_type, skill_timestamp, target_id, message_id, channel_id, emoji, price, content))
+        if skill_type in effect_skill_types:
+            target_effects_index.update(target_id, lambda effects: {skill_type: skill_timestamp, **effects})
+        if skill_type in skill_durations:
+            expiry_scheduler.schedule(skill_type, skill_timestamp + skill_durations[skill_type])
 
     # ========== GET ========== #
 
@@ -432,6 +457,17 @@ class Player(*additional_cogs):
 
         return await self.db.execute_query("SELECT * FROM SlothSkills WHERE message_id = %s AND target_id = %s", (message_id, target_id), fetch="one")
 
+    async def get_next_skill_action_expiration(self, skill_type: str) -> Optional[int]:
+        """ Gets the timestamp at which the next skill action of a type expires.
+        :param skill_type: The skill type of the skill actions. """
+
+        skill_timestamp = await self.db.execute_query(
+            "SELECT MIN(skill_timestamp) FROM SlothSkills WHERE skill_type = %s", (skill_type,), fetch="one")
+        if not skill_timestamp or skill_timestamp[0] is None:
+            return None
+
+        return skill_timestamp[0] + skill_durations[skill_type]
+
     async def get_user_action_skill_ts(self, user_id: int, skill_field: str) -> List[Union[str, bool]]:
         """ Gets the user's last action skill timestamp from the database.
         :param user_id: The ID of the user to get the action skill timestamp.
@@ -445,6 +481,13 @@ class Player(*additional_cogs):
         else:
             return None, False
 
+    async def get_user_skills_cooldown(self, user_id: int) -> Optional[List[int]]:
+        """ Gets all the user's last action skill timestamps from the database.
+        :param user_id: The ID of the user to get the action skill timestamps. """
+
+        return await self.db.execute_query(
+            "SELECT " + ", ".join(skill.value for skill in Skill) + " FROM SkillsCooldown WHERE user_id = %s", (user_id,), fetch="one")
+
     async def get_timestamp(self) -> int:
         """ Gets the current timestamp. """
 
@@ -573,12 +616,15 @@ class Player(*additional_cogs):
         :param message_id: The ID of the skill action. """
 
         await self.db.execute_query("DELETE FROM SlothSkills WHERE message_id = %s", (message_id,))
+        # The target isn't known here
+        target_effects_index.clear()
 
     async def delete_skill_action_by_target_id(self, target_id: int) -> None:
         """ Deletes a skill action by target ID.
         :param target_id: The ID of the target member. """
 
         await self.db.execute_query("DELETE FROM SlothSkills WHERE target_id = %s", (target_id,))
+        target_effects_index.update(target_id, lambda effects: {})
 
     async def delete_debuff_skill_action_by_target_id(self, target_id: int) -> None:
         """ Deletes debuff skill actions by target ID.
@@ -587,6 +633,10 @@ class Player(*additional_cogs):
         await self.db.execute_query("""
         DELETE FROM SlothSkills WHERE target_id = %s AND skill_type IN ('hack', 'wire', 'frog', 'hit', 'sabotage')
         """, (target_id,))
+        target_effects_index.update(target_id, lambda effects: {
+            skill_type: skill_timestamp for skill_type, skill_timestamp in effects.items()
+            if skill_type not in ('hack', 'wire', 'frog', 'hit', 'sabotage')
+        })
 
     async def delete_skill_action_by_target_id_and_skill_type(self, target_id: int, skill_type: str, multiple: bool = False) -> None:
         """ Deletes a skill action by target ID.
@@ -595,6 +645,8 @@ class Player(*additional_cogs):
 
         sql = "DELETE FROM SlothSkills WHERE target_id = %s AND skill_type = %s" + "LIMIT 1" if not multiple else ""
         await self.db.execute_query(sql, (target_id, skill_type))
+        # Another action of the same type might be left, so it's reloaded
+        target_effects_index.invalidate(target_id)
 
     async def delete_skill_action_by_user_id_and_skill_type(self, user_id: int, skill_type: str, multiple: bool = False) -> None:
         """ Deletes a skill action by user ID.
@@ -603,6 +655,9 @@ class Player(*additional_cogs):
 
         sql = "DELETE FROM SlothSkills WHERE user_id = %s AND skill_type = %s" + "LIMIT 1" if not multiple else ""
         await self.db.execute_query(sql, (user_id, skill_type))
+        # The targets aren't known here
+        if skill_type in effect_skill_types:
+            target_effects_index.clear()
 
     async def delete_skill_actions_by_target_id_and_skill_type(self, users: List[Tuple[int, str]]) -> None:
         """ Deletes a skill action by user ID.
@@ -611,6 +666,10 @@ class Player(*additional_cogs):
 
         sql = "DELETE FROM SlothSkills WHERE target_id = %s AND skill_type = %s"
         await self.db.execute_query(sql, users, execute_many=True)
+        for target_id, skill_type in users:
+            target_effects_index.update(target_id, lambda effects, skill_type=skill_type: {
+                key: value for key, value in effects.items() if key != skill_type
+            })
 
     async def delete_skill_action_by_user_id_or_target_id_and_skill_type_and_price(self, user_id: int, skill_type: str, price: str, multiple: bool = False) -> None:
         """ Deletes a skill action by user_id or target ID and skill type and price.
@@ -621,6 +680,8 @@ class Player(*additional_cogs):
 
         sql = "DELETE FROM SlothSkills WHERE (user_id = %s OR target_id = %s) AND skill_type = %s AND price = %s" + "LIMIT 1" if not multiple else ""
         await self.db.execute_query(sql, (user_id, user_id, skill_type, price))
+        if skill_type in effect_skill_types:
+            target_effects_index.clear()
 
     # ========== UPDATE ========== #
     async def update_user_skills_used(self, user_id: int, addition: int = 1) -> None:
@@ -7,14 +7,15 @@ from typing import List, Optional, Union
 # import.thirdparty
 import discord
 from discord.ext import commands
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageOps
 
 # import.local
 from extra import utils
+from extra.assets import assets
 from extra.prompt.menu import Confirm, ConfirmButton
 from extra.view import UserBabyView
 from mysqldb import DatabaseCore
-from .player import Player, Skill
+from .player import Player, Skill, target_effects_index
 
 # variables.textchannel
 bots_and_commands_channel_id = int(os.getenv('BOTS_AND_COMMANDS_CHANNEL_ID', 123))
@@ -218,6 +219,7 @@ class Seraph(Player):
         await self.db.execute_query("""
             UPDATE SlothSkills SET skill_timestamp = skill_timestamp + %s WHERE user_id = %s
             AND skill_type = 'divine_protection'""", (increment, perpetrator_id))
+        target_effects_index.clear()
 
     async def reinforce_shield(self, user_id: int, increment: Optional[int] = 86400) -> None:
         """ Reinforces a specific active Divine Protection shield.
@@ -227,6 +229,10 @@ class Seraph(Player):
         await self.db.execute_query("""
         UPDATE SlothSkills SET skill_timestamp = skill_timestamp + %s WHERE target_id = %s
         AND skill_type = 'divine_protection'""", (increment, user_id))
+        target_effects_index.update(user_id, lambda effects: {
+            skill_type: skill_timestamp + increment if skill_type == 'divine_protection' else skill_timestamp
+            for skill_type, skill_timestamp in effects.items()
+        })
 
     async def get_expired_protections(self) -> None:
         """ Gets expired divine protection skill actions. """
@@ -680,7 +686,7 @@ class Seraph(Player):
 
         # Makes the Baby's Image
 
-        small = ImageFont.truetype("built titling sb.ttf", 45)
+        small = assets.get_font("built titling sb.ttf", 45)
         background = Image.open(f"./sloth_custom_images/background/base_baby_background.png")
         hud = Image.open(f"./sloth_custom_images/hud/base_baby_hud.png")
         baby_class = Image.open(f"./sloth_custom_images/sloth/{user_baby[3].title()}.png").resize((470, 350))
@@ -748,7 +754,7 @@ class Seraph(Player):
         """ Makes an embed for the baby's death.
         :param baby: The data from the dead baby. """
     
-        medium = ImageFont.truetype("built titling sb.ttf", 60)
+        medium = assets.get_font("built titling sb.ttf", 60)
         background = Image.open(f"./sloth_custom_images/background/base_baby_background.png")
         baby_class = Image.open(f"./sloth_custom_images/sloth/{baby[3].lower()}.png").resize((470, 350))
 
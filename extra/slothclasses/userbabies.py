@@ -114,6 +114,12 @@ class UserBabiesTable(commands.Cog):
 
         return await self.db.execute_query("SELECT * FROM UserBabies WHERE %s - food_ts >= 7200", (current_ts,), fetch="all")
 
+    async def get_next_hungry_baby_ts(self) -> Optional[int]:
+        """ Gets the timestamp at which the next baby gets hungry, skipping embryos. """
+
+        food_ts = await self.db.execute_query("SELECT MIN(food_ts) FROM UserBabies WHERE LOWER(baby_class) <> 'embryo'", fetch="one")
+        return food_ts[0] + 7200 if food_ts and food_ts[0] is not None else None
+
     async def update_user_baby_name(self, parent_id: int, baby_name: str) -> None:
         """ Updates the User Baby's name.
         :param parent_id: The ID of one of the baby's parents.
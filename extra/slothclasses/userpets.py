@@ -111,6 +111,12 @@ class UserPetsTable(commands.Cog):
 
         return await self.db.execute_query("SELECT * FROM UserPets WHERE %s - food_ts >= 7200", (current_ts,), fetch="all")
 
+    async def get_next_hungry_pet_ts(self) -> Optional[int]:
+        """ Gets the timestamp at which the next pet gets hungry, skipping eggs. """
+
+        food_ts = await self.db.execute_query("SELECT MIN(food_ts) FROM UserPets WHERE LOWER(pet_breed) <> 'egg'", fetch="one")
+        return food_ts[0] + 7200 if food_ts and food_ts[0] is not None else None
+
     async def update_user_pet_name(self, user_id: int, pet_name: str) -> None:
         """ Updates the User Pet's name.
         :param user_id: The ID of the pet's owner.
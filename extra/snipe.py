@@ -0,0 +1,114 @@
+# import.standard
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+# import.thirdparty
+import discord
+
+class DeletedMessage:
+    """ A deleted message, as kept for the snipe command. """
+
+    __slots__ = ('author_id', 'content', 'time', 'channel', 'alive')
+
+    def __init__(self, author_id: int, content: str, time: float, channel: discord.abc.Messageable) -> None:
+        self.author_id = author_id
+        self.content = content
+        self.time = time
+        self.channel = channel
+        self.alive = True
+
+
+class DeletedMessageStore:
+    """ A fixed-capacity ring buffer of deleted messages, in the order they were deleted,
+    indexed by author and channel so sniping k messages costs O(k). """
+
+    def __init__(self, capacity: int = 1000, per_channel: Optional[int] = None) -> None:
+        """ Class init method.
+        :param capacity: The maximum amount of messages to keep.
+        :param per_channel: The maximum amount of messages to keep from a single channel. [Optional] """
+
+        self.capacity = capacity
+        self.per_channel = per_channel
+        self._messages: Deque[DeletedMessage] = deque(maxlen=capacity)
+        self._by_author: Dict[int, Deque[DeletedMessage]] = {}
+        self._by_channel: Dict[int, Deque[DeletedMessage]] = {}
+        self._alive: int = 0
+
+    def __len__(self) -> int:
+        return self._alive
+
+    def add(self, message: discord.Message) -> None:
+        """ Stores a deleted message, dropping the oldest one if full.
+        :param message: The deleted message. """
+
+        if len(self._messages) == self.capacity:
+            self._evict(self._messages[0])
+
+        entry = DeletedMessage(message.author.id, message.content, message.created_at.timestamp(), message.channel)
+        self._messages.append(entry)
+        self._by_author.setdefault(entry.author_id, deque()).append(entry)
+        self._alive += 1
+
+        if self.per_channel:
+            channel_messages = self._by_channel.setdefault(entry.channel.id, deque())
+            channel_messages.append(entry)
+            # Messages past the channel's limit are only marked, they leave the buffer when it wraps around
+            if len(channel_messages) > self.per_channel:
+                channel_messages.popleft().alive = False
+                self._alive -= 1
+
+    def latest(self, quantity: int = 1) -> List[DeletedMessage]:
+        """ Gets the most recently deleted messages, oldest first.
+        :param quantity: The amount of messages to get. """
+
+        return self._take(self._messages, quantity)
+
+    def by_author(self, author_id: int, quantity: Optional[int] = None) -> List[DeletedMessage]:
+        """ Gets a member's most recently deleted messages, oldest first.
+        :param author_id: The ID of the member.
+        :param quantity: The amount of messages to get. [Optional] """
+
+        messages = self._by_author.get(author_id, ())
+        return self._take(messages, quantity or len(messages))
+
+    def clear(self) -> None:
+        """ Drops every deleted message. """
+
+        self._messages.clear()
+        self._by_author.clear()
+        self._by_channel.clear()
+        self._alive = 0
+
+    @staticmethod
+    def _take(messages: Deque[DeletedMessage], quantity: int) -> List[DeletedMessage]:
+        """ Gets the newest live messages of a sequence, oldest first. """
+
+        taken = []
+        for entry in reversed(messages):
+            if len(taken) >= quantity:
+                break
+            if entry.alive:
+                taken.append(entry)
+
+        return sorted(taken, key=lambda entry: entry.time)
+
+    def _evict(self, entry: DeletedMessage) -> None:
+        """ Drops the oldest message of the buffer from the indexes. """
+
+        if entry.alive:
+            self._alive -= 1
+
+        # Being the oldest message, it can only be at the left end of its indexes
+        for index, key in ((self._by_author, entry.author_id), (self._by_channel, entry.channel.id)):
+            if (messages := index.get(key)) and messages[0] is entry:
+                messages.popleft()
+            if messages is not None and not messages:
+                del index[key]
+
+
+# SNIPE_MAX_PER_CHANNEL=0 leaves channels without a limit of their own
+deleted_messages = DeletedMessageStore(
+    capacity=int(os.getenv('SNIPE_MAX_MESSAGES', 1000)),
+    per_channel=int(os.getenv('SNIPE_MAX_PER_CHANNEL', 0)) or None,
+)
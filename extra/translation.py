@@ -0,0 +1,108 @@
+# import.standard
+import asyncio
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Type
+
+# import.thirdparty
+from googletrans import Translator
+
+# import.local
+from extra.cache import SingleFlight, TTLCache
+
+class TranslationResult:
+    """ A translated text. """
+
+    __slots__ = ('src', 'dest', 'text')
+
+    def __init__(self, src: str, dest: str, text: str) -> None:
+        self.src = src
+        self.dest = dest
+        self.text = text
+
+
+class TranslationBackend(ABC):
+    """ Translates texts. Backends run in a thread pool, so they may block. """
+
+    name: str = 'base'
+
+    @abstractmethod
+    def translate(self, text: str, dest: str) -> TranslationResult:
+        """ Translates a text, raising ValueError if the language isn't supported.
+        :param text: The text to translate.
+        :param dest: The language to translate the text to. """
+
+
+class GoogleTranslateBackend(TranslationBackend):
+    """ Translates through Google Translate, with one client per worker thread. """
+
+    name = 'google'
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def translate(self, text: str, dest: str) -> TranslationResult:
+        """ Translates a text, raising ValueError if the language isn't supported.
+        :param text: The text to translate.
+        :param dest: The language to translate the text to. """
+
+        if (translator := getattr(self._local, 'translator', None)) is None:
+            translator = self._local.translator = Translator(service_urls=['translate.googleapis.com'])
+
+        translation = translator.translate(text, dest=dest)
+        return TranslationResult(translation.src, translation.dest, translation.text)
+
+
+class EchoBackend(TranslationBackend):
+    """ Gives texts back as they are, for trying the translate commands without reaching Google. """
+
+    name = 'echo'
+
+    def translate(self, text: str, dest: str) -> TranslationResult:
+        """ Gives the text back untranslated.
+        :param text: The text to translate.
+        :param dest: The language to translate the text to. """
+
+        return TranslationResult('auto', dest, text)
+
+
+translation_backends: Dict[str, Type[TranslationBackend]] = {
+    GoogleTranslateBackend.name: GoogleTranslateBackend,
+    EchoBackend.name: EchoBackend,
+}
+
+class TranslationService:
+    """ Translates texts in a thread pool with bounded concurrency, caching the results by text and language.
+    Requests for a translation that's already running wait for it instead of translating it again. """
+
+    def __init__(self, backend: TranslationBackend, max_size: int = 2000, ttl: float = 86400, max_workers: int = 4) -> None:
+        """ Class init method.
+        :param backend: The backend that translates the texts.
+        :param max_size: The maximum amount of translations to keep.
+        :param ttl: The amount of seconds a translation is kept.
+        :param max_workers: The amount of texts that can be translated at the same time. """
+
+        self.backend = backend
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+        self._translating = SingleFlight()
+
+    async def translate(self, text: str, dest: str) -> TranslationResult:
+        """ Translates a text, raising ValueError if the language isn't supported.
+        :param text: The text to translate.
+        :param dest: The language to translate the text to. """
+
+        key = (text, dest.lower())
+        loop = asyncio.get_running_loop()
+        return await self.cache.get(key, lambda: self._translating.run(
+            key, lambda: loop.run_in_executor(self._executor, self.backend.translate, text, dest)))
+
+
+translator = TranslationService(
+    backend=translation_backends[os.getenv('TRANSLATION_BACKEND', GoogleTranslateBackend.name)](),
+    max_size=int(os.getenv('TRANSLATION_CACHE_SIZE', 2000)),
+    ttl=int(os.getenv('TRANSLATION_CACHE_TTL', 86400)),
+    max_workers=int(os.getenv('TRANSLATION_WORKERS', 4)),
+)
@@ -0,0 +1,252 @@
+# import.standard
+import asyncio
+import hashlib
+import os
+import wave
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Deque, Dict, Optional, Type
+
+# import.thirdparty
+import discord
+import gtts
+
+# import.local
+from extra.cache import SingleFlight
+
+class TTSBackend(ABC):
+    """ Turns text into speech. Backends run in a thread pool, so they may block. """
+
+    name: str = 'base'
+    extension: str = 'mp3'
+
+    @abstractmethod
+    def synthesize(self, text: str, language: str) -> bytes:
+        """ Synthesizes a text into an audio clip.
+        :param text: The text to speak.
+        :param language: The language of the text. """
+
+
+class GTTSBackend(TTSBackend):
+    """ Speaks through Google Translate's text-to-speech. """
+
+    name = 'gtts'
+    extension = 'mp3'
+
+    def synthesize(self, text: str, language: str) -> bytes:
+        """ Synthesizes a text into an MP3 clip.
+        :param text: The text to speak.
+        :param language: The language of the text. """
+
+        with BytesIO() as clip:
+            gtts.gTTS(text=text, lang=language).write_to_fp(clip)
+            return clip.getvalue()
+
+
+class SilentBackend(TTSBackend):
+    """ Makes a silent clip about as long as the text would take to say, without any network access. """
+
+    name = 'silent'
+    extension = 'wav'
+
+    def synthesize(self, text: str, language: str) -> bytes:
+        """ Synthesizes a text into a silent WAV clip.
+        :param text: The text to speak.
+        :param language: The language of the text. """
+
+        rate = 8000
+        seconds = min(max(len(text) / 15, 0.5), 30)
+        with BytesIO() as clip:
+            with wave.open(clip, 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(1)
+                wav.setframerate(rate)
+                wav.writeframes(b'\x80' * int(rate * seconds))
+            return clip.getvalue()
+
+
+tts_backends: Dict[str, Type[TTSBackend]] = {
+    GTTSBackend.name: GTTSBackend,
+    SilentBackend.name: SilentBackend,
+}
+
+class SpeechSynthesizer:
+    """ Synthesizes speech in a thread pool, keeping the clips on disk under a byte budget.
+    Clips are named after a hash of their backend, language and text, so repeated phrases are synthesized only once. """
+
+    def __init__(self, backend: TTSBackend, directory: str = 'tts/cache', max_bytes: int = 64 * 1024 * 1024, max_workers: int = 2) -> None:
+        """ Class init method.
+        :param backend: The backend that synthesizes the clips.
+        :param directory: The folder to keep the clips in.
+        :param max_bytes: The maximum amount of clip bytes to keep.
+        :param max_workers: The amount of clips that can be synthesized at the same time. """
+
+        self.backend = backend
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.used_bytes: int = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+        # {path: size}, loaded from the directory on first use
+        self._clips: "Optional[OrderedDict[str, int]]" = None
+        self._synthesizing = SingleFlight()
+
+    def clip_path(self, language: str, text: str) -> str:
+        """ Gets the path a clip is kept at.
+        :param language: The language of the text.
+        :param text: The text of the clip. """
+
+        digest = hashlib.sha256(f"{self.backend.name}\0{language}\0{text}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.{self.backend.extension}")
+
+    async def get_clip(self, language: str, text: str) -> str:
+        """ Gets the path of a clip of the text, synthesizing it if it isn't cached.
+        Requests for a clip that's already being synthesized wait for it instead of synthesizing it again.
+        :param language: The language of the text.
+        :param text: The text to speak. """
+
+        clips = self._load_clips()
+        path = self.clip_path(language, text)
+        if path in clips and os.path.isfile(path):
+            clips.move_to_end(path)
+            return path
+
+        loop = asyncio.get_running_loop()
+        await self._synthesizing.run(path, lambda: loop.run_in_executor(self._executor, self._synthesize, path, text, language))
+        self._store(path)
+        return path
+
+    def _synthesize(self, path: str, text: str, language: str) -> str:
+        """ Synthesizes a clip and writes it to disk. (Runs in the thread pool) """
+
+        clip = self.backend.synthesize(text, language)
+        os.makedirs(self.directory, exist_ok=True)
+        # Written aside and moved in place, so a clip is never played half-written
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(clip)
+        os.replace(temporary_path, path)
+        return path
+
+    def _load_clips(self) -> "OrderedDict[str, int]":
+        """ Gets the index of the cached clips, reading the directory the first time. """
+
+        if self._clips is None:
+            self._clips = OrderedDict()
+            if os.path.isdir(self.directory):
+                paths = [entry.path for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.endswith('.tmp')]
+                for path in sorted(paths, key=os.path.getmtime):
+                    self._clips[path] = os.path.getsize(path)
+                    self.used_bytes += self._clips[path]
+            self._evict()
+        return self._clips
+
+    def _store(self, path: str) -> None:
+        """ Indexes a synthesized clip, evicting the least recently used ones if full. """
+
+        clips = self._load_clips()
+        if path in clips:
+            clips.move_to_end(path)
+            return
+
+        clips[path] = os.path.getsize(path)
+        self.used_bytes += clips[path]
+        self._evict()
+
+    def _evict(self) -> None:
+        """ Deletes the least recently used clips until the cache is within its budget. """
+
+        while self.used_bytes > self.max_bytes and len(self._clips) > 1:
+            path, size = self._clips.popitem(last=False)
+            self.used_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class GuildAudioQueue:
+    """ Plays audio clips in a guild's voice channel one after the other, instead of dropping them while something plays.
+    Clips only wait for the clips of the queue, other audio the bot is playing gets cut off like other sounds do. """
+
+    def __init__(self, max_size: int = 10) -> None:
+        """ Class init method.
+        :param max_size: The maximum amount of clips that can wait in a guild's queue. """
+
+        self.max_size = max_size
+        self._queues: Dict[int, Deque[str]] = {}
+        # The source of the clip each guild is playing from the queue
+        self._playing: Dict[int, discord.AudioSource] = {}
+
+    def enqueue(self, voice_client: discord.VoiceClient, path: str) -> Optional[int]:
+        """ Queues a clip, playing it right away if no clip of the queue is playing.
+        Returns its position in the queue, 0 if it's playing, or None if the queue is full.
+        :param voice_client: The voice client of the guild.
+        :param path: The path of the clip. """
+
+        guild_id = voice_client.guild.id
+        queue = self._queues.setdefault(guild_id, deque())
+        if len(queue) >= self.max_size:
+            return None
+
+        queue.append(path)
+        if guild_id in self._playing and voice_client.is_playing():
+            return len(queue)
+
+        self._play_next(voice_client)
+        return len(self._queues.get(guild_id, ()))
+
+    def clear(self, guild_id: int) -> None:
+        """ Drops every clip waiting in a guild's queue.
+        :param guild_id: The ID of the guild. """
+
+        self._queues.pop(guild_id, None)
+        self._playing.pop(guild_id, None)
+
+    def _finished(self, voice_client: discord.VoiceClient, source: discord.AudioSource) -> None:
+        """ Moves on to the next clip once a clip of the queue is done playing. """
+
+        if self._playing.get(voice_client.guild.id) is source:
+            del self._playing[voice_client.guild.id]
+            self._play_next(voice_client)
+
+    def _play_next(self, voice_client: discord.VoiceClient) -> None:
+        """ Plays the next clip of a guild's queue, skipping clips that were evicted while waiting. """
+
+        guild_id = voice_client.guild.id
+        if not voice_client.is_connected():
+            return self.clear(guild_id)
+        if guild_id in self._playing and voice_client.is_playing():
+            return
+
+        self._playing.pop(guild_id, None)
+        queue = self._queues.get(guild_id)
+        while queue:
+            path = queue.popleft()
+            if not os.path.isfile(path):
+                continue
+
+            # Audio that didn't come from the queue has no after hook into it, so it's cut off instead of waited for
+            if voice_client.is_playing():
+                voice_client.stop()
+
+            loop = asyncio.get_running_loop()
+            source = self._playing[guild_id] = discord.FFmpegPCMAudio(path)
+            # The after callback runs in the voice thread, so the next clip is started back on the loop
+            voice_client.play(source, after=lambda _: loop.call_soon_threadsafe(self._finished, voice_client, source))
+            break
+
+        if queue is not None and not queue:
+            self._queues.pop(guild_id, None)
+
+
+# TTS_BACKEND=silent makes silent clips instead, so the command can be tried without reaching Google
+speech_synthesizer = SpeechSynthesizer(
+    backend=tts_backends[os.getenv('TTS_BACKEND', GTTSBackend.name)](),
+    directory=os.getenv('TTS_CACHE_DIR', 'tts/cache'),
+    max_bytes=int(os.getenv('TTS_CACHE_MAX_MB', 64)) * 1024 * 1024,
+    max_workers=int(os.getenv('TTS_WORKERS', 2)),
+)
+
+tts_queue = GuildAudioQueue(max_size=int(os.getenv('TTS_QUEUE_SIZE', 10)))
@@ -1,10 +1,12 @@
 # import.standard
+import asyncio
+import os
 import re
 import shlex
 from collections import OrderedDict
 from datetime import datetime
 from io import BytesIO
-from typing import Dict, Iterable, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 # import.thirdparty
 import aiohttp
@@ -15,11 +17,19 @@ from PIL import Image, ImageDraw
 from pytz import timezone
 
 # import.local
+from extra.cache import SingleFlight, TTLCache
 from extra.customerrors import CommandNotReady, NotSubscribed
 from extra import utils
 
 session = aiohttp.ClientSession()
 
+# Processed avatar thumbnails, keyed by avatar hash and width, so a changed avatar is a new key
+avatar_cache = TTLCache(max_size=int(os.getenv('AVATAR_CACHE_SIZE', 2000)), ttl=3600)
+# Optional on-disk tier that survives restarts
+avatar_cache_dir: Optional[str] = os.getenv('AVATAR_CACHE_DIR')
+# Downloads in progress, so concurrent requests for the same avatar share one fetch
+avatar_loads = SingleFlight()
+
 async def get_timestamp(tz: str = 'Etc/GMT') -> float:
     """ Gets the current timestamp.
     :param tz: The timezone to get the timstamp from. Default = Etc/GMT """
@@ -61,8 +71,9 @@ def is_allowed(roles: List[int], check_adm: Optional[bool] = True, throw_exc: Op
             if perms.administrator:
                 return True
                 
+        member_role_ids = {role.id for role in member.roles}
         for rid in roles:
-            if rid in [role.id for role in member.roles]:
+            if rid in member_role_ids:
                 return True
 
         if throw_exc:
@@ -217,6 +228,162 @@ async def sort_time(at: datetime) -> str:
     return ", ".join(strings[:2])
 
 
+class GuildLookup:
+    """ Name indexes of the guilds' members, roles and voice channels, kept current from gateway events.
+    Names match exactly, like discord.utils.get does, and the first object indexed under a name wins.
+    Lookups by ID go straight to the guild's own maps, with get_member, get_role and get_channel. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self.client: Optional[commands.Bot] = None
+        # {guild_id: {kind: {name: {id: None}}}}, built on a guild's first lookup, the ids in the order they were indexed
+        self._indexes: Dict[int, Dict[str, Dict[str, Dict[int, None]]]] = {}
+        # {guild_id: {id: ((kind, name), ...)}}, so an entry can be removed with the names it was indexed by
+        self._keys: Dict[int, Dict[int, Tuple[Tuple[str, str], ...]]] = {}
+
+    def setup(self, client: commands.Bot) -> None:
+        """ Keeps the indexes current from the client's gateway events.
+        :param client: The bot client. """
+
+        self.client = client
+        client.add_listener(self.on_member_join)
+        client.add_listener(self.on_member_remove)
+        client.add_listener(self.on_member_update)
+        client.add_listener(self.on_user_update)
+        client.add_listener(self.on_guild_role_create)
+        client.add_listener(self.on_guild_role_delete)
+        client.add_listener(self.on_guild_role_update)
+        client.add_listener(self.on_guild_channel_create)
+        client.add_listener(self.on_guild_channel_delete)
+        client.add_listener(self.on_guild_channel_update)
+        client.add_listener(self.on_guild_available)
+        client.add_listener(self.on_guild_remove)
+
+    def find_member(self, guild: discord.Guild, name: str) -> Optional[discord.Member]:
+        """ Finds a member by name, nickname or display name, in that order.
+        :param guild: The guild of the member.
+        :param name: The name to look for. """
+
+        index = self._get_index(guild)
+        for kind in ('name', 'nick', 'display_name'):
+            for member_id in index[kind].get(name, ()):
+                if member := guild.get_member(member_id):
+                    return member
+
+    def find_role(self, guild: discord.Guild, name: str) -> Optional[discord.Role]:
+        """ Finds a role by name.
+        :param guild: The guild of the role.
+        :param name: The name to look for. """
+
+        for role_id in self._get_index(guild)['role'].get(name, ()):
+            if role := guild.get_role(role_id):
+                return role
+
+    def find_voice_channel(self, guild: discord.Guild, name: str) -> Optional[discord.VoiceChannel]:
+        """ Finds a voice channel by name.
+        :param guild: The guild of the channel.
+        :param name: The name to look for. """
+
+        for channel_id in self._get_index(guild)['voice_channel'].get(name, ()):
+            if channel := guild.get_channel(channel_id):
+                return channel
+
+    def _get_index(self, guild: discord.Guild) -> Dict[str, Dict[str, Dict[int, None]]]:
+        """ Gets the indexes of a guild, building them from its cache if needed. """
+
+        if (index := self._indexes.get(guild.id)) is None:
+            index = self._indexes[guild.id] = {
+                'name': {}, 'nick': {}, 'display_name': {}, 'role': {}, 'voice_channel': {}}
+            self._keys[guild.id] = {}
+            for member in guild.members:
+                self._add_member(member)
+            for role in guild.roles:
+                self._add(guild.id, role.id, (('role', role.name),))
+            for channel in guild.voice_channels:
+                self._add(guild.id, channel.id, (('voice_channel', channel.name),))
+        return index
+
+    def _add(self, guild_id: int, object_id: int, keys: Tuple[Tuple[str, str], ...]) -> None:
+        """ Indexes an object by its names, replacing the names it was indexed by before. """
+
+        self._remove(guild_id, object_id)
+        index = self._indexes[guild_id]
+        for kind, name in keys:
+            index[kind].setdefault(name, {})[object_id] = None
+        self._keys[guild_id][object_id] = keys
+
+    def _remove(self, guild_id: int, object_id: int) -> None:
+        """ Removes an object from the indexes. """
+
+        index = self._indexes[guild_id]
+        for kind, name in self._keys[guild_id].pop(object_id, ()):
+            if ids := index[kind].get(name):
+                ids.pop(object_id, None)
+                if not ids:
+                    del index[kind][name]
+
+    def _add_member(self, member: discord.Member) -> None:
+        """ Indexes a member by name, nickname and display name. """
+
+        keys = [('name', member.name), ('display_name', member.display_name)]
+        if member.nick:
+            keys.append(('nick', member.nick))
+        self._add(member.guild.id, member.id, tuple(keys))
+
+    async def on_member_join(self, member: discord.Member) -> None:
+        if member.guild.id in self._indexes:
+            self._add_member(member)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        if member.guild.id in self._indexes:
+            self._remove(member.guild.id, member.id)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if after.guild.id in self._indexes:
+            self._add_member(after)
+
+    async def on_user_update(self, before: discord.User, after: discord.User) -> None:
+        # Usernames and global names are shared by every guild the user is in
+        for guild_id, keys in self._keys.items():
+            if after.id in keys and (guild := self.client.get_guild(guild_id)):
+                if member := guild.get_member(after.id):
+                    self._add_member(member)
+
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        if role.guild.id in self._indexes:
+            self._add(role.guild.id, role.id, (('role', role.name),))
+
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if role.guild.id in self._indexes:
+            self._remove(role.guild.id, role.id)
+
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        await self.on_guild_role_create(after)
+
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        if channel.guild.id in self._indexes and isinstance(channel, discord.VoiceChannel):
+            self._add(channel.guild.id, channel.id, (('voice_channel', channel.name),))
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        if channel.guild.id in self._indexes:
+            self._remove(channel.guild.id, channel.id)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        await self.on_guild_channel_create(after)
+
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        # The cache was reloaded, so the indexes are rebuilt on the next lookup
+        self._indexes.pop(guild.id, None)
+        self._keys.pop(guild.id, None)
+
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        await self.on_guild_available(guild)
+
+
+# main.py hooks it into the client's events with guild_lookup.setup(client)
+guild_lookup = GuildLookup()
+
 async def get_mentions(message: discord.Message) -> List[discord.Member]:
     """ Get mentions from a specific message.
     :param message: The message to get the mentions from. """
@@ -225,10 +392,8 @@ async def get_mentions(message: discord.Message) -> List[discord.Member]:
 
     members = [
         m for word in message.content.split()
-        if word.isdigit() and (m := discord.utils.get(guild.members, id=int(word)))
-        or (m := discord.utils.get(guild.members, name=str(word)))
-        or (m := discord.utils.get(guild.members, nick=str(word)))
-        or (m := discord.utils.get(guild.members, display_name=str(word)))
+        if word.isdigit() and (m := guild.get_member(int(word)))
+        or (m := guild_lookup.find_member(guild, word))
     ]
     members.extend(message.mentions)
     members = list(set(members))
@@ -243,17 +408,13 @@ async def get_roles(message: discord.Message) -> List[discord.Role]:
 
     roles: List[discord.Role] = [
         m for word in message.content.split()
-        if word.isdigit() and (m := discord.utils.get(guild.roles, id=int(word)))
-        or (m := discord.utils.get(guild.roles, name=str(word))
-        # or (m := await commands.RoleConverter().convert(message, message.content))
-        )
+        if word.isdigit() and (m := guild.get_role(int(word)))
+        or (m := guild_lookup.find_role(guild, word))
     ]
     for role_id in re.findall(r'<@&([0-9]{15,20})>$', message.content):
-        if role := discord.utils.get(guild.roles, id=int(role_id)):
+        if role := guild.get_role(int(role_id)):
             roles.append(role)
 
-    # print('ihi', list(message.role_mentions))
-    # roles.extend(message.mentions)
     roles = list(set(roles))
 
     return roles
@@ -266,8 +427,8 @@ async def get_voice_channel_mentions(message: discord.Message) -> List[discord.V
 
     channel_mentions = [
         m for word in message.content.split()
-        if word.isdigit() and (m := discord.utils.get(guild.voice_channels, id=int(word)))
-        or (m := discord.utils.get(guild.voice_channels, name=str(word)))
+        if word.isdigit() and isinstance(m := guild.get_channel(int(word)), discord.VoiceChannel)
+        or (m := guild_lookup.find_voice_channel(guild, word))
     ]
 
     channel_mentions.extend(list(map(lambda c: isinstance(c, discord.VoiceChannel), message.channel_mentions)))
@@ -319,7 +480,7 @@ async def audio(client: commands.Bot, voice_channel: discord.VoiceChannel, membe
             await bot_state.disconnect()
             await bot_state.move_to(voice_channel)
         elif not bot_state:
-            voicechannel = discord.utils.get(member.guild.channels, id=voice_channel.id)
+            voicechannel = member.guild.get_channel(voice_channel.id)
             vc = await voicechannel.connect()
 
         # await asyncio.sleep(2)
@@ -411,15 +572,70 @@ def not_ready():
     return commands.check(real_check)
 
 async def get_user_pfp(member, thumb_width: int = 59) -> Image:
-    """ Gets the user's profile picture.
+    """ Gets the user's profile picture. The image is shared, so copy it before drawing on it.
     :param member: The member from whom to get the profile picture.
     :param thumb_width: The width of the thumbnail. [Default = 59] """
 
-    async with session.get(str(member.display_avatar)) as response:
+    key = (member.display_avatar.key, thumb_width)
+    if (image := avatar_cache.peek(key)) is not None:
+        return image
+
+    return await avatar_loads.run(key, lambda: load_user_pfp(member.display_avatar, thumb_width))
+
+async def load_user_pfp(avatar: discord.Asset, thumb_width: int) -> Image:
+    """ Loads and processes the user's profile picture, from the disk tier or from Discord.
+    :param avatar: The avatar asset to load.
+    :param thumb_width: The width of the thumbnail. """
+
+    loop = asyncio.get_running_loop()
+    key = (avatar.key, thumb_width)
+    file_path = os.path.join(avatar_cache_dir, f"{avatar.key}_{thumb_width}.png") if avatar_cache_dir else None
+
+    if file_path and os.path.isfile(file_path):
+        try:
+            image = await loop.run_in_executor(None, open_user_pfp, file_path)
+        except Exception:
+            pass
+        else:
+            avatar_cache.set(key, image)
+            return image
+
+    # Asks for the smallest size that still leaves room for a sharp downscale
+    size = 64
+    while size < thumb_width * 2 and size < 4096:
+        size *= 2
+
+    async with session.get(str(avatar.with_size(size))) as response:
         image_bytes = await response.content.read()
-        with BytesIO(image_bytes) as pfp:
-            image = Image.open(pfp)
-            im = image.convert('RGBA')
+
+    image = await loop.run_in_executor(None, make_user_pfp, image_bytes, thumb_width)
+    avatar_cache.set(key, image)
+
+    if file_path:
+        try:
+            os.makedirs(avatar_cache_dir, exist_ok=True)
+            await loop.run_in_executor(None, image.save, file_path, 'png')
+        except Exception:
+            pass
+
+    return image
+
+def open_user_pfp(file_path: str) -> Image:
+    """ Opens a processed profile picture from the disk tier.
+    :param file_path: The path of the thumbnail. """
+
+    image = Image.open(file_path).convert('RGBA')
+    image.load()
+    return image
+
+def make_user_pfp(image_bytes: bytes, thumb_width: int) -> Image:
+    """ Crops, resizes and masks a profile picture into a round thumbnail.
+    :param image_bytes: The downloaded avatar.
+    :param thumb_width: The width of the thumbnail. """
+
+    with BytesIO(image_bytes) as pfp:
+        image = Image.open(pfp)
+        im = image.convert('RGBA')
 
     def crop_center(pil_img, crop_width, crop_height):
         img_width, img_height = pil_img.size
@@ -472,7 +688,7 @@ async def get_subscriptions_count(member_id: int, guild: discord.Guild) -> int:
     :param member_id: The member ID.
     :param guild: The guild. """
 
-    member = discord.utils.get(guild.members, id=member_id)
+    member = guild.get_member(member_id)
     entitlements = await member.entitlements().flatten()
     return len([
         ent for ent in entitlements
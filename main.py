@@ -19,7 +19,9 @@ from extra.customerrors import (ActionSkillOnCooldown, ActionSkillsLocked,
                                 SkillsUsedRequirement, StillInRehabError,
                                 SlothAccountNotFound, NotEnoughMoneyError)
 from extra.menu import PaginatorView
+from extra.rendering import render_pool
 from extra.useful_variables import patreon_roles
+from mysqldb import DatabaseCore, write_buffer
 
 load_dotenv()
 
@@ -60,20 +62,41 @@ shades_of_pink = cycle([(252, 15, 192), (255, 0, 255), (248, 24, 148),
               (223, 82, 134), (254, 127, 156), (253, 171, 159)
               ])
 
+class SlothBot(commands.Bot):
+    """ The bot client, releasing shared resources on shutdown. """
+
+    async def close(self) -> None:
+        """ Closes the bot, writes the buffered counters and voice rows and then closes the shared database pools and render workers. """
+
+        try:
+            await super().close()
+        finally:
+            try:
+                if voice_activity := self.get_cog('VoiceChannelActivity'):
+                    await voice_activity.write_voice_rows()
+                await write_buffer.close()
+            finally:
+                await DatabaseCore.close_pools()
+                render_pool.shutdown()
+
 # Making the client variable
-client = commands.Bot(command_prefix='z!', intents=discord.Intents.all(), help_command=None, case_insensitive=True)
+client = SlothBot(command_prefix='z!', intents=discord.Intents.all(), help_command=None, case_insensitive=True)
+# Keeps the member, role and channel name indexes current
+utils.guild_lookup.setup(client)
 
 # Tells when the bot is online
 @client.event
 async def on_ready() -> None:
     change_color.start()
+    # Loads the known tables once, so existence checks don't hit the database
+    await DatabaseCore().get_tables()
     print('Bot is ready!')
 
 
 @tasks.loop(seconds=65)
 async def change_color() -> None:
     guild = client.get_guild(server_id)
-    patreon = discord.utils.get(guild.roles, id=patreon_role_id)
+    patreon = guild.get_role(patreon_role_id)
     if not patreon:
         return
     r, g, b = next(shades_of_pink)
@@ -122,7 +145,7 @@ async def on_command_error(ctx, error) -> None:
         return await ctx.send(error)
 
     elif isinstance(error, commands.MissingAnyRole):
-        role_names = [f"**{str(discord.utils.get(ctx.guild.roles, id=role_id))}**" for role_id in error.missing_roles]
+        role_names = [f"**{str(ctx.guild.get_role(role_id))}**" for role_id in error.missing_roles]
         return await ctx.send(f"You are missing at least one of the required roles: {', '.join(role_names)}")
 
     elif isinstance(error, commands.errors.RoleNotFound):
@@ -220,7 +243,7 @@ async def on_application_command_error(ctx, error) -> None:
         await ctx.respond("**You can't do that!**")
 
     elif isinstance(error, commands.MissingAnyRole):
-        role_names = [f"**{str(discord.utils.get(ctx.guild.roles, id=role_id))}**" for role_id in error.missing_roles]
+        role_names = [f"**{str(ctx.guild.get_role(role_id))}**" for role_id in error.missing_roles]
         await ctx.respond(f"You are missing at least one of the required roles: {', '.join(role_names)}")
 
     elif isinstance(error, commands.errors.RoleNotFound):
@@ -282,8 +305,8 @@ async def on_voice_state_update(member, before, after) -> None:
     return
     if not member.guild:
         return
-    mod_role = discord.utils.get(member.guild.roles, id=moderator_role_id)
-    teacher_role = discord.utils.get(member.guild.roles, id=teacher_role_id)
+    mod_role = member.guild.get_role(moderator_role_id)
+    teacher_role = member.guild.get_role(teacher_role_id)
     if mod_role not in member.roles and teacher_role not in member.roles:
         return
 
@@ -542,6 +565,36 @@ async def reload(ctx, extension: str = None) -> None:
     client.load_extension(f'cogs.{extension}')
     return await ctx.send(f"**{extension} reloaded!**", delete_after=3)
 
+@client.command(hidden=True, aliases=['pool_stats'])
+@commands.has_permissions(administrator=True)
+async def db_pool_stats(ctx) -> None:
+    """ Shows the usage stats of the shared database pools. """
+
+    stats = DatabaseCore.get_pool_stats()
+    if not stats:
+        return await ctx.send("**No database pool has been opened yet!**")
+
+    embed = discord.Embed(title="__Database Pools__", color=ctx.author.color, timestamp=ctx.message.created_at)
+    for database_name, pool_stats in stats.items():
+        embed.add_field(
+            name=database_name.title(),
+            value=f"```ini\n[In use]: {pool_stats['in_use']}/{pool_stats['max_size']}\n[Idle]: {pool_stats['idle']}\n" \
+                f"[Acquisitions]: {pool_stats['acquisitions']}\n[Avg wait]: {pool_stats['avg_wait_ms']:.2f}ms\n" \
+                f"[Max wait]: {pool_stats['max_wait_ms']:.2f}ms```",
+            inline=True)
+    await ctx.send(embed=embed)
+
+@client.command(hidden=True)
+@commands.has_permissions(administrator=True)
+async def refresh_tables(ctx) -> None:
+    """ Reloads the known database tables, in case they were changed from outside the bot. """
+
+    DatabaseCore.invalidate_tables()
+    tables = await DatabaseCore().get_tables()
+    if tables is None:
+        return await ctx.send("**Couldn't load the tables from the database!**")
+    await ctx.send(f"**{len(tables)} tables loaded!**", delete_after=3)
+
 forbidden_files: List[str] = [
     # 'createdynamicroom.py'
 ]
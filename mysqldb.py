@@ -1,8 +1,11 @@
 # import.standard
 import asyncio
+import json
 import os
+import re
+import time
 #from contextlib import asynccontextmanager
-from typing import Any, Dict, Iterable, Literal, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Set, Tuple, Union
 
 # import.thirdparty
 import aiomysql
@@ -10,54 +13,127 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-loop = asyncio.get_event_loop()
-
 #@asynccontextmanager
 async def the_database():
-    pool = await aiomysql.create_pool(
-        host=os.getenv("SLOTH_DB_HOST"),
-        user=os.getenv("SLOTH_DB_USER"),
-        password=os.getenv("SLOTH_DB_PASSWORD"),
-        db=os.getenv("SLOTH_DB_NAME"), loop=loop)
-    db = await pool.acquire()
-    mycursor = await db.cursor()
-    return mycursor, db
-
-django_loop = asyncio.get_event_loop()
+    """ Gets a cursor and a connection from the shared sloth pool.
+    The connection must be given back with `DatabaseCore.release_connection`. """
+
+    return await DatabaseCore().get_connection("sloth")
+
 async def the_django_database():
-    pool = await aiomysql.create_pool(
-        host=os.getenv("DJANGO_DB_HOST"),
-        user=os.getenv("DJANGO_DB_USER"),
-        password=os.getenv("DJANGO_DB_PASSWORD"),
-        db=os.getenv("DJANGO_DB_NAME"), loop=django_loop)
+    """ Gets a cursor and a connection from the shared django pool.
+    The connection must be given back with `DatabaseCore.release_connection`. """
 
-    db = await pool.acquire()
-    mycursor = await db.cursor()
-    return mycursor, db
+    return await DatabaseCore().get_connection("django")
 
 class DatabaseCore:
-    
+
     COMMITABLE_METHODS = (
         "CREATE", "DROP", "INSERT",
         "UPDATE", "DELETE",
     )
-    
+
+    # One pool per logical database, shared by every DatabaseCore
+    _pools: Dict[str, aiomysql.Pool] = {}
+    _pool_locks: Dict[str, asyncio.Lock] = {}
+    _pool_stats: Dict[str, Dict[str, float]] = {}
+
+    # Table names of each database, loaded once and kept current by the CREATE/DROP TABLE queries
+    _tables: Dict[str, Set[str]] = {}
+    TABLE_DDL_REGEX = re.compile(
+        r"^\s*(CREATE|DROP)\s+TABLE\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?([`\w\s,]+?)\s*(?:\(|;|$)",
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    async def get_pool(cls, database_name: str) -> aiomysql.Pool:
+        """ Gets the shared pool of a database, creating it on first use.
+        :param database_name: The name of the database to get the pool from. """
+
+        if pool := cls._pools.get(database_name):
+            return pool
+
+        lock = cls._pool_locks.setdefault(database_name, asyncio.Lock())
+        async with lock:
+            if pool := cls._pools.get(database_name):
+                return pool
+
+            prefix = database_name.upper()
+            pool = await aiomysql.create_pool(
+                host=os.getenv(f"{prefix}_DB_HOST"),
+                user=os.getenv(f"{prefix}_DB_USER"),
+                password=os.getenv(f"{prefix}_DB_PASSWORD"),
+                db=os.getenv(f"{prefix}_DB_NAME"),
+                minsize=int(os.getenv(f"{prefix}_DB_POOL_MIN", 1)),
+                maxsize=int(os.getenv(f"{prefix}_DB_POOL_MAX", 10)),
+                pool_recycle=int(os.getenv(f"{prefix}_DB_POOL_RECYCLE", 3600)),
+                # Long-lived connections must not keep a stale read snapshot
+                autocommit=True,
+            )
+            cls._pools[database_name] = pool
+            cls._pool_stats[database_name] = {
+                "acquisitions": 0, "total_wait": 0.0, "max_wait": 0.0,
+            }
+
+        return pool
+
+    @classmethod
+    async def close_pools(cls) -> None:
+        """ Closes all shared pools, waiting for their connections to be released. """
+
+        pools = list(cls._pools.values())
+        cls._pools.clear()
+        for pool in pools:
+            pool.close()
+            await pool.wait_closed()
+
+    @classmethod
+    def get_pool_stats(cls) -> Dict[str, Dict[str, Union[int, float]]]:
+        """ Gets the usage stats of each shared pool. """
+
+        stats = {}
+        for database_name, pool in cls._pools.items():
+            pool_stats = cls._pool_stats[database_name]
+            acquisitions = pool_stats["acquisitions"]
+            stats[database_name] = {
+                "size": pool.size,
+                "max_size": pool.maxsize,
+                "in_use": pool.size - pool.freesize,
+                "idle": pool.freesize,
+                "acquisitions": acquisitions,
+                "avg_wait_ms": (pool_stats["total_wait"] / acquisitions * 1000) if acquisitions else 0.0,
+                "max_wait_ms": pool_stats["max_wait"] * 1000,
+            }
+        return stats
+
     async def get_connection(self, database_name: str) -> Tuple[object, object]:
-        """ Gets the database connection.
+        """ Gets a connection from the database's shared pool.
         :param database_name: The name of the database to get. """
-        
-        pool = await aiomysql.create_pool(
-            host=os.getenv(f"{database_name.upper()}_DB_HOST"),
-            user=os.getenv(f"{database_name.upper()}_DB_USER"),
-            password=os.getenv(f"{database_name.upper()}_DB_PASSWORD"),
-            db=os.getenv(f"{database_name.upper()}_DB_NAME"),
-            loop=django_loop,
-        )
 
+        pool = await self.get_pool(database_name)
+
+        start = time.perf_counter()
         db = await pool.acquire()
+        waited = time.perf_counter() - start
+
+        pool_stats = self._pool_stats[database_name]
+        pool_stats["acquisitions"] += 1
+        pool_stats["total_wait"] += waited
+        pool_stats["max_wait"] = max(pool_stats["max_wait"], waited)
+
         mycursor = await db.cursor()
         return mycursor, db
-    
+
+    async def release_connection(self, db: object, database_name: str) -> None:
+        """ Gives a connection back to the database's shared pool.
+        :param db: The connection to release.
+        :param database_name: The name of the database the connection belongs to. """
+
+        if pool := self._pools.get(database_name):
+            pool.release(db)
+        else:
+            db.close()
+
     async def execute_query(self,
         query: str,
         values: Iterable = [],
@@ -89,6 +165,7 @@ class DatabaseCore:
 
             if query.upper().strip().startswith(self.COMMITABLE_METHODS):
                 await db.commit()
+                self._update_tables(query, database_name)
 
             if fetch == "one":
                 data = await mycursor.fetchone()
@@ -100,17 +177,352 @@ class DatabaseCore:
             print("Error:", str(e))
         finally:
             await mycursor.close()
+            # Only gives back connections that were taken from the pool here
+            if not connection:
+                await self.release_connection(db, database_name)
 
         if description:
             return data, mycursor.description
         return data
 
-    async def table_exists(self, table_name: str) -> bool:
+    async def table_exists(self, table_name: str, database_name: Literal["sloth", "django"] = "sloth") -> bool:
         """ Checks whether a given table exists or not.
-        :param table_name: The table name to check. """
+        :param table_name: The table name to check.
+        :param database_name: The database to check the table in. [Default = sloth] """
+
+        if (tables := await self.get_tables(database_name)) is not None:
+            return table_name.lower() in tables
 
         return any(await self.execute_query(
             query="SHOW TABLE STATUS LIKE %s;",
             values=(table_name,),
             fetch="all",
+            database_name=database_name,
         ))
+
+    async def index_exists(self, table_name: str, index_name: str, database_name: Literal["sloth", "django"] = "sloth") -> bool:
+        """ Checks whether a table has a given index.
+        :param table_name: The name of the table.
+        :param index_name: The name of the index to check.
+        :param database_name: The database the table is in. [Default = sloth] """
+
+        return any(await self.execute_query(
+            query=f"SHOW INDEX FROM `{table_name}` WHERE Key_name = %s;",
+            values=(index_name,),
+            fetch="all",
+            database_name=database_name,
+        ))
+
+    async def get_tables(self, database_name: Literal["sloth", "django"] = "sloth") -> Optional[Set[str]]:
+        """ Gets the (lowercased) table names of a database, loading them on first use.
+        :param database_name: The database to get the tables from. [Default = sloth] """
+
+        if (tables := self._tables.get(database_name)) is not None:
+            return tables
+
+        try:
+            mycursor, db = await self.get_connection(database_name)
+        except Exception as e:
+            print("Error at loading the tables:", str(e))
+            return None
+
+        try:
+            await mycursor.execute("SHOW TABLES")
+            tables = {row[0].lower() for row in await mycursor.fetchall()}
+        except Exception as e:
+            print("Error at loading the tables:", str(e))
+            return None
+        finally:
+            await mycursor.close()
+            await self.release_connection(db, database_name)
+
+        self._tables[database_name] = tables
+        return tables
+
+    @classmethod
+    def invalidate_tables(cls, database_name: Optional[str] = None) -> None:
+        """ Forgets the known tables, so they are reloaded on the next check.
+        :param database_name: The database to forget the tables of. [Optional][Default = All] """
+
+        if database_name:
+            cls._tables.pop(database_name, None)
+        else:
+            cls._tables.clear()
+
+    def _update_tables(self, query: str, database_name: str) -> None:
+        """ Keeps the known tables in sync with a CREATE/DROP TABLE query that just ran.
+        :param query: The query that was run.
+        :param database_name: The database the query was run in. """
+
+        if (tables := self._tables.get(database_name)) is None:
+            return
+
+        if not (match := self.TABLE_DDL_REGEX.match(query)):
+            return
+
+        statement, table_names = match.groups()
+        for table_name in table_names.split(","):
+            table_name = table_name.strip().strip("`").lower()
+            if statement.upper() == "CREATE":
+                tables.add(table_name)
+            else:
+                tables.discard(table_name)
+
+
+class WriteBehindBuffer:
+    """ Coalesces hot counter updates in memory and writes them to the database in batches. """
+
+    def __init__(self,
+        flush_interval: float = 5,
+        flush_threshold: int = 500,
+        journal_path: Optional[str] = None,
+        journal_fsync: bool = False,
+        database_name: Literal["sloth", "django"] = "sloth",
+    ) -> None:
+        """ Class init method.
+        :param flush_interval: The amount of seconds between periodic flushes.
+        :param flush_threshold: The amount of buffered events that triggers an early flush.
+        :param journal_path: A file to journal buffered events to, so they survive a crash. [Optional]
+        :param journal_fsync: Whether to fsync the journal on every event. [Default = False]
+        :param database_name: The database the buffered updates belong to. """
+
+        self.db = DatabaseCore()
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.journal_path = journal_path
+        self.journal_fsync = journal_fsync
+        self.database_name = database_name
+
+        # {(table, key_column): {key: {column: [op, value]}}}
+        self._pending: Dict[Tuple[str, Optional[str]], Dict[Any, Dict[str, List[Any]]]] = {}
+        self._flushing: Dict[Tuple[str, Optional[str]], Dict[Any, Dict[str, List[Any]]]] = {}
+        self._events: int = 0
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+        self._journal = None
+        self._flush_listeners: Dict[str, List[Callable[[Any, Dict[str, List[Any]]], None]]] = {}
+
+    def add_flush_listener(self, table: str, listener: Callable[[Any, Dict[str, List[Any]]], None]) -> None:
+        """ Registers a function to be called with each key of a table, and its updates, once they're written.
+        :param table: The table to listen to.
+        :param listener: The function to call. """
+
+        self._flush_listeners.setdefault(table, []).append(listener)
+
+    def increment(self, table: str, column: str, amount: int, key_column: Optional[str] = None, key: Any = None) -> None:
+        """ Buffers an increment to a column.
+        :param table: The table to update.
+        :param column: The column to increment.
+        :param amount: The increment value.
+        :param key_column: The column identifying the row. [Optional]
+        :param key: The value of the key column. [Optional] """
+
+        self._add(table, key_column, key, column, "+", amount)
+
+    def set(self, table: str, column: str, value: Any, key_column: Optional[str] = None, key: Any = None) -> None:
+        """ Buffers an assignment to a column, the last assigned value wins.
+        :param table: The table to update.
+        :param column: The column to set.
+        :param value: The new value.
+        :param key_column: The column identifying the row. [Optional]
+        :param key: The value of the key column. [Optional] """
+
+        self._add(table, key_column, key, column, "=", value)
+
+    def overlay(self, table: str, row: Iterable[Any], columns: Dict[str, int], key_column: Optional[str] = None, key: Any = None) -> Tuple[Any, ...]:
+        """ Applies the not yet written updates of a key onto a row fetched from the database.
+        :param table: The table the row comes from.
+        :param row: The fetched row.
+        :param columns: The position of each buffered column in the row.
+        :param key_column: The column identifying the row. [Optional]
+        :param key: The value of the key column. [Optional] """
+
+        updates = [
+            buffered[(table, key_column)][key] for buffered in (self._flushing, self._pending)
+            if key in buffered.get((table, key_column), {})
+        ]
+        if not updates:
+            return row
+
+        for columns_update in updates:
+            row = self.apply_updates(row, columns_update, columns)
+        return row
+
+    @staticmethod
+    def apply_updates(row: Iterable[Any], columns_update: Dict[str, List[Any]], columns: Dict[str, int]) -> Tuple[Any, ...]:
+        """ Applies buffered column updates onto a row.
+        :param row: The row to apply the updates to.
+        :param columns_update: The buffered operation of each column.
+        :param columns: The position of each buffered column in the row. """
+
+        row = list(row)
+        for column, (op, value) in columns_update.items():
+            if (index := columns.get(column)) is None:
+                continue
+            row[index] = (row[index] or 0) + value if op == "+" else value
+        return tuple(row)
+
+    async def flush(self) -> None:
+        """ Writes all buffered updates to the database. """
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            self._flushing, self._pending = self._pending, {}
+            self._events = 0
+            self._rotate_journal()
+            try:
+                await self._write(self._flushing)
+            except Exception as e:
+                print("WriteBehindBuffer flush error:", str(e))
+                # Keeps the failed batch, with the newer updates on top of it
+                restored = self._flushing
+                self._merge_into(restored, self._pending)
+                self._pending = restored
+            else:
+                if self.journal_path and os.path.exists(f"{self.journal_path}.flushing"):
+                    os.remove(f"{self.journal_path}.flushing")
+                self._notify_flushed(self._flushing)
+            finally:
+                self._flushing = {}
+
+    async def close(self) -> None:
+        """ Stops the periodic flushing and writes what is left in the buffer. """
+
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+    def _add(self, table: str, key_column: Optional[str], key: Any, column: str, op: str, value: Any) -> None:
+        """ Journals and buffers an update. """
+
+        self._ensure_started()
+        if self._journal:
+            self._journal.write(json.dumps([table, key_column, key, column, op, value]) + "\n")
+            self._journal.flush()
+            if self.journal_fsync:
+                os.fsync(self._journal.fileno())
+
+        self._merge(self._pending, table, key_column, key, column, op, value)
+        self._events += 1
+        if self._events >= self.flush_threshold and (not self._early_flush or self._early_flush.done()):
+            self._early_flush = asyncio.create_task(self.flush())
+
+    @staticmethod
+    def _merge(buffered: Dict, table: str, key_column: Optional[str], key: Any, column: str, op: str, value: Any) -> None:
+        """ Merges an update into a buffer, so each column keeps a single pending operation. """
+
+        columns = buffered.setdefault((table, key_column), {}).setdefault(key, {})
+        if op == "+" and (current := columns.get(column)):
+            current[1] += value
+        else:
+            columns[column] = [op, value]
+
+    def _merge_into(self, target: Dict, source: Dict) -> None:
+        """ Merges every update of a buffer into another one. """
+
+        for (table, key_column), keys in source.items():
+            for key, columns in keys.items():
+                for column, (op, value) in columns.items():
+                    self._merge(target, table, key_column, key, column, op, value)
+
+    def _notify_flushed(self, buffered: Dict) -> None:
+        """ Tells the flush listeners which keys were written. """
+
+        for (table, key_column), keys in buffered.items():
+            for listener in self._flush_listeners.get(table, []):
+                for key, columns in keys.items():
+                    try:
+                        listener(key, columns)
+                    except Exception as e:
+                        print("WriteBehindBuffer listener error:", str(e))
+
+    def _ensure_started(self) -> None:
+        """ Replays the journal and starts the periodic flushing on first use. """
+
+        if self._task and not self._task.done():
+            return
+
+        if self.journal_path and not self._journal:
+            for path in (f"{self.journal_path}.flushing", self.journal_path):
+                if not os.path.exists(path):
+                    continue
+                with open(path) as journal:
+                    for line in journal:
+                        if line.strip():
+                            self._merge(self._pending, *json.loads(line))
+            self._journal = open(self.journal_path, "a")
+
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """ Flushes the buffer periodically. """
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print("WriteBehindBuffer error:", str(e))
+
+    def _rotate_journal(self) -> None:
+        """ Moves the journal aside while its events are being flushed. """
+
+        if not self._journal:
+            return
+
+        self._journal.close()
+        flushing_path = f"{self.journal_path}.flushing"
+        with open(self.journal_path) as journal, open(flushing_path, "a") as flushing:
+            flushing.write(journal.read())
+        self._journal = open(self.journal_path, "w")
+
+    async def _write(self, buffered: Dict) -> None:
+        """ Writes a buffer in a single transaction, batching rows that update the same columns. """
+
+        mycursor, db = await self.db.get_connection(self.database_name)
+        try:
+            await db.begin()
+            for (table, key_column), keys in buffered.items():
+                batches: Dict[Tuple[Tuple[str, str], ...], List[List[Any]]] = {}
+                for key, columns in keys.items():
+                    updates = sorted(columns.items())
+                    values = [value for _, (_, value) in updates]
+                    if key_column:
+                        values.append(key)
+                    batches.setdefault(tuple((column, op) for column, (op, _) in updates), []).append(values)
+
+                for signature, values in batches.items():
+                    assignments = ", ".join(
+                        f"{column} = {column} + %s" if op == "+" else f"{column} = %s"
+                        for column, op in signature
+                    )
+                    query = f"UPDATE {table} SET {assignments}"
+                    if key_column:
+                        query += f" WHERE {key_column} = %s"
+                    await mycursor.executemany(query, values)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await mycursor.close()
+            await self.db.release_connection(db, self.database_name)
+
+
+# Flushed every WRITE_BUFFER_FLUSH_INTERVAL seconds, or sooner once WRITE_BUFFER_FLUSH_THRESHOLD updates are buffered
+write_buffer = WriteBehindBuffer(
+    flush_interval=float(os.getenv("WRITE_BUFFER_FLUSH_INTERVAL", 5)),
+    flush_threshold=int(os.getenv("WRITE_BUFFER_FLUSH_THRESHOLD", 500)),
+    journal_path=os.getenv("WRITE_BUFFER_JOURNAL"),
+    journal_fsync=os.getenv("WRITE_BUFFER_JOURNAL_FSYNC", "false").lower() == "true",
+)
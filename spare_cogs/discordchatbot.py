@@ -45,7 +45,7 @@ class ChatterSloth(commands.Cog):
             return
         if message.content[3:].startswith(str(self.client.user.mention)[2:]) or message.content[2:].startswith(str(self.client.user.mention)[2:]):
             for arole in allowed_roles:
-                # the_role = discord.utils.get(message.guild.roles, id=arole)
+                # the_role = message.guild.get_role(arole)
                 if arole in [r.id for r in message.author.roles]:
                     break
             else:
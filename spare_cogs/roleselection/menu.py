@@ -173,7 +173,7 @@ class RoleButton(discord.ui.Button):
 		member = interaction.user
 
 		try:
-			role = discord.utils.get(member.guild.roles, id=int(self.custom_id))
+			role = member.guild.get_role(int(self.custom_id))
 		except Exception as e:
 			print(e)
 			pass
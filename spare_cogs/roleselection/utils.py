@@ -1,14 +1,11 @@
 # import.standard
 from functools import partial
 
-# import.thirdparty
-import discord
-
 async def callback(button, interaction) -> None:
     member = interaction.user
 
     try:
-        role = discord.utils.get(member.guild.roles, id=int(button.custom_id))
+        role = member.guild.get_role(int(button.custom_id))
     except Exception as e:
         print(e)
         pass
@@ -0,0 +1,57 @@
+# import.thirdparty
+import pytest
+
+pytest.importorskip('PIL')
+pytest.importorskip('dotenv')
+
+# import.local
+from extra.assets import AssetCache
+
+
+class FakeFont:
+    """ A font whose text is as wide as its size times the amount of characters. """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+
+    def getlength(self, text: str) -> float:
+        return self.size * len(text)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = AssetCache()
+    requested = []
+
+    def get_font(path: str, size: int) -> FakeFont:
+        requested.append(size)
+        return FakeFont(size)
+
+    monkeypatch.setattr(cache, 'get_font', get_font)
+    cache.requested = requested
+    return cache
+
+
+@pytest.mark.parametrize('text, max_width, expected', [
+    ('abcd', 100, 24),
+    ('abcd', 101, 25),
+    ('a', 2, 1),
+    ('abcdefghij', 1000, 99),
+])
+def test_fit_font_gets_the_largest_size_that_fits(cache, text, max_width, expected):
+    assert cache.fit_font('font.ttf', text, max_width).size == expected
+
+
+def test_fit_font_stops_at_the_max_size(cache):
+    assert cache.fit_font('font.ttf', 'a', 10_000, max_size=64).size == 64
+
+
+def test_fit_font_falls_back_to_the_smallest_size(cache):
+    assert cache.fit_font('font.ttf', 'abcd', 1).size == 1
+
+
+def test_fit_font_tries_a_logarithmic_amount_of_sizes(cache):
+    cache.fit_font('font.ttf', 'abcdefghij', 1000)
+
+    # Doubling up to 128, then binary searching between 64 and 128
+    assert len(cache.requested) <= 2 * 9 + 1
@@ -0,0 +1,163 @@
+# import.standard
+import asyncio
+
+# import.thirdparty
+import pytest
+
+# import.local
+from extra.cache import SingleFlight, TTLCache
+
+
+async def test_get_loads_once_and_serves_from_cache():
+    cache = TTLCache(max_size=10, ttl=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return 'value'
+
+    assert await cache.get('key', loader) == 'value'
+    assert await cache.get('key', loader) == 'value'
+    assert len(loads) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_expired_entries_are_reloaded():
+    cache = TTLCache(max_size=10, ttl=0)
+    values = iter(['old', 'new'])
+
+    async def loader():
+        return next(values)
+
+    assert await cache.get('key', loader) == 'old'
+    assert await cache.get('key', loader) == 'new'
+
+
+async def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    await cache.get('a', None)
+    cache.set('c', 3)
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+
+
+async def test_load_invalidated_while_running_is_not_stored():
+    cache = TTLCache(max_size=10, ttl=60)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def stale_loader():
+        started.set()
+        await release.wait()
+        return 'stale'
+
+    load = asyncio.create_task(cache.get('key', stale_loader))
+    await started.wait()
+    cache.invalidate('key')
+    release.set()
+
+    # The caller still gets what it loaded, but the next read loads again
+    assert await load == 'stale'
+    assert 'key' not in cache
+
+
+async def test_load_superseded_by_a_newer_load_is_not_stored():
+    cache = TTLCache(max_size=10, ttl=60)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def stale_loader():
+        started.set()
+        await release.wait()
+        return 'stale'
+
+    async def fresh_loader():
+        return 'fresh'
+
+    stale = asyncio.create_task(cache.get('key', stale_loader))
+    await started.wait()
+    cache.invalidate('key')
+    assert await cache.get('key', fresh_loader) == 'fresh'
+    release.set()
+    await stale
+
+    assert cache.peek('key') == 'fresh'
+
+
+async def test_update_during_load_drops_the_load():
+    cache = TTLCache(max_size=10, ttl=60)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def loader():
+        started.set()
+        await release.wait()
+        return 1
+
+    load = asyncio.create_task(cache.get('key', loader))
+    await started.wait()
+    cache.update('key', lambda value: value + 1)
+    release.set()
+    await load
+
+    assert 'key' not in cache
+
+
+async def test_failed_load_leaves_no_token_behind():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    async def loader():
+        raise RuntimeError('database is down')
+
+    with pytest.raises(RuntimeError):
+        await cache.get('key', loader)
+
+    assert not cache._loading
+    assert 'key' not in cache
+
+
+async def test_values_rejected_by_cache_if_are_not_stored():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    async def loader():
+        return []
+
+    assert await cache.get('key', loader, cache_if=bool) == []
+    assert 'key' not in cache
+
+
+async def test_concurrent_runs_of_a_key_share_one_load():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await release.wait()
+        return 'value'
+
+    first = asyncio.create_task(flight.run('key', loader))
+    second = asyncio.create_task(flight.run('key', loader))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(first, second) == ['value', 'value']
+    assert len(loads) == 1
+    assert len(flight) == 0
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_load():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        return 'value'
+
+    cancelled = asyncio.create_task(flight.run('key', loader))
+    waiting = asyncio.create_task(flight.run('key', loader))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    assert await waiting == 'value'
@@ -0,0 +1,36 @@
+# import.thirdparty
+import pytest
+
+pytest.importorskip('discord')
+Image = pytest.importorskip('PIL.Image')
+
+# import.local
+from extra.rendering import ImageWorkingSet
+
+
+def test_least_recently_used_images_are_evicted_past_the_byte_budget():
+    working_set = ImageWorkingSet(max_bytes=3 * 100 * 3, ttl=60)
+    for user_id in range(4):
+        working_set.set(user_id, Image.new('RGB', (10, 10)))
+
+    assert len(working_set) == 3
+    assert working_set.get(0) is None
+    assert working_set.used_bytes == 900
+
+
+def test_entries_that_are_not_images_still_count_against_the_budget():
+    working_set = ImageWorkingSet(max_bytes=3 * ImageWorkingSet.NOMINAL_BYTES, ttl=60)
+    for user_id in range(10):
+        working_set.set(user_id, object())
+
+    assert len(working_set) == 3
+    assert working_set.get(9) is not None
+
+
+def test_entry_count_is_capped():
+    working_set = ImageWorkingSet(ttl=60, max_entries=2)
+    for user_id in range(5):
+        working_set.set(user_id, Image.new('RGB', (1, 1)))
+
+    assert len(working_set) == 2
+    assert working_set.get(3) is not None and working_set.get(4) is not None
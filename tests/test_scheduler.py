@@ -0,0 +1,71 @@
+# import.standard
+import asyncio
+import time
+
+# import.local
+from extra.scheduler import ExpiryScheduler
+
+
+def test_earlier_due_replaces_a_later_one():
+    scheduler = ExpiryScheduler()
+    scheduler.register('timer', handler=None, next_due=None)
+
+    scheduler.schedule('timer', 200)
+    scheduler.schedule('timer', 100)
+    scheduler.schedule('timer', 300)
+
+    assert scheduler._due['timer'] == 100
+
+
+def test_unregistered_timers_are_ignored():
+    scheduler = ExpiryScheduler()
+    scheduler.schedule('unknown', 100)
+
+    assert not scheduler._heap
+
+
+async def test_timers_fire_in_due_order():
+    scheduler = ExpiryScheduler()
+    fired = []
+    now = time.time()
+
+    def make_timer(name: str):
+        async def handler():
+            fired.append(name)
+
+        async def next_due():
+            return None
+
+        return handler, next_due
+
+    for name in ('third', 'first', 'second'):
+        scheduler.register(name, *make_timer(name))
+
+    await scheduler.start()
+    scheduler.schedule('third', now + 0.15)
+    scheduler.schedule('first', now + 0.05)
+    scheduler.schedule('second', now + 0.1)
+
+    await asyncio.sleep(0.3)
+    await scheduler.stop()
+
+    assert fired == ['first', 'second', 'third']
+
+
+async def test_timer_still_due_after_running_is_retried_later():
+    scheduler = ExpiryScheduler(retry_delay=60)
+    runs = []
+
+    async def handler():
+        runs.append(1)
+
+    async def next_due():
+        return time.time() - 1
+
+    scheduler.register('stuck', handler, next_due)
+    await scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+
+    assert len(runs) == 1
+    assert scheduler._due['stuck'] > time.time() + 30
@@ -0,0 +1,69 @@
+# import.standard
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# import.thirdparty
+import pytest
+
+pytest.importorskip('discord')
+
+# import.local
+from extra.snipe import DeletedMessageStore
+
+start = datetime(2022, 1, 1)
+
+
+def make_message(number: int, author_id: int = 1, channel_id: int = 10):
+    return SimpleNamespace(
+        author=SimpleNamespace(id=author_id), content=f"message {number}",
+        created_at=start + timedelta(seconds=number), channel=SimpleNamespace(id=channel_id),
+    )
+
+
+def contents(messages):
+    return [message.content for message in messages]
+
+
+def test_oldest_messages_are_evicted_when_full():
+    store = DeletedMessageStore(capacity=3)
+    for number in range(5):
+        store.add(make_message(number, author_id=number % 2))
+
+    assert len(store) == 3
+    assert contents(store.latest(10)) == ['message 2', 'message 3', 'message 4']
+    assert contents(store.by_author(0)) == ['message 2', 'message 4']
+    assert contents(store.by_author(1)) == ['message 3']
+
+
+def test_authors_whose_messages_were_all_evicted_are_dropped():
+    store = DeletedMessageStore(capacity=2)
+    store.add(make_message(0, author_id=1))
+    store.add(make_message(1, author_id=2))
+    store.add(make_message(2, author_id=2))
+
+    assert store.by_author(1) == []
+    assert 1 not in store._by_author
+
+
+def test_latest_gets_the_newest_messages_oldest_first():
+    store = DeletedMessageStore(capacity=10)
+    for number in range(5):
+        store.add(make_message(number))
+
+    assert contents(store.latest(2)) == ['message 3', 'message 4']
+
+
+def test_channel_limit_hides_its_oldest_messages():
+    store = DeletedMessageStore(capacity=10, per_channel=2)
+    for number in range(3):
+        store.add(make_message(number, channel_id=10))
+    store.add(make_message(3, channel_id=20))
+
+    assert len(store) == 3
+    assert contents(store.latest(10)) == ['message 1', 'message 2', 'message 3']
+
+    # The hidden message still takes its place in the buffer until it wraps around
+    for number in range(4, 11):
+        store.add(make_message(number, channel_id=30 + number))
+    assert len(store) == 10
+    assert contents(store.latest(10)) == [f"message {number}" for number in range(1, 11)]
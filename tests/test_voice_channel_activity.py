@@ -0,0 +1,69 @@
+# import.standard
+from datetime import datetime
+
+# import.thirdparty
+import pytest
+
+pytest.importorskip('discord')
+pytz = pytest.importorskip('pytz')
+pytest.importorskip('aiomysql')
+
+# import.local
+from cogs.VoiceChannelActivity import berlin_timezone, get_time_range
+from discord.ext import commands
+
+# 15/06/2022 12:00 in Berlin
+now = berlin_timezone.localize(datetime(2022, 6, 15, 12, 0))
+
+
+def berlin_timestamp(*args) -> int:
+    return int(berlin_timezone.localize(datetime(*args)).timestamp())
+
+
+def test_past_hour_covers_the_whole_hour_today():
+    start, end, _ = get_time_range('10', now=now)
+
+    assert start == berlin_timestamp(2022, 6, 15, 10)
+    assert end == berlin_timestamp(2022, 6, 15, 11) - 1
+
+
+def test_future_hour_refers_to_yesterday():
+    start, end, _ = get_time_range('18', now=now)
+
+    assert start == berlin_timestamp(2022, 6, 14, 18)
+    assert end == berlin_timestamp(2022, 6, 14, 19) - 1
+
+
+def test_minutes_cover_their_half_hour():
+    start, end, text = get_time_range('10:40', now=now)
+
+    assert start == berlin_timestamp(2022, 6, 15, 10, 30)
+    assert end == berlin_timestamp(2022, 6, 15, 11) - 1
+    assert text == '`10:30` and `10:59`'
+
+
+def test_range_wrapping_around_midnight_ends_on_the_next_day():
+    start, end, _ = get_time_range('23', '01:00', now=now)
+
+    assert start == berlin_timestamp(2022, 6, 14, 23)
+    assert end == berlin_timestamp(2022, 6, 15, 1, 1) - 1
+
+
+def test_future_date_refers_to_last_year():
+    start, _, text = get_time_range('20/12-10', now=now)
+
+    assert start == berlin_timestamp(2021, 12, 20, 10)
+    assert text.startswith('`20/12 10:00`')
+
+
+def test_upcoming_leap_day_is_rejected():
+    leap_year = berlin_timezone.localize(datetime(2024, 1, 10, 12, 0))
+
+    with pytest.raises(commands.BadArgument):
+        get_time_range('29/02-10', now=leap_year)
+
+
+@pytest.mark.parametrize('time', ['25', '10:61', '31/02-10', 'noon'])
+def test_invalid_times_are_rejected(time):
+    with pytest.raises(commands.BadArgument):
+        get_time_range(time, now=now)
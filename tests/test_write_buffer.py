@@ -0,0 +1,135 @@
+# import.standard
+import asyncio
+
+# import.thirdparty
+import pytest
+
+pytest.importorskip('aiomysql')
+pytest.importorskip('dotenv')
+
+# import.local
+from mysqldb import WriteBehindBuffer
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = WriteBehindBuffer(flush_threshold=1000)
+    # No periodic flushing, the tests flush by hand
+    monkeypatch.setattr(buffer, '_ensure_started', lambda: None)
+    return buffer
+
+
+def make_writer(buffer, monkeypatch, fail: bool = False):
+    written = []
+
+    async def write(buffered):
+        if fail:
+            raise RuntimeError('database is down')
+        written.append(buffered)
+
+    monkeypatch.setattr(buffer, '_write', write)
+    return written
+
+
+def test_increments_merge_into_one_update(buffer):
+    buffer.increment('UserCurrency', 'user_money', 5, 'user_id', 1)
+    buffer.increment('UserCurrency', 'user_money', 3, 'user_id', 1)
+    buffer.increment('UserCurrency', 'user_money', 2, 'user_id', 2)
+
+    assert buffer._pending == {('UserCurrency', 'user_id'): {
+        1: {'user_money': ['+', 8]},
+        2: {'user_money': ['+', 2]},
+    }}
+
+
+def test_set_replaces_pending_increments_and_keeps_later_ones(buffer):
+    buffer.increment('SlothAnalytics', 'messages_sent', 4)
+    buffer.set('SlothAnalytics', 'messages_sent', 0)
+    buffer.increment('SlothAnalytics', 'messages_sent', 1)
+
+    assert buffer._pending[('SlothAnalytics', None)][None] == {'messages_sent': ['=', 1]}
+
+
+def test_overlay_applies_pending_updates_onto_a_row(buffer):
+    buffer.increment('MembersScore', 'user_xp', 10, 'user_id', 1)
+    buffer.set('MembersScore', 'user_lvl', 3, 'user_id', 1)
+    columns = {'user_xp': 1, 'user_lvl': 2}
+
+    assert buffer.overlay('MembersScore', (1, 100, 2), columns, 'user_id', 1) == (1, 110, 3)
+    assert buffer.overlay('MembersScore', (2, 100, 2), columns, 'user_id', 2) == (2, 100, 2)
+
+
+async def test_flush_writes_the_batch_and_notifies_listeners(buffer, monkeypatch):
+    written = make_writer(buffer, monkeypatch)
+    notified = []
+    buffer.add_flush_listener('UserCurrency', lambda key, columns: notified.append((key, columns)))
+    buffer.increment('UserCurrency', 'user_money', 5, 'user_id', 1)
+
+    await buffer.flush()
+
+    assert written == [{('UserCurrency', 'user_id'): {1: {'user_money': ['+', 5]}}}]
+    assert notified == [(1, {'user_money': ['+', 5]})]
+    assert not buffer._pending and not buffer._flushing
+
+    await buffer.flush()
+    assert len(written) == 1
+
+
+async def test_failed_flush_keeps_the_batch(buffer, monkeypatch):
+    make_writer(buffer, monkeypatch, fail=True)
+    buffer.increment('UserCurrency', 'user_money', 5, 'user_id', 1)
+
+    await buffer.flush()
+
+    assert buffer._pending == {('UserCurrency', 'user_id'): {1: {'user_money': ['+', 5]}}}
+
+
+async def test_reset_during_a_flush_is_written_after_it(buffer, monkeypatch):
+    written = []
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def write(buffered):
+        written.append(buffered)
+        started.set()
+        await release.wait()
+
+    monkeypatch.setattr(buffer, '_write', write)
+    buffer.increment('SlothAnalytics', 'messages_sent', 4)
+    flush = asyncio.create_task(buffer.flush())
+    await started.wait()
+
+    # The daily reset comes in while yesterday's increments are being written
+    buffer.set('SlothAnalytics', 'messages_sent', 0)
+    reset = asyncio.create_task(buffer.flush())
+    release.set()
+    await asyncio.gather(flush, reset)
+
+    assert [batch[('SlothAnalytics', None)][None] for batch in written] == [
+        {'messages_sent': ['+', 4]},
+        {'messages_sent': ['=', 0]},
+    ]
+
+
+async def test_journal_is_replayed_after_a_crash(tmp_path, monkeypatch):
+    journal_path = str(tmp_path / 'journal')
+    crashed = WriteBehindBuffer(journal_path=journal_path)
+    monkeypatch.setattr(crashed, '_run', lambda: _idle())
+    crashed.increment('UserCurrency', 'user_money', 5, 'user_id', 1)
+    crashed.increment('UserCurrency', 'user_money', 2, 'user_id', 1)
+    crashed._task.cancel()
+    crashed._journal.close()
+
+    restarted = WriteBehindBuffer(journal_path=journal_path)
+    monkeypatch.setattr(restarted, '_run', lambda: _idle())
+    restarted.increment('UserCurrency', 'user_money', 1, 'user_id', 2)
+    restarted._task.cancel()
+    restarted._journal.close()
+
+    assert restarted._pending == {('UserCurrency', 'user_id'): {
+        1: {'user_money': ['+', 7]},
+        2: {'user_money': ['+', 1]},
+    }}
+
+
+async def _idle() -> None:
+    """ Stands in for the periodic flushing. """